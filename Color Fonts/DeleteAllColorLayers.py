@@ -1,38 +1,41 @@
 #MenuTitle: Delete All Color Layers
 # -*- coding: utf-8 -*-
 __doc__="""
-Finds and deletes any layers with a colorPalette attribute in selected glyphs
+Finds and deletes the color layers of the selected glyphs: palette layers
+(colorPalette attribute or "Color N" name) and full-color "Color" layers
 """
 
+from naipe_core.color_layers import ColorLayerIndex
+from naipe_core.components import target_glyphs
+from naipe_core.instrumentation import instrumented
 
 
-def delete_color_layers(glyph):
-    # Find Color layers
-    color_layer_indices = [i for i, layer in enumerate(glyph.layers) if layer.name.startswith("Color")]
+def delete_color_layers(glyph, color_index):
+    # Delete Color layers found by the index
+    glyph.beginUndo()  # Begin undo grouping
+    for index in sorted(color_index.positions(glyph), reverse=True):
+        del glyph.layers[index]  # Remove the layer by index
+    glyph.endUndo()  # End undo grouping
+    color_index.update_glyph(glyph)
 
-    # Delete Color layers if found
-    if color_layer_indices:
-        glyph.beginUndo()  # Begin undo grouping
-        for index in sorted(color_layer_indices, reverse=True):
-            del glyph.layers[index]  # Remove the layer by index
-        glyph.endUndo()  # End undo grouping
 
-
-def find_and_delete_color_layers():
+@instrumented("Delete all color layers", Glyphs.defaults)
+def find_and_delete_color_layers(run):
     # Get the currently selected glyphs
-    selected_glyphs = Glyphs.font.selectedLayers
-
-    # Iterate over each selected glyph layer
-    for glyph_layer in selected_glyphs:
-        glyph = glyph_layer.parent
-
-        # Check if Color layers exist
-        has_color_layers = any(layer.name.startswith("Color") for layer in glyph.layers)
-
-        # Delete Color layers if exist
-        if has_color_layers:
-            delete_color_layers(glyph)
-            print(f"✅ Deleted Color layers of {glyph.name}")
+    selected_glyphs = target_glyphs(Glyphs.font)
+
+    # Find the Color layers of all selected glyphs in one pass, full-color
+    # "Color" layers included
+    with run.phase("index"):
+        color_index = ColorLayerIndex(selected_glyphs, include_full_color=True)
+
+    with run.phase("delete"):
+        for glyph in selected_glyphs:
+            # Delete Color layers if exist
+            if color_index.has_color_layers(glyph):
+                run.count("layers deleted", len(color_index.positions(glyph)))
+                delete_color_layers(glyph, color_index)
+                run.log(f"✅ Deleted Color layers of {glyph.name}")
 
 # Execute the function
 find_and_delete_color_layers()
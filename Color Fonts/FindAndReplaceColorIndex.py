@@ -1,74 +1,81 @@
 #MenuTitle: Find and Replace Color Palette Index
 # -*- coding: utf-8 -*-
 __doc__="""
-Changes Color 2 to Color 1. Hardcoded only, GUI coming eventually
+Opens a UI to remap the palette indexes of color layers, e.g. 2>1, 3>2 (swaps and merges work too),
+in selected glyphs or the whole font. The mapping is checked against the font's color palettes first.
 """
 
-
-def update_color2_palette(glyph):
-    # Find Color 2 layer
-    color2_layer = None
-    for layer in glyph.layers:
-        if layer.name == "Color 2":
-            color2_layer = layer
-            break
-
-    # Update colorPalette attribute of Color 2 layer if found
-    if color2_layer is not None:
-        glyph.beginUndo()  # Begin undo grouping
-        color2_layer.attributes["colorPalette"] = 1
-        glyph.endUndo()  # End undo grouping
-
-
-def find_and_update_color2_palette():
-    # Get the currently selected glyphs
-    selected_glyphs = Glyphs.font.selectedLayers
-
-    # Iterate over each selected glyph layer
-    for glyph_layer in selected_glyphs:
-        glyph = glyph_layer.parent
-
-        # Check if Color 2 layer exists
-        has_color_2_layer = any(layer.name == "Color 2" for layer in glyph.layers)
-
-        # Update colorPalette attribute of Color 2 layer if exists
-        if has_color_2_layer:
-            update_color2_palette(glyph)
-            print(f"✅ Updated colorPalette attribute for Color 2 layer in {glyph.name}")
-
-# Execute the function
-find_and_update_color2_palette()
-
-def update_color3_to_color2(glyph):
-    # Find Color 3 layer
-    color3_layer = None
-    for layer in glyph.layers:
-        if layer.name == "Color 3":
-            color3_layer = layer
-            break
-
-    # Update colorPalette attribute of Color 3 layer if found
-    if color3_layer is not None:
-        glyph.beginUndo()  # Begin undo grouping
-        color3_layer.name = "Color 2"  # Rename the layer
-        glyph.endUndo()  # End undo grouping
-
-
-def find_and_update_color3_to_color2():
-    # Get the currently selected glyphs
-    selected_glyphs = Glyphs.font.selectedLayers
-
-    # Iterate over each selected glyph layer
-    for glyph_layer in selected_glyphs:
-        glyph = glyph_layer.parent
-
-        # Check if Color 3 layer exists
-        has_color_3_layer = any(layer.name == "Color 3" for layer in glyph.layers)
-
-        # Update Color 3 layer to Color 2 if exists
-        if has_color_3_layer:
-            update_color3_to_color2(glyph)
-            print(f"✅ Renamed Color 3 layer to Color 2 for {glyph.name}")
-
-# Execute the function
-find_and_update_color3_to_color2()
+from vanilla import FloatingWindow, TextBox, EditText, Button, CheckBox
+from naipe_core.color_layers import ColorLayerIndex, palette_color_count, parse_mapping, validate_mapping, remap_palettes
+from naipe_core.components import target_glyphs
+from naipe_core.instrumentation import ScriptRun
+
+
+class RemapPaletteUI:
+    def __init__(self):
+        self.w = FloatingWindow((300, 165), "Remap Color Palette Index")
+        self.w.text = TextBox((15, 15, -15, 17), "Palette index mapping (old>new):")
+        self.w.input = EditText(
+            (15, 37, -15, 25),
+            placeholder="e.g. 2>1, 3>2",
+            continuous=False,
+        )
+        self.w.rename_checkbox = CheckBox(
+            (15, 70, -15, 20),
+            "Rename 'Color N' layers to match",
+            value=True,
+        )
+        self.w.font_wide_checkbox = CheckBox(
+            (15, 95, -15, 20),
+            "All glyphs in the font (not just selected)",
+            value=False,
+        )
+        self.w.button = Button(
+            (15, 125, -15, 25),
+            "Remap",
+            callback=self.remap,
+        )
+        self.w.open()
+
+    def remap(self, sender):
+        font = Glyphs.font
+        if not font:
+            Message("Please open a font to run this script.", "No Font Open")
+            return
+
+        # Validate everything before touching any layer
+        try:
+            mapping = parse_mapping(self.w.input.get())
+        except ValueError as e:
+            Message(str(e), "Invalid Mapping")
+            return
+        problems = validate_mapping(mapping, palette_color_count(font))
+        if problems:
+            Message("\n".join(problems), "Invalid Mapping")
+            return
+
+        glyphs = target_glyphs(font, self.w.font_wide_checkbox.get())
+        if not glyphs:
+            Message("Please select one or more glyphs.", "No Glyphs Selected")
+            return
+
+        with ScriptRun("Remap color palette index", Glyphs.defaults) as run:
+            # Find the Color layers of all glyphs in one pass, then remap each glyph once
+            with run.phase("index"):
+                color_index = ColorLayerIndex(glyphs)
+            with run.phase("remap"):
+                font.disableUpdateInterface()
+                try:
+                    changes = remap_palettes(glyphs, color_index, mapping, self.w.rename_checkbox.get())
+                finally:
+                    font.enableUpdateInterface()
+
+            run.count("layers remapped", len(changes))
+            for glyph, layer, old, new in changes:
+                run.log(f"✅ {glyph.name}: {layer.name} colorPalette {old} → {new}")
+
+        glyph_count = len({glyph.name for glyph, _, _, _ in changes})
+        Message(f"Remapped {len(changes)} layer(s) in {glyph_count} glyph(s).", "Remap Done")
+
+
+RemapPaletteUI()
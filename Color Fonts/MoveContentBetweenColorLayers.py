@@ -4,98 +4,149 @@ __doc__="""
 Moves contours between one or more color font layers, with options to remove overlap and preserve target layer contents
 """
 
+from vanilla import Window, TextBox, List, CheckBox, Button, ProgressBar
+from PyObjCTools import AppHelper
+from naipe_core.color_layers import ColorLayerIndex
+from naipe_core.instrumentation import ScriptRun
+
+# Glyphs processed between two progress updates
+CHUNK_SIZE = 100
+
 
 class SimpleWindow(object):
     def __init__(self):
-        self.w = Window((500, 300), "Copy color font layers")
+        self.w = Window((500, 340), "Copy color font layers")
         self.w.sourceListTitle = TextBox((20, 10, 250, 20), "Select one or more source layers:")
         self.w.targetListTitle = TextBox((260, 10, 250, 20), "Select one or more target layers:")
-        self.w.sourceLayerList = List((20, 40, -260, -100), [])
-        self.w.targetLayerList = List((260, 40, -20, -100), [])
-        self.w.keepShapesCheckBox = CheckBox((20, 215, -10, 20), "Keep target layer", value=True)
-        self.w.overlapCheckBox = CheckBox((200, 215, -10, 20), "Remove overlap", value=False)
-        self.w.button = Button((10, 250, -10, 20), "Copy shapes", callback=self.buttonCallback)
+        self.w.sourceLayerList = List((20, 40, -260, -125), [])
+        self.w.targetLayerList = List((260, 40, -20, -125), [])
+        self.w.keepShapesCheckBox = CheckBox((20, -115, 170, 20), "Keep target layer", value=True)
+        self.w.overlapCheckBox = CheckBox((200, -115, 150, 20), "Remove overlap", value=False)
+        self.w.wholeFontCheckBox = CheckBox((20, -90, -10, 20), "All glyphs in the font (not just selected)", value=False, callback=self.wholeFontCallback)
+        self.w.progress = ProgressBar((20, -62, -20, 16))
+        self.w.button = Button((10, -35, -10, 20), "Copy shapes", callback=self.buttonCallback)
+        self.layerNames = []
+        self.pending = []
         self.w.open()
-        
+
+    def targetGlyphs(self):
+        font = Glyphs.font
+        if self.w.wholeFontCheckBox.get():
+            return list(font.glyphs)
+        return list(font.selection)
+
+    def wholeFontCallback(self, sender):
+        self.UpdateUILists()
+
     def buttonCallback(self, sender):
         # Check if Glyphs.font is available
         if Glyphs.font:
             sourceLayerIndices = self.w.sourceLayerList.getSelection()
             targetLayerIndices = self.w.targetLayerList.getSelection()
-            
-            keepShapeSetting = self.w.keepShapesCheckBox.get()
-            overlapSetting = self.w.overlapCheckBox.get()
-            
-            selectedGlyphs = Glyphs.font.selection
-            
-            # Iterate through selected glyphs once
-            for glyph in selectedGlyphs:
-                glyphName = glyph.name
-                
-                # Check if glyph has layers
-                if glyph.layers:
-                    # If Keep target layer checkbox is unchecked iterate through target layers and clear the shapes
-                    if not keepShapeSetting:
-                        for targetIndex in targetLayerIndices:
-                            # Check if target index is valid
-                            if targetIndex < len(glyph.layers):
-                                targetLayer = glyph.layers[targetIndex]
-                                targetLayer.clear()
-                                print(f"❌ Removed shapes in {targetLayer.name} of {glyphName}")
-
-                    # Iterate through selected source layers indices once
-                    for sourceIndex in sourceLayerIndices:
-                        # Check if source index is valid
-                        if sourceIndex < len(glyph.layers):
-                            sourceLayer = glyph.layers[sourceIndex]
-                            
-                            # Iterate through selected target layers indices once
-                            for targetIndex in targetLayerIndices:
-                                # Check if target index is valid
-                                if targetIndex < len(glyph.layers):
-                                    targetLayer = glyph.layers[targetIndex]
-                                    
-                                    # Iterate through the shapes present within the selected source layers once
-                                    for shape in sourceLayer.shapes:
-                                        newShape = shape.copy()
-                                        targetLayer.shapes.append(newShape)
-                                    
-                                    # Prints which source layer has been copied to which target layer and specifies which glyph
-                                    print(f"🌈 Copied from {sourceLayer.name} to {targetLayer.name} of {glyphName}")
-                                    
-                                    # If the remove overlap checkbox is checked prints an indication that the overlap between shapes within the target layer was removed
-                                    if overlapSetting:
-                                        targetLayer.removeOverlap()
-                                        print(f"✅ Removed overlap of {targetLayer.name}")
-                else:
-                    print(f"⚠️ {glyphName} has no layers.")
+
+            self.keepShapeSetting = self.w.keepShapesCheckBox.get()
+            self.overlapSetting = self.w.overlapCheckBox.get()
+
+            # Resolve list selections to layer names, then to each glyph's own layers by name
+            self.sourceNames = [self.layerNames[i] for i in sourceLayerIndices]
+            self.targetNames = [self.layerNames[i] for i in targetLayerIndices]
+            if not (self.sourceNames and self.targetNames):
+                print("⚠️ Select at least one source and one target layer")
+                return
+
+            # The run spans all chunks: started here, summarized when the last chunk is done
+            self.run = ScriptRun("Move content between color layers", Glyphs.defaults).start()
+            self.font = Glyphs.font
+            self.pending = self.targetGlyphs()
+            self.total = len(self.pending)
+            self.done = 0
+            with self.run.phase("index"):
+                self.colorIndex = ColorLayerIndex(self.pending, include_masters=True)
+
+            # Work through the glyphs in chunks, updating the progress bar in between
+            self.w.button.enable(False)
+            self.w.progress.set(0)
+            self.font.disableUpdateInterface()
+            AppHelper.callAfter(self.copyChunk)
         else:
             print("⚠️ There are no fonts selected")
-    
-    ### UpdateUILists updates the interface of the lists within the window with the names of the layers of the selected glyph that contains the most amount of layers.
-    ### This assumes you are working with a color font, which considers that corresponding indexed layers should have the same name.
+
+    def copyChunk(self):
+        chunk, self.pending = self.pending[:CHUNK_SIZE], self.pending[CHUNK_SIZE:]
+        try:
+            for glyph in chunk:
+                self.copyGlyph(glyph)
+        except Exception:
+            self.font.enableUpdateInterface()
+            self.w.button.enable(True)
+            self.run.finish()
+            raise
+        self.done += len(chunk)
+        self.w.progress.set(100.0 * self.done / self.total if self.total else 100)
+        if self.pending:
+            AppHelper.callAfter(self.copyChunk)
+        else:
+            self.font.enableUpdateInterface()
+            self.w.button.enable(True)
+            self.run.count("glyphs", self.done)
+            self.run.finish()
+
+    def copyGlyph(self, glyph):
+        glyphName = glyph.name
+
+        # Name the chosen layers the glyph doesn't have; without a target there is nothing to do
+        missing = [name for name in dict.fromkeys(self.sourceNames + self.targetNames) if not self.colorIndex.by_name(glyph, name)]
+        if missing:
+            self.run.log(f"⚠️ {glyphName} has no {', '.join(missing)} layer.")
+            if all(name in missing for name in self.targetNames):
+                return
+
+        glyph.beginUndo()
+        try:
+            # Pair source and target layers within each master
+            for master in self.font.masters:
+                targetLayers = [layer for name in self.targetNames for layer in self.colorIndex.by_name(glyph, name, master.id)]
+                if not targetLayers:
+                    continue
+                sourceLayers = [layer for name in self.sourceNames for layer in self.colorIndex.by_name(glyph, name, master.id)]
+
+                # Snapshot the source shapes once, before any target changes
+                sourceShapes = [(sourceLayer.name, list(sourceLayer.shapes)) for sourceLayer in sourceLayers]
+
+                for targetLayer in targetLayers:
+                    # Keep (or drop) the target's own shapes, then add copies of all source shapes in one assignment
+                    with self.run.phase("copy"):
+                        newShapes = list(targetLayer.shapes) if self.keepShapeSetting else []
+                        for sourceName, shapes in sourceShapes:
+                            newShapes.extend(shape.copy() for shape in shapes)
+                        targetLayer.shapes = newShapes
+                    if not self.keepShapeSetting:
+                        self.run.log(f"❌ Removed shapes in {targetLayer.name} of {glyphName}")
+                    for sourceName, _ in sourceShapes:
+                        # Prints which source layer has been copied to which target layer and specifies which glyph
+                        self.run.log(f"🌈 Copied from {sourceName} to {targetLayer.name} of {glyphName}")
+                    self.run.count("target layers")
+
+                    # Overlap is removed once per target, after all sources were added
+                    if self.overlapSetting:
+                        with self.run.phase("remove overlap"):
+                            targetLayer.removeOverlap()
+                        self.run.log(f"✅ Removed overlap of {targetLayer.name}")
+        finally:
+            glyph.endUndo()
+
+    ### UpdateUILists updates the interface of the lists within the window with the names of the master and color layers found in the selected glyphs (or the whole font).
+    ### Layers are matched by name within each master of each glyph, so glyphs don't need the same layer order.
     def UpdateUILists(self):
         if Glyphs.font:
-            listItems = self.w.sourceLayerList.get()
-            
-            selectedGlyphs = Glyphs.font.selection
-            highestLayerCount = 0
-            
-            for glyph in selectedGlyphs:
-                thisLayerCount = len(glyph.layers)
-                
-                if thisLayerCount > highestLayerCount:
-                    highestLayerCount = thisLayerCount
-                    referenceGlyph = glyph
-                    
-            for layer in referenceGlyph.layers:
-                listItems.append(layer.name)
-                
-            self.w.sourceLayerList.set(listItems)
-            self.w.targetLayerList.set(listItems)
+            colorIndex = ColorLayerIndex(self.targetGlyphs(), include_masters=True)
+            self.layerNames = colorIndex.layer_names()
+
+            self.w.sourceLayerList.set(self.layerNames)
+            self.w.targetLayerList.set(self.layerNames)
         else:
             print("⚠️ There are no fonts selected")
-    
+
 # Instantiate the SimpleWindow class to create the window
 demo = SimpleWindow()
-demo.UpdateUILists()
\ No newline at end of file
+demo.UpdateUILists()
@@ -4,40 +4,42 @@ __doc__="""
 Finds and deletes all empty components in all layers of selected glyphs.
 """
 
-def findAndDeleteEmptyComponentsInSelectedGlyphs():
+from naipe_core.component_graph import component_graph
+from naipe_core.components import FONT_WIDE_KEY, EmptyBaseIndex, target_glyphs, remove_components
+from naipe_core.instrumentation import instrumented, setting
+
+# Clean up every glyph in the font instead of just the selection, switched on
+# from the Macro window: Glyphs.defaults["com.naipe.componentsFontWide"] = True
+FONT_WIDE = bool(setting(Glyphs.defaults, FONT_WIDE_KEY, False))
+
+@instrumented("Delete empty components", Glyphs.defaults)
+def findAndDeleteEmptyComponentsInSelectedGlyphs(run):
     try:
         # Get the current font
         thisFont = Glyphs.font
 
-        # Get the selected glyphs
-        selectedGlyphs = [layer.parent for layer in thisFont.selectedLayers]
-
-        # Iterate through selected glyphs
-        for glyph in selectedGlyphs:
-            # Check if the glyph has layers
-            if glyph.layers:
-                # Iterate through layers of the glyph
-                for thisLayer in glyph.layers:
-                    # Create a list to store components to be removed
-                    componentsToRemove = []
-
-                    # Iterate through components of the layer
-                    for thisComponent in thisLayer.components:
-                        # Check for empty components
-                        if thisComponent.componentLayer and not thisComponent.componentLayer.shapes:
-                            componentsToRemove.append(thisComponent)
-
-                    # Remove empty components outside the loop
-                    for component in componentsToRemove:
-                        # Use GSLayer.shapes to remove the component
-                        thisLayer.shapes.remove(component)
-
-                    # Print the results to the console for each glyph
-                    if componentsToRemove:
-                        print(f"Empty Components in {glyph.name} - Layer: {thisLayer.name}")
-                        for thisComponent in componentsToRemove:
-                            print(f"\t🫙 empty component {thisComponent.componentName}")
-                            print("\t\tDeleted.")
+        # Index the empty base layers once, then remove in a single pass
+        with run.phase("index"):
+            emptyBases = EmptyBaseIndex(thisFont)
+            if FONT_WIDE:
+                # Only glyphs that actually use an empty base need a look
+                graph = component_graph(thisFont, refresh=True)
+                glyphs = graph.glyphs(graph.users_of_any(emptyBases.names()))
+            else:
+                glyphs = target_glyphs(thisFont)
+
+        with run.phase("remove"):
+            thisFont.disableUpdateInterface()
+            try:
+                removed = remove_components(glyphs, emptyBases.matcher())
+            finally:
+                thisFont.enableUpdateInterface()
+
+        # Buffer the results for each glyph, printed once as a summary
+        run.count("glyphs checked", len(glyphs))
+        for glyph, thisLayer, componentNames in removed:
+            run.count("empty components deleted", len(componentNames))
+            run.log(f"Empty Components in {glyph.name} - Layer: {thisLayer.name}: 🫙 {', '.join(componentNames)} deleted")
 
     except Exception as e:
         # Handle exceptions and print errors
@@ -46,4 +48,4 @@ def findAndDeleteEmptyComponentsInSelectedGlyphs():
         print(traceback.format_exc())
 
 # Run the main function
-findAndDeleteEmptyComponentsInSelectedGlyphs()
\ No newline at end of file
+findAndDeleteEmptyComponentsInSelectedGlyphs()
@@ -0,0 +1,91 @@
+# MenuTitle: Remove Components by Suffix or Pattern
+# -*- coding: utf-8 -*-
+__doc__ = """
+Opens a UI to delete components whose names end with any of the given suffixes (e.g. .init .medi .fina .ss01 .sc),
+or match a regular expression, from all layers of the selected glyphs or of the whole font.
+"""
+
+import re
+from vanilla import FloatingWindow, TextBox, EditText, Button, CheckBox
+from naipe_core.component_graph import component_graph
+from naipe_core.components import component_matcher, name_matcher, target_glyphs, remove_components, summarize
+from naipe_core.instrumentation import ScriptRun
+
+
+class RemoveComponentsUI:
+    def __init__(self):
+        self.w = FloatingWindow((320, 165), "Remove Components")
+        self.w.text = TextBox((15, 15, -15, 17), "Component name suffixes (space separated):")
+        self.w.input = EditText(
+            (15, 37, -15, 25),
+            placeholder="e.g. .init .medi .fina",
+            continuous=False,
+        )
+        self.w.regex_checkbox = CheckBox(
+            (15, 70, -15, 20),
+            "Treat input as a regular expression",
+            value=False,
+        )
+        self.w.font_wide_checkbox = CheckBox(
+            (15, 95, -15, 20),
+            "All glyphs in the font (not just selected)",
+            value=False,
+        )
+        self.w.button = Button(
+            (15, 125, -15, 25),
+            "Remove Components",
+            callback=self.removeComponents,
+        )
+        self.w.open()
+
+    def removeComponents(self, sender):
+        font = Glyphs.font
+        if not font:
+            Message("Please open a font to run this script.", "No Font Open")
+            return
+
+        text = self.w.input.get().strip()
+        if not text:
+            Message("Please enter one or more suffixes or a pattern.", "Missing Input")
+            return
+
+        try:
+            if self.w.regex_checkbox.get():
+                matches_name = component_matcher(pattern=re.compile(text))
+            else:
+                matches_name = component_matcher(suffixes=text.split())
+        except re.error as e:
+            Message(f"Invalid regular expression: {e}", "Invalid Pattern")
+            return
+
+        font_wide = self.w.font_wide_checkbox.get()
+        if font_wide:
+            # Only glyphs using a matching component need to be visited
+            graph = component_graph(font, refresh=True)
+            glyphs = graph.glyphs(graph.users_of_any(graph.used_bases(matches_name)))
+        else:
+            glyphs = target_glyphs(font)
+            if not glyphs:
+                Message("Please select one or more glyphs.", "No Glyphs Selected")
+                return
+
+        with ScriptRun("Remove components", Glyphs.defaults) as run:
+            with run.phase("remove"):
+                font.disableUpdateInterface()
+                try:
+                    removed = remove_components(glyphs, name_matcher(matches_name))
+                finally:
+                    font.enableUpdateInterface()
+
+            run.count("glyphs checked", len(glyphs))
+            for glyph, layer, names in removed:
+                run.log(f"🗑️ Deleted {', '.join(names)} from {glyph.name} {layer.name}")
+
+        glyph_count, layer_count, names = summarize(removed)
+        detail = f"Removed {sum(names.values())} component(s) from {layer_count} layer(s) in {glyph_count} glyph(s)."
+        if names:
+            detail += "\n" + ", ".join(f"{name} ×{count}" for name, count in names.most_common())
+        Message(detail, "Components Removed")
+
+
+RemoveComponentsUI()
@@ -1,9 +1,17 @@
-#MenuTitle: Find and delete components with "fina" in their name
+#MenuTitle: Find and delete components ending in .fina
 # -*- coding: utf-8 -*-
 __doc__="""
-Finds and deletes components whose names contain "fina" in all layers of selected glyphs
+Finds and deletes components whose names end in ".fina" in all layers of selected glyphs
 """
 
+from naipe_core.component_graph import component_graph
+from naipe_core.components import FONT_WIDE_KEY, component_matcher, name_matcher, target_glyphs, remove_components
+from naipe_core.instrumentation import ScriptRun, setting
+
+# Clean up every glyph in the font instead of just the selection, switched on
+# from the Macro window: Glyphs.defaults["com.naipe.componentsFontWide"] = True
+FONT_WIDE = bool(setting(Glyphs.defaults, FONT_WIDE_KEY, False))
+
 
 def main():
     # Access the current document
@@ -13,51 +21,32 @@ def main():
         print("No document open.")
         return
     
-    # Initialize dictionary to store finaGlyphs
-    finaGlyphs = {}
-    
-    # Get the selected glyphs
-    selected_glyphs = [l.parent for l in doc.selectedLayers]
+    is_fina = component_matcher(suffixes=[".fina"])
+
+    # Get the selected glyphs, or every glyph using a .fina component
+    if FONT_WIDE:
+        graph = component_graph(doc, refresh=True)
+        glyphs = graph.glyphs(graph.users_of_any(graph.used_bases(is_fina)))
+    else:
+        glyphs = target_glyphs(doc)
     
-    if not selected_glyphs:
-        print("No glyphs selected.")
+    if not glyphs:
+        print("No .fina components found." if FONT_WIDE else "No glyphs selected.")
         return
     
-    for glyph in selected_glyphs:
-        processed_components = set()  # To store processed component names for each glyph
-        for master in doc.masters:
-            layer = glyph.layers[master.id]
-            components = layer.components
-            
-            if components:
-                for component in components:
-                    component_name = component.componentName
-                    if ".fina" in component_name and component_name not in processed_components:
-                        if glyph.name not in finaGlyphs:
-                            finaGlyphs[glyph.name] = set()  # Use set to store layer names
-                        processed_components.add(component_name)  # Add processed component name to the set
-
-    # Remove components from layers based on finaGlyphs dictionary
-    for glyph in selected_glyphs:
-        for master in doc.masters:
-            layer = glyph.layers[master.id]
-            components = layer.components
-            
-            if components:
-                for component in components:
-                    component_name = component.componentName
-                    if ".fina" in component_name:
-                        finaGlyphs[glyph.name].add(layer.name)
+    with ScriptRun("Remove .fina components", Glyphs.defaults) as run:
+        # Remove .fina components from all layers in one pass
+        with run.phase("remove"):
+            doc.disableUpdateInterface()
+            try:
+                removed = remove_components(glyphs, name_matcher(is_fina))
+            finally:
+                doc.enableUpdateInterface()
 
-    for glyph_name, layer_names in finaGlyphs.items():
-        glyph = doc.glyphs[glyph_name]
-        for layer_name in layer_names:
-            for layer in glyph.layers:
-                if layer.name == layer_name:
-                    for shape in layer.shapes[:]:  # Iterate through a copy of shapes to safely modify the original list
-                        if isinstance(shape, GSComponent) and shape.componentName.endswith(".fina"):
-                            layer.shapes.remove(shape)
-                            print(f"🗑️ Deleted {shape.componentName} from {glyph_name} {layer_name}")
+        run.count("glyphs checked", len(glyphs))
+        for glyph, layer, component_names in removed:
+            run.count("components deleted", len(component_names))
+            run.log(f"🗑️ Deleted {', '.join(component_names)} from {glyph.name} {layer.name}")
 
 if __name__ == "__main__":
     main()
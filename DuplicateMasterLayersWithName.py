@@ -3,14 +3,24 @@
 __doc__ = """
 Opens a UI to duplicate each master layer of the selected glyphs with a user-defined name prefix.
 Optionally decomposes components in the duplicated layer, leaving the original untouched.
+Batch mode works in chunks with UI updates off, can target all glyphs matching a name filter,
+and reuses the decomposed outlines of shared components.
 """
 
-from vanilla import FloatingWindow, TextBox, EditText, Button, CheckBox
+import fnmatch
+from vanilla import FloatingWindow, TextBox, EditText, Button, CheckBox, ProgressBar
+from PyObjCTools import AppHelper
+from naipe_core.component_graph import component_graph
+from naipe_core.components import DecomposedBaseCache, target_glyphs
+from naipe_core.instrumentation import ScriptRun
+
+# Glyphs duplicated between two progress updates in batch mode
+CHUNK_SIZE = 100
 
 
 class DuplicateLayersUI:
     def __init__(self):
-        self.w = FloatingWindow((300, 135), "Duplicate Layers")
+        self.w = FloatingWindow((300, 245), "Duplicate Layers")
         self.w.text = TextBox((15, 15, -15, 17), "New layer name prefix:")
         self.w.input = EditText(
             (15, 37, -15, 25),
@@ -22,19 +32,44 @@ class DuplicateLayersUI:
             "Decompose components in duplicated layer",
             value=False,
         )
+        self.w.batch_checkbox = CheckBox(
+            (15, 95, -15, 20),
+            "Batch mode",
+            value=False,
+            callback=self.batchChanged,
+        )
+        self.w.filter_text = TextBox((15, 120, -15, 17), "Glyph name filter (empty = selection):", sizeStyle="small")
+        self.w.filter_input = EditText(
+            (15, 138, -15, 22),
+            placeholder="e.g. *.sc a*",
+            sizeStyle="small",
+        )
+        self.w.filter_input.enable(False)
+        self.w.progress = ProgressBar((15, 172, -15, 16))
         self.w.button = Button(
-            (15, 100, -15, 25),
+            (15, 205, -15, 25),
             "Duplicate Layers",
             callback=self.duplicateLayers,
         )
+        self.running = False
+        self.closed = False
+        # Closing the window stops a batch in progress after the current chunk
+        self.w.bind("close", self.windowClosed)
         self.w.open()
 
+    def batchChanged(self, sender):
+        self.w.filter_input.enable(sender.get())
+
     def duplicateLayers(self, sender):
         font = Glyphs.font
         if not font:
             Message("Please open a font to run this script.", "No Font Open")
             return
 
+        if self.w.batch_checkbox.get():
+            self.startBatch(font)
+            return
+
         selected_glyphs = list({layer.parent for layer in font.selectedLayers})
         if not selected_glyphs:
             Message("Please select one or more glyphs.", "No Glyphs Selected")
@@ -76,5 +111,126 @@ class DuplicateLayersUI:
             detail += f"\n{decomposed_count} layer(s) were decomposed."
         Message(detail, "Duplication Done")
 
+    # ── Batch mode ───────────────────────────────────────────────────────────
+
+    def startBatch(self, font):
+        name_prefix = self.w.input.get().strip()
+        if not name_prefix:
+            Message("Please enter a name prefix.", "Missing Name")
+            return
+
+        # Timings and counts are collected across all chunks and printed once at the end
+        self.run = ScriptRun("Duplicate master layers", Glyphs.defaults).start()
+        with self.run.phase("collect"):
+            patterns = self.w.filter_input.get().split()
+            if patterns:
+                glyphs = [g for g in font.glyphs if any(fnmatch.fnmatchcase(g.name, p) for p in patterns)]
+            else:
+                glyphs = target_glyphs(font)
+        if not glyphs:
+            self.run.finish()
+            Message("No glyphs match the filter or selection.", "No Glyphs")
+            return
+
+        self.font = font
+        self.pending = glyphs
+        self.total = len(glyphs)
+        self.name_prefix = name_prefix
+        self.should_decompose = self.w.decompose_checkbox.get()
+        # Glyphs without components on any layer skip decomposition entirely
+        with self.run.phase("component graph"):
+            self.graph = component_graph(font, refresh=True) if self.should_decompose else None
+        self.decomposer = DecomposedBaseCache(font)
+        self.count = 0
+        self.decomposed_count = 0
+        self.done = 0
+
+        self.running = True
+        self.w.button.enable(False)
+        self.w.progress.set(0)
+        font.disableUpdateInterface()
+        AppHelper.callAfter(self.duplicateChunk)
+
+    def duplicateChunk(self):
+        if not self.running:
+            return
+        chunk, self.pending = self.pending[:CHUNK_SIZE], self.pending[CHUNK_SIZE:]
+        completed = False
+        try:
+            for glyph in chunk:
+                self.duplicateGlyph(glyph)
+            completed = True
+        finally:
+            # An error must not leave the interface off and the button disabled
+            if not completed:
+                self.failBatch()
+        self.done += len(chunk)
+        self.w.progress.set(100.0 * self.done / self.total)
+        if self.pending:
+            AppHelper.callAfter(self.duplicateChunk)
+        else:
+            self.finishBatch()
+
+    def duplicateGlyph(self, glyph):
+        masters = self.font.masters
+        decompose = self.should_decompose and bool(self.graph.bases_of(glyph.name))
+        glyph.beginUndo()
+        try:
+            for master in masters:
+                original_layer = glyph.layers[master.id]
+                if original_layer is None:
+                    continue
+                with self.run.phase("duplicate"):
+                    duplicate_layer = original_layer.copy()
+                    duplicate_layer.name = f"{self.name_prefix} ({master.name})"
+                    duplicate_layer.associatedMasterId = master.id
+                    glyph.layers.append(duplicate_layer)
+                self.count += 1
+
+                if decompose and duplicate_layer.components:
+                    with self.run.phase("decompose"):
+                        self.decomposer.decompose(duplicate_layer)
+                    self.decomposed_count += 1
+        finally:
+            glyph.endUndo()
+
+    def failBatch(self):
+        self.running = False
+        self.pending = []
+        self.font.enableUpdateInterface()
+        self.w.button.enable(True)
+        self.w.progress.set(0)
+        self.run.log(f"⚠️ Failed after {self.done} of {self.total} glyph(s); {self.count} layer(s) were duplicated (undo per glyph)")
+        self.run.count("layers duplicated", self.count)
+        self.run.finish()
+
+    def windowClosed(self, sender):
+        self.closed = True
+        if self.running:
+            # Glyphs duplicated so far keep their new layers (undo per glyph)
+            self.running = False
+            self.pending = []
+            self.font.enableUpdateInterface()
+            self.run.log(f"⏹ Cancelled after {self.done} of {self.total} glyph(s); {self.count} layer(s) were duplicated (undo per glyph)")
+            self.run.count("layers duplicated", self.count)
+            self.run.finish()
+
+    def finishBatch(self):
+        self.running = False
+        self.font.enableUpdateInterface()
+        if not self.closed:
+            self.w.close()
+
+        self.run.count("layers duplicated", self.count)
+        self.run.count("layers decomposed", self.decomposed_count)
+        self.run.count("base outlines reused", self.decomposer.hits)
+        self.run.finish()
+
+        detail = f"Duplicated {self.count} layer(s) across {self.total} glyph(s) with prefix '{self.name_prefix}'."
+        if self.should_decompose:
+            detail += f"\n{self.decomposed_count} layer(s) were decomposed ({len(self.decomposer.paths)} base outline(s) reused {self.decomposer.hits} time(s))."
+        detail += "\n\n" + " · ".join(f"{name.capitalize()} {seconds:.2f}s" for name, seconds in self.run.phases.items())
+        Message(detail, "Duplication Done")
+
 
 DuplicateLayersUI()
\ No newline at end of file
@@ -4,48 +4,50 @@ __doc__="""
 Checks the side bearings on all masters to find glyphs which don't have them equal on all masters and opens them to a new tab
 """
 
-##################################################
-### This part finds one letter containing each ###
-### diacritic and groups them in a single tab  ###
-##################################################
+from naipe_core.instrumentation import ScriptRun
+from naipe_core.result_cache import ResultCache
+from naipe_core.sidebearings import collect_sidebearings, find_mismatches, reference_index, report_lines
+from naipe_core.unicode_index import glyph_token
+
+# Differences up to this many units still count as synched
+TOLERANCE = 0
 
 # Access the current font
 font = Glyphs.font
 
 if font is not None:
-    glyph_diff_dict = {}
-
-    # Loop through all glyphs in the font
-    for glyph in font.glyphs:
-        for master in font.masters:
-            layer = glyph.layers[master.id]
-            left_side_bearing = layer.LSB
-            right_side_bearing = layer.RSB
-
-            # Check if glyph has at least one contour
-#            if len(layer.paths) == 0:
-#                continue
-            
-            # Check if LSB and RSB values are not the same in the current master
-            if (left_side_bearing != layer.parent.layers[font.selectedFontMaster.id].LSB) or (right_side_bearing != layer.parent.layers[font.selectedFontMaster.id].RSB):
-                glyph_diff_dict[glyph.name] = (left_side_bearing, right_side_bearing)
-                break
-
-    # Create a list of unicode_string values
-    unicode_list = []
-    for glyph_name, _ in glyph_diff_dict.items():
-        glyph = font.glyphs[glyph_name]
-        if glyph.unicode is None:
-            unicode_list.append("/" + glyph_name)
-        else:
-            unicode_list.append(chr(int(glyph.unicode, 16)))
-
-    # Print the unicode_string values as a space-separated list
-    print(" ".join(unicode_list))
-    
-    # Create a new tab and populate it with the unicode_list
-    new_tab = font.newTab()
-    new_tab.text = " ".join(unicode_list)
+    with ScriptRun("Find glyphs without synched side bearings", Glyphs.defaults) as run:
+        # Compare every master against the one currently selected
+        masters = list(font.masters)
+        reference = reference_index(masters, font.selectedFontMaster.id)
+
+        # Collect LSB/RSB of all glyphs × masters, then compare in one step.
+        # Glyphs unchanged since the last run are read from the result cache.
+        with run.phase("collect"), ResultCache(Glyphs.defaults) as cache:
+            glyphs, lsb, rsb = collect_sidebearings(font, masters, cache=cache)
+        run.count("glyphs measured", cache.misses)
+        run.count("glyphs from cache", cache.hits)
+        if cache.error:
+            run.log(f"⚠️ Result cache not used: {cache.error}")
+        with run.phase("compare"):
+            mismatches = find_mismatches(lsb, rsb, len(masters), reference, TOLERANCE)
+        run.count("glyphs", len(glyphs))
+        run.count("mismatched glyphs", len(mismatches))
+
+        # Report which masters differ, and by how much (printed in full, not capped like the log)
+        print(f"Reference master: {masters[reference].name}, tolerance: {TOLERANCE} units")
+        for line in report_lines([g.name for g in glyphs], [m.name for m in masters], mismatches):
+            print(line)
+
+        # Create a list of unicode_string values
+        unicode_list = [glyph_token(glyphs[row]) for row, _ in mismatches]
+
+        # Print the unicode_string values as a space-separated list
+        print(" ".join(unicode_list))
+
+        # Create a new tab and populate it with the unicode_list
+        new_tab = font.newTab()
+        new_tab.text = " ".join(unicode_list)
 
 else:
     print("No font available.")
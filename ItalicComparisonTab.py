@@ -8,6 +8,7 @@ Button 2: Disables the visualization
 
 from vanilla import Window, Button, FloatingWindow, CheckBox
 from AppKit import NSColor, NSBezierPath, NSAffineTransform
+from naipe_core.italic_comparison import CURRENT, master_layers, deep_change_stamp, layout_slots
 
 class TwoButtonWindow:
     def __init__(self):
@@ -108,196 +109,110 @@ class TwoButtonWindow:
         Glyphs.redraw()
 
 
+# The comparison string, read left to right; CURRENT is the glyph being edited.
+#   glyph: control glyph name, or None for the current glyph
+#   layer: index among that glyph's layers for the current master (0 = master layer),
+#          or None for the layer being edited
+#   color: key into SLOT_COLORS
+#   group: slots sharing a group are skipped together when one of their layers is missing
+# Add control glyphs such as n, o or figures by adding slots here.
+COMPARISON_SLOTS = [
+    {"glyph": "H", "layer": 0, "color": "control", "group": "second"},
+    {"glyph": None, "layer": 1, "color": "second", "group": "second"},
+    {"glyph": "H", "layer": 0, "color": "control"},
+    CURRENT,
+    {"glyph": None, "layer": None, "color": "copy"},
+    {"glyph": "H", "layer": 0, "color": "control"},
+    {"glyph": None, "layer": 2, "color": "third", "group": "third"},
+    {"glyph": "H", "layer": 0, "color": "control", "group": "third"},
+]
+
+# RGBA per slot color; every slot turns black when "Show all glyphs in black" is on
+SLOT_COLORS = {
+    "control": (1.0, 0.0, 0.0, 0.5),   # the H glyphs
+    "second": (0.0, 1.0, 0.0, 0.5),    # second layer of the current glyph
+    "copy": (0.5, 0.5, 0.5, 0.5),      # copy of the current glyph
+    "third": (0.0, 0.0, 1.0, 0.5),     # third layer of the current glyph
+}
+BLACK = (0.0, 0.0, 0.0, 1.0)
+
+# Drop the whole cache once it holds this many drawings
+MAX_CACHED_DRAWINGS = 64
+
+CONTROL_GLYPH_NAMES = sorted({slot["glyph"] for slot in COMPARISON_SLOTS if slot.get("glyph")})
+
+
 class RedHReporter:
     """Reporter plugin to draw red H glyph in viewport"""
     
     def __init__(self):
         self.use_black_color = False
+        # (layer id, change stamps incl. component bases, master id, color mode) → [(NSColor, path), …]
+        self._drawings = {}
     
     def drawBackground(self, layer, info):
-        """Draw the red H glyph next to the current glyph"""
+        """Draw the comparison string around the current glyph"""
         try:
-            # Get the current font
-            font = layer.parent.parent
-            
-            # Get the H glyph
-            h_glyph = font.glyphs["H"]
-            if not h_glyph:
-                print("H glyph not found in font")
-                return
-            
-            # Get the current master
-            master = layer.master
-            h_layer = h_glyph.layers[master.id]
-            
-            if not h_layer:
-                print("H layer not found for current master")
-                return
-            
-            # Get H width for positioning
-            h_width = h_layer.width
-            
-            # Get the bezierPath for H (we'll reuse this)
-            bezierPath = h_layer.completeBezierPath
-            
-            # Get the current glyph to check for second layer
-            current_glyph = layer.parent
-            second_layer = None
-            second_layer_width = 0
-            
-            if current_glyph:
-                # Get all layers for the current master
-                master_layers = [l for l in current_glyph.layers if l.layerId == master.id or l.associatedMasterId == master.id]
-                
-                # Check if there's a second layer for this master
-                if len(master_layers) > 1:
-                    second_layer = master_layers[1]
-                    if second_layer and second_layer.paths:
-                        second_layer_width = second_layer.width
-            
-            # Draw second layer to the left of the leftmost H (if it exists)
-            if second_layer and second_layer.paths:
-                second_layer_offset = -h_width - second_layer_width
-                
-                # Set color for the second layer
-                if self.use_black_color:
-                    NSColor.colorWithCalibratedRed_green_blue_alpha_(0.0, 0.0, 0.0, 1.0).set()
-                else:
-                    NSColor.colorWithCalibratedRed_green_blue_alpha_(0.0, 1.0, 0.0, 0.5).set()
-                
-                # Draw the second layer
-                second_bezierPath = second_layer.completeBezierPath
-                transform_second = NSAffineTransform.transform()
-                transform_second.translateXBy_yBy_(second_layer_offset, 0)
-                
-                transformedPathSecond = second_bezierPath.copy()
-                transformedPathSecond.transformUsingAffineTransform_(transform_second)
-                transformedPathSecond.fill()
-                
-                # Draw another H to the left of the second layer
-                leftmost_h_offset = second_layer_offset - h_width
-                
-                # Set color for the leftmost H
-                if self.use_black_color:
-                    NSColor.colorWithCalibratedRed_green_blue_alpha_(0.0, 0.0, 0.0, 1.0).set()
-                else:
-                    NSColor.colorWithCalibratedRed_green_blue_alpha_(1.0, 0.0, 0.0, 0.5).set()
-                
-                transform_leftmost = NSAffineTransform.transform()
-                transform_leftmost.translateXBy_yBy_(leftmost_h_offset, 0)
-                
-                transformedPathLeftmost = bezierPath.copy()
-                transformedPathLeftmost.transformUsingAffineTransform_(transform_leftmost)
-                transformedPathLeftmost.fill()
-            
-            # Draw H to the left of the current glyph
-            left_h_offset = -h_width
-            
-            # Set color for the left H
-            if self.use_black_color:
-                NSColor.colorWithCalibratedRed_green_blue_alpha_(0.0, 0.0, 0.0, 1.0).set()
-            else:
-                NSColor.colorWithCalibratedRed_green_blue_alpha_(1.0, 0.0, 0.0, 0.5).set()
-            
-            # Draw the left H glyph
-            transform_left = NSAffineTransform.transform()
-            transform_left.translateXBy_yBy_(left_h_offset, 0)
-            
-            transformedPathLeft = bezierPath.copy()
-            transformedPathLeft.transformUsingAffineTransform_(transform_left)
-            transformedPathLeft.fill()
-            
-            # Get current glyph width to position H beside it
-            current_width = layer.width
-            
-            # Draw a copy of the current glyph right after the original
-            current_glyph_copy_offset = current_width
-            
-            # Set color for the current glyph copy
-            if self.use_black_color:
-                NSColor.colorWithCalibratedRed_green_blue_alpha_(0.0, 0.0, 0.0, 1.0).set()
-            else:
-                NSColor.colorWithCalibratedRed_green_blue_alpha_(0.5, 0.5, 0.5, 0.5).set()
-            
-            # Draw the current glyph copy
-            current_bezierPath = layer.completeBezierPath
-            transform_current = NSAffineTransform.transform()
-            transform_current.translateXBy_yBy_(current_glyph_copy_offset, 0)
-            
-            transformedPathCurrent = current_bezierPath.copy()
-            transformedPathCurrent.transformUsingAffineTransform_(transform_current)
-            transformedPathCurrent.fill()
-            
-            # Position H right after the current glyph copy
-            offset_x = current_width + current_width
-            
-            # Set color for the H
-            if self.use_black_color:
-                NSColor.colorWithCalibratedRed_green_blue_alpha_(0.0, 0.0, 0.0, 1.0).set()
-            else:
-                NSColor.colorWithCalibratedRed_green_blue_alpha_(1.0, 0.0, 0.0, 0.5).set()
-            
-            # Draw the H glyph
-            # Create transform to position the H
-            transform = NSAffineTransform.transform()
-            transform.translateXBy_yBy_(offset_x, 0)
-            
-            # Apply transform and draw
-            transformedPath = bezierPath.copy()
-            transformedPath.transformUsingAffineTransform_(transform)
-            transformedPath.fill()
-            
-            # Now draw the third layer of the current glyph to the right of H
             current_glyph = layer.parent
-            if current_glyph:
-                # Get all layers for the current master
-                master_layers = [l for l in current_glyph.layers if l.layerId == master.id or l.associatedMasterId == master.id]
-                
-                # Check if there's a third layer for this master
-                if len(master_layers) > 2:
-                    third_layer = master_layers[2]
-                    
-                    if third_layer and third_layer.paths:
-                        # Position third layer right after H (H width already includes sidebearings)
-                        h_width = h_layer.width
-                        third_layer_offset = offset_x + h_width
-                        
-                        # Set color for the third layer
-                        if self.use_black_color:
-                            NSColor.colorWithCalibratedRed_green_blue_alpha_(0.0, 0.0, 0.0, 1.0).set()
-                        else:
-                            NSColor.colorWithCalibratedRed_green_blue_alpha_(0.0, 0.0, 1.0, 0.5).set()
-                        
-                        # Draw the third layer
-                        third_bezierPath = third_layer.completeBezierPath
-                        transform2 = NSAffineTransform.transform()
-                        transform2.translateXBy_yBy_(third_layer_offset, 0)
-                        
-                        transformedPath2 = third_bezierPath.copy()
-                        transformedPath2.transformUsingAffineTransform_(transform2)
-                        transformedPath2.fill()
-                        
-                        # Draw another H to the right of the third layer
-                        third_layer_width = third_layer.width
-                        second_h_offset = third_layer_offset + third_layer_width
-                        
-                        # Set color for the final H
-                        if self.use_black_color:
-                            NSColor.colorWithCalibratedRed_green_blue_alpha_(0.0, 0.0, 0.0, 1.0).set()
-                        else:
-                            NSColor.colorWithCalibratedRed_green_blue_alpha_(1.0, 0.0, 0.0, 0.5).set()
-                        
-                        # Draw the second H
-                        transform3 = NSAffineTransform.transform()
-                        transform3.translateXBy_yBy_(second_h_offset, 0)
-                        
-                        transformedPath3 = bezierPath.copy()
-                        transformedPath3.transformUsingAffineTransform_(transform3)
-                        transformedPath3.fill()
+            font = current_glyph.parent
+            master = layer.master
+            control_glyphs = {name: font.glyphs[name] for name in CONTROL_GLYPH_NAMES}
+
+            # Panning and zooming reuse the cached paths; only edits rebuild them
+            key = (
+                layer.layerId,
+                deep_change_stamp(current_glyph, master),
+                tuple(deep_change_stamp(g, master) for g in control_glyphs.values()),
+                master.id,
+                self.use_black_color,
+            )
+            drawing = self._drawings.get(key)
+            if drawing is None:
+                drawing = self.build_drawing(layer, control_glyphs, master)
+                if len(self._drawings) >= MAX_CACHED_DRAWINGS:
+                    self._drawings.clear()
+                self._drawings[key] = drawing
+
+            # One fill per color
+            for color, path in drawing:
+                color.set()
+                path.fill()
             
         except Exception as e:
             print("Error drawing string: %s" % str(e))
 
+    def build_drawing(self, layer, control_glyphs, master):
+        """Lay out all slots once and merge their shifted paths per color."""
+        for name, glyph in control_glyphs.items():
+            if not glyph:
+                print(f"{name} glyph not found in font")
+
+        control_layers = {name: master_layers(glyph, master) for name, glyph in control_glyphs.items()}
+        placed = layout_slots(COMPARISON_SLOTS, layer, master_layers(layer.parent, master), control_layers)
+
+        # completeBezierPath is computed once per layer, however many slots use it
+        bezier_paths = {}
+        combined = {}
+        for slot_layer, offset_x, color_key in placed:
+            source = bezier_paths.get(id(slot_layer))
+            if source is None:
+                source = bezier_paths[id(slot_layer)] = slot_layer.completeBezierPath
+            color_key = "black" if self.use_black_color else color_key
+            path = combined.get(color_key)
+            if path is None:
+                path = combined[color_key] = NSBezierPath.bezierPath()
+            transform = NSAffineTransform.transform()
+            transform.translateXBy_yBy_(offset_x, 0)
+            shifted = source.copy()
+            shifted.transformUsingAffineTransform_(transform)
+            path.appendBezierPath_(shifted)
+
+        drawing = []
+        for color_key, path in combined.items():
+            r, g, b, a = BLACK if color_key == "black" else SLOT_COLORS[color_key]
+            drawing.append((NSColor.colorWithCalibratedRed_green_blue_alpha_(r, g, b, a), path))
+        return drawing
+
 
 # Run the script
 TwoButtonWindow()
\ No newline at end of file
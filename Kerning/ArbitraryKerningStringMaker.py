@@ -6,45 +6,7 @@ Creates kerning strings for arbitrary glyphs, including non-unicode ones.
 
 import vanilla
 from GlyphsApp import Glyphs
-
-# -----------------------------
-# 1. CONFIGURATION
-# -----------------------------
-
-UI_GROUPS = [
-    {"label": "Upper case", "key": "UC"},
-    {"label": "Lower case", "key": "lc"},
-    {"label": "Numbers", "key": "numbers"},
-    {"label": "Punctuation and Symbols", "key": "punctuation"}
-]
-
-NUMBER_BASE_NAMES = ["zero", "one", "seven", "four", "two", "five", "three", "six", "nine", "eight"]
-
-NUMBER_VARIANTS_CONFIG = [
-    {"suffix": None, "label": "Default Numbers"},
-    {"suffix": "lf", "label": "Lining Figures"},
-    {"suffix": "osf", "label": "Old Style Figures"},
-    {"suffix": "dnom", "label": "Denominators"},
-    {"suffix": "numr", "label": "Numerators"},
-    {"suffix": "sinf", "label": "Inferiors"},
-    {"suffix": "sups", "label": "Superiors"},
-    {"suffix": "tf", "label": "Tabular Figures"},
-    {"suffix": "tosf", "label": "Tabular Old Style Figures"},
-]
-
-DATA = {
-    "UC_LTN": {"chars": "HILEFTKMNUƯJŊOƠQCGŒØDƏBPRÞAÆVWYXZSẞĦÐŁĽ", "l_ctrl": "OH", "r_ctrl": "HO"},
-    "lc_LTN": {"chars": "nmuưriıjȷŋhlłľkoơøœeəcðbþpqdďđħgaætŧťfvywxzsß", "l_ctrl": "on", "r_ctrl": "no"},
-    "UC_CYR": {"chars": "НИПЏШЫІМЕЦЩДЈЮОФСЄЭЗВРЯГҐТЪЋЂБЬЊЛЉКЖХУЧАЅ", "l_ctrl": "ОН", "r_ctrl": "НО"},
-    "lc_CYR": {"chars": "нипџшыміцщдјюобфрћђесєэзвягґтьъњлљкжхчуаѕ", "l_ctrl": "он", "r_ctrl": "но"},
-    "UC_GRK": {"chars": "ΗΠΙΓΕΤΚΜΝΞΒΡΨΟΘΩΦΑΔΛΥΧΖΣΉΊΈΌΆΏΎΎ", "l_ctrl": "ΟΗ", "r_ctrl": "ΗΟ"},
-    "lc_GRK": {"chars": "ηπιτκμοσρδαβφψωεςζξθυνγχλ", "l_ctrl": "οη", "r_ctrl": "ηο"},
-    "punctuation": {
-        "chars": [".", ",", ":", ";", "-", "_", "/", "\\", "¡!", "¿?", "()", "[]", "{}", "‘’", "‚‘", "’", "\"\"", "\'\'", "‹›", "›‹", "*", "#", "&", "@", "©", "®", "¶", "§", "№", "$", "€", "£", "¥", "₦", "₹", "₩", "฿", "₫", "¢", "₴", "₽", "%", "‰", "†", "‡", "™", "ª", "º", "®", "↑", "↓", "↖", "↙", "←", "→", "↘", "↗", "☚", "☛", "❦", "<>"],
-        "chars_GRK": ["·"],  # ano teleia, prepended when Greek is selected
-        "l_ctrl": "OH", "r_ctrl": "HO"
-    }
-}
+from naipe_core.kerning import UI_GROUPS, SCRIPTS, KerningIndex, get_data_key, engine_for_font, is_heading
 
 class VariantKerningUI:
     def __init__(self):
@@ -60,6 +22,7 @@ class VariantKerningUI:
             48 + 21 +               # glyph input field + gap
             20 + 24 +               # Against This label
             len(UI_GROUPS) * 24 +   # checkboxes
+            10 + 24 + 24 +          # gap + kerning group and unkerned checkboxes
             20 +                    # gap before button
             28 + 17                 # button + bottom padding
         )
@@ -93,107 +56,49 @@ class VariantKerningUI:
             self.checkboxes[group['key']] = getattr(self.w, attr)
             y += 24
 
+        # Skip strings whose pairs only repeat kerning group pairs already shown
+        y += 10
+        self.w.byGroup = vanilla.CheckBox((20, y, -20, 20), "One string per kerning group pair", value=False)
+        y += 24
+        # Leave out strings whose pairs all have kerning in the current master
+        self.w.unkernedOnly = vanilla.CheckBox((20, y, -20, 20), "Only pairs without kerning (current master)", value=False)
+        y += 24
+
         y += 20
         self.w.button = vanilla.Button((50, y, -50, 28), "Generate Kerning Tabs", callback=self.generate)
 
         self.w.open()
 
-    def _format_glyph_name(self, name):
-        name = name.strip().lstrip("/")
-        return f"/{name} "
-
-    def _handle_slash_punc(self, punc):
-        if punc == "/": return "/slash "
-        return punc
-
-    def _get_flattened_and_wrappers(self, group_chars):
-        flat, wrappers = [], []
-        for item in group_chars:
-            for c in item: flat.append(c)
-            w_left = item[0]
-            w_right = item[1] if len(item) > 1 else item[0]
-            wrappers.append((w_left, w_right))
-        return flat, wrappers
+    def kerned_pairs(self, font):
+        """Kerning lookup of the current master when only unkerned pairs are wanted, else None."""
+        if not self.w.unkernedOnly.get():
+            return None
+        return KerningIndex(font, font.selectedFontMaster.id)
 
     def get_data_key(self, ui_key):
-        if ui_key in ["numbers", "punctuation"]: return ui_key
-        script = ["LTN", "CYR", "GRK"][self.w.scriptRadio.get()]
-        return f"{ui_key}_{script}"
-
-    def get_filtered_chars(self, font, data_key):
-        if data_key == "numbers": return []
-        raw = list(DATA[data_key]["chars"])
-        if data_key == "punctuation" and self.w.scriptRadio.get() == 2:
-            raw = DATA["punctuation"].get("chars_GRK", []) + raw
-        valid = [item for item in raw if all(font.glyphForCharacter_(ord(c)) or font.glyphs[c] for c in item)]
-        if self.w.orderRadio.get() == 1 and data_key != "punctuation":
-            valid.sort()
-        return valid
-
-    def get_variant_glyphs(self, font):
-        raw_input = self.w.glyphInput.get().strip()
-        if not raw_input: return []
-        names = [n.strip().lstrip("/") for n in raw_input.split() if n.strip()]
-        return [n for n in names if font.glyphs[n]]
+        return get_data_key(ui_key, SCRIPTS[self.w.scriptRadio.get()])
 
     def generate(self, sender):
         font = Glyphs.font
         if not font: return
+        engine = engine_for_font(font, refresh=True)
 
-        variant_glyphs = self.get_variant_glyphs(font)
+        raw_input = self.w.glyphInput.get().strip()
+        variant_glyphs = engine.valid_glyph_names(raw_input) if raw_input else []
         if not variant_glyphs: return
 
+        script = SCRIPTS[self.w.scriptRadio.get()]
+        alphabetical = self.w.orderRadio.get() == 1
+        by_group = bool(self.w.byGroup.get())
+        kerned = self.kerned_pairs(font)
         selected_sec_keys = [self.get_data_key(k) for k, cb in self.checkboxes.items() if cb.get()]
 
         for sec_key in selected_sec_keys:
-            if sec_key == "numbers":
-                self.generate_vs_numbers_tab(font, variant_glyphs)
-            else:
-                self.generate_standard_tab(font, variant_glyphs, sec_key)
-
-    def generate_standard_tab(self, font, variant_glyphs, s_key, chunk_size=10):
-        is_s_punc = s_key == "punctuation"
-        s_label = next(g["label"] for g in UI_GROUPS if g["key"] in s_key or s_key == g["key"])
-        lines = [f"--- Your Glyphs vs {s_label} ---"]
-
-        if is_s_punc:
-            punc_chars = self.get_filtered_chars(font, s_key)
-            _, wrappers = self._get_flattened_and_wrappers(punc_chars)
-            for v in variant_glyphs:
-                v_f = self._format_glyph_name(v)
-                pairs = [f"{self._handle_slash_punc(w_l)}{v_f}{self._handle_slash_punc(w_r)}" for w_l, w_r in wrappers]
-                for i in range(0, len(pairs), chunk_size):
-                    lines.append(" ".join(pairs[i:i + chunk_size]))
-        else:
-            s_chars = self.get_filtered_chars(font, s_key)
-            l_ctrl = DATA[s_key]["l_ctrl"]
-            r_ctrl = DATA[s_key]["r_ctrl"]
-            for v in variant_glyphs:
-                v_f = self._format_glyph_name(v)
-                line = " ".join(f"{l_ctrl}{v_f}{s}{v_f}{r_ctrl}" for s in s_chars)
-                lines.append(line)
-
-        font.newTab("\n\n".join(lines))
-
-    def generate_vs_numbers_tab(self, font, variant_glyphs):
-        variants = []
-        for cfg in NUMBER_VARIANTS_CONFIG:
-            suffix = cfg["suffix"]
-            glyphs = [f"{n}{'.'+suffix if suffix else ''}" for n in NUMBER_BASE_NAMES if font.glyphs[f"{n}{'.'+suffix if suffix else ''}"]]
-            if glyphs: variants.append({"label": cfg["label"], "glyphs": glyphs, "suffix": suffix})
-
-        all_lines = []
-        for var in variants:
-            all_lines.append(f"--- Your Glyphs vs {var['label']} ---")
-            z_fmt = self._format_glyph_name(f"zero{'.'+var['suffix'] if var['suffix'] else ''}")
-            l_ctrl = f"{z_fmt}{z_fmt}"
-            r_ctrl = f"{z_fmt}{z_fmt}"
-            for v in variant_glyphs:
-                v_f = self._format_glyph_name(v)
-                line = " ".join(f"{l_ctrl}{v_f}{self._format_glyph_name(n)}{v_f}{r_ctrl}" for n in var["glyphs"])
-                all_lines.append(line)
-
-        font.newTab("\n\n".join(all_lines))
+            lines = list(engine.variant_tab_lines(variant_glyphs, sec_key, script, alphabetical, by_group, kerned))
+            if kerned is not None and all(is_heading(line) for line in lines):
+                print(f"{lines[0].strip('- ') if lines else sec_key}: all pairs kerned in {font.selectedFontMaster.name}")
+                continue
+            font.newTab("\n\n".join(lines))
 
 if Glyphs.font:
     VariantKerningUI()
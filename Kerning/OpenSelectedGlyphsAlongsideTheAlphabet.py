@@ -7,6 +7,7 @@ Useful for script fonts.
 
 import vanilla
 from GlyphsApp import Glyphs
+from naipe_core.unicode_index import unicode_index, glyph_token
 
 # ── Alphabet definitions ────────────────────────────────────────────────────
 
@@ -41,21 +42,15 @@ def get_pref(key, default):
 
 def font_has_char(font, char):
     """Return True if the font contains a glyph for the given Unicode character."""
-    cp = "%04X" % ord(char)
-    for g in font.glyphs:
-        if g.unicode == cp:
-            return True
-    return False
+    return unicode_index(font).has_char(char)
 
 def filter_alphabet(font, chars):
     """Remove characters that are absent from the font."""
-    return [c for c in chars if font_has_char(font, c)]
+    return unicode_index(font).filter_chars(chars)
 
 def glyph_string(glyph):
     """Return the tab-string representation of a glyph (char or /name)."""
-    if glyph.unicode:
-        return chr(int(glyph.unicode, 16))
-    return "/" + glyph.name
+    return glyph_token(glyph)
 
 # ── Core string builder ──────────────────────────────────────────────────────
 
@@ -153,6 +148,9 @@ class AlphabetDialog:
 
         case_key = "lower" if self.case_index == 0 else "upper"
 
+        # Index the font's codepoints once for this run
+        unicode_index(self.font, refresh=True)
+
         # Build combined alphabet, filtered to glyphs in this font
         combined = []
         for script, active in [("Latin", self.use_latin),
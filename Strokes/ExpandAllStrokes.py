@@ -1,14 +1,26 @@
 # MenuTitle: Expand All Strokes
 # -*- coding: utf-8 -*-
-from vanilla import Window, TextBox, Button
+from vanilla import Window, TextBox, Button, ProgressBar
+from PyObjCTools import AppHelper
+from naipe_core.instrumentation import ScriptRun
+from naipe_core.strokes import stroked_layers
 
 __doc__ = """
 Turns all live strokes into paths. It's very destructive, but there's a confirmation dialogue.
+Only layers that actually contain stroked paths are expanded; a dry run reports how many would change.
 """
 
+# Layers expanded between two progress updates
+CHUNK_SIZE = 50
+
+# Measured after every run and used to estimate the next dry run
+PREF_KEY_SECONDS_PER_LAYER = "com.naipe.ExpandAllStrokes.secondsPerLayer"
+DEFAULT_SECONDS_PER_LAYER = 0.02
+
+
 class ExpandStrokesDialog:
     def __init__(self):
-        self.w = Window((280, 160), "Expand Strokes", minSize=(280, 160))
+        self.w = Window((300, 220), "Expand Strokes", minSize=(300, 220))
         
         # Centered prompt with warning emojis and double break after "undone."
         message = "⚠️ This will expand all strokes and\ncan't be undone. ⚠️\n\nAre you sure? 🧐"
@@ -18,35 +30,127 @@ class ExpandStrokesDialog:
             sizeStyle="regular",
             alignment="center"
         )
+
+        self.w.progress = ProgressBar((15, 105, -15, 16))
+        self.w.status = TextBox((15, 128, -15, 34), "", sizeStyle="small", alignment="center")
         
-        self.w.runButton = Button((15, -45, 115, 20), "I'm sure 😎", callback=self.run)
-        self.w.cancelButton = Button((-130, -45, 115, 20), "Cancel", callback=self.cancel)
+        self.w.dryRunButton = Button((15, -75, -15, 20), "Dry Run 🔍", callback=self.dry_run)
+        self.w.runButton = Button((15, -45, 125, 20), "I'm sure 😎", callback=self.run)
+        self.w.cancelButton = Button((-140, -45, 125, 20), "Cancel", callback=self.cancel)
+
+        self.font = None
+        self.pending = []
+        self.running = False
+
+        # Closing the window by any means stops the run, like Cancel
+        self.w.bind("close", self.window_closed)
         
         self.w.open()
-    
-    def run(self, sender):
-        import GlyphsApp
+
+    def seconds_per_layer(self):
+        return float(Glyphs.defaults[PREF_KEY_SECONDS_PER_LAYER] or DEFAULT_SECONDS_PER_LAYER)
+
+    def collect(self):
         font = Glyphs.font
         if not font:
             Glyphs.showMacroWindow()
             print("No font open.")
             self.w.close()
+            return None
+        self.font = font
+        return stroked_layers(font)
+
+    def dry_run(self, sender):
+        layers = self.collect()
+        if layers is None:
             return
-        
-        count = 0
-        for g in font.glyphs:
-            for l in g.layers:
-                if l.isMasterLayer or l.isSpecialLayer:
+        glyph_count = len({layer.parent.name for layer in layers})
+        estimate = len(layers) * self.seconds_per_layer()
+        self.w.status.set(f"{len(layers)} layers in {glyph_count} glyphs would be expanded (≈ {estimate:.1f}s).")
+    
+    def run(self, sender):
+        layers = self.collect()
+        if layers is None:
+            return
+        if not layers:
+            self.w.status.set("No live strokes found.")
+            return
+
+        # Timings and counts are collected across all chunks and printed once at the end
+        self.script_run = ScriptRun("Expand all strokes", Glyphs.defaults).start()
+
+        # Every chunk works on the font collected here, even if another
+        # document comes to the front while the run is in progress
+        self.pending = layers
+        self.total = len(layers)
+        self.count = 0
+        self.running = True
+        self.w.progress.set(0)
+        self.w.runButton.enable(False)
+        self.w.dryRunButton.enable(False)
+        AppHelper.callAfter(self.expand_chunk)
+
+    def expand_chunk(self):
+        """Expand one chunk, then yield to the event loop so Cancel stays clickable."""
+        if not self.running:
+            return
+        chunk, self.pending = self.pending[:CHUNK_SIZE], self.pending[CHUNK_SIZE:]
+        font = self.font
+        font.disableUpdateInterface()
+        completed = False
+        try:
+            with self.script_run.phase("expand"):
+                for l in chunk:
                     l.flattenOutlinesRemoveOverlap_origHints_secondaryPath_extraHandles_error_(
                         False, None, None, None, None
                     )
-                    count += 1
-        
+                    self.count += 1
+            completed = True
+        finally:
+            font.enableUpdateInterface()
+            # An error must not leave the dialog stuck with its buttons disabled
+            if not completed:
+                self.fail()
+
+        self.w.progress.set(100.0 * self.count / self.total)
+        self.w.status.set(f"Expanded {self.count} of {self.total} layers…")
+        if self.pending:
+            AppHelper.callAfter(self.expand_chunk)
+        else:
+            self.finish()
+
+    def finish(self):
+        self.running = False
+        if self.count:
+            Glyphs.defaults[PREF_KEY_SECONDS_PER_LAYER] = self.script_run.phases["expand"] / self.count
         Glyphs.showMacroWindow()
-        print(f"✅ Expanded strokes in {count} layers.")
+        self.script_run.count("layers expanded", self.count)
+        self.script_run.log(f"✅ Expanded strokes in {self.count} layers.")
+        self.script_run.finish()
         self.w.close()
     
+    def fail(self):
+        self.running = False
+        self.pending = []
+        self.w.runButton.enable(True)
+        self.w.dryRunButton.enable(True)
+        self.w.status.set(f"Failed after expanding {self.count} of {self.total} layers.")
+        Glyphs.showMacroWindow()
+        self.script_run.count("layers expanded", self.count)
+        self.script_run.log(f"⚠️ Failed after expanding {self.count} of {self.total} layers; expanded layers stay expanded.")
+        self.script_run.finish()
+
     def cancel(self, sender):
+        # window_closed() stops a run in progress
         self.w.close()
 
-ExpandStrokesDialog()
\ No newline at end of file
+    def window_closed(self, sender):
+        if self.running:
+            # Stop after the current chunk; expanded layers stay expanded
+            self.running = False
+            Glyphs.showMacroWindow()
+            self.script_run.count("layers expanded", self.count)
+            self.script_run.log(f"⏹ Cancelled after expanding {self.count} of {self.total} layers.")
+            self.script_run.finish()
+
+ExpandStrokesDialog()
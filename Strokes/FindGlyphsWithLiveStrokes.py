@@ -4,6 +4,14 @@ __doc__ = """
 Show glyphs with live strokes in each master, one tab per master.
 """
 
+from naipe_core.instrumentation import ScriptRun
+from naipe_core.result_cache import ResultCache
+from naipe_core.strokes import scan_live_strokes, glyphs_by_master
+from naipe_core.unicode_index import glyph_token
+
+# Also look at brace and bracket layers, counted towards their master
+INCLUDE_SPECIAL_LAYERS = False
+
 font = Glyphs.font
 if not font:
     Message("No font open.", title="Error")
@@ -12,44 +20,33 @@ if not font:
 Glyphs.showMacroWindow()
 print("Scanning for live strokes in master layers…\n")
 
-def glyph_token(glyph):
-    """Return a single glyph token for a tab: Unicode or /name for non-Unicode."""
-    if glyph.unicode:
-        try:
-            return chr(int(glyph.unicode, 16))
-        except Exception:
-            return f"/{glyph.name}"
-    return f"/{glyph.name}"
-
-for master in font.masters:
-    stroked_glyphs = []
-
-    for glyph in font.glyphs:
-        master_layer = glyph.layers[master.id]  # get master layer directly
-
-        if not master_layer:
-            continue
-
-        # Only count paths that have a strokeWidth set
-        has_live_stroke = any(
-            path.attributes and "strokeWidth" in path.attributes
-            for path in master_layer.paths
-        )
-
-        if has_live_stroke:
-            stroked_glyphs.append(glyph)
-
-    print(f"--- MASTER: {master.name} ---")
-    if stroked_glyphs:
-        # Format glyph names in quotes, comma-separated
-        glyph_names = ", ".join(f'"{g.name}"' for g in stroked_glyphs)
-        print(f"Found strokes in: {glyph_names}")
-        # Tab label + space-separated glyphs
-        label = f"-- {master.name}\n"
-        glyph_line = " ".join(glyph_token(g) for g in stroked_glyphs)
-        font.newTab(label + glyph_line)
-        print(f"Opened tab with {len(stroked_glyphs)} glyphs for master '{master.name}'\n")
-    else:
-        print("No stroked glyphs found for this master.\n")
-
-print("Done.")
+with ScriptRun("Find glyphs with live strokes", Glyphs.defaults) as run:
+    # Phase 1: visit each glyph once, checking all of its master layers;
+    # glyphs unchanged since the last run are read from the result cache
+    with run.phase("scan"), ResultCache(Glyphs.defaults) as cache:
+        stroked = scan_live_strokes(font, include_special=INCLUDE_SPECIAL_LAYERS, cache=cache)
+        by_master = glyphs_by_master(font, stroked)
+    run.count("glyphs scanned", cache.misses)
+    run.count("glyphs from cache", cache.hits)
+    if cache.error:
+        run.log(f"⚠️ Result cache not used: {cache.error}")
+    run.count("glyphs with strokes", len(stroked))
+
+    # Phase 2: report and open one tab per master
+    with run.phase("tabs"):
+        for master in font.masters:
+            stroked_glyphs = by_master[master.id]
+
+            # The listing is the result: printed in full, not capped like the log
+            print(f"--- MASTER: {master.name} ---")
+            if stroked_glyphs:
+                # Format glyph names in quotes, comma-separated
+                glyph_names = ", ".join(f'"{g.name}"' for g in stroked_glyphs)
+                print(f"Found strokes in: {glyph_names}")
+                # Tab label + space-separated glyphs
+                label = f"-- {master.name}\n"
+                glyph_line = " ".join(glyph_token(g) for g in stroked_glyphs)
+                font.newTab(label + glyph_line)
+                run.log(f"Opened tab with {len(stroked_glyphs)} glyphs for master '{master.name}'\n")
+            else:
+                print("No stroked glyphs found for this master.\n")
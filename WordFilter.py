@@ -2,19 +2,25 @@
 # -*- coding: utf-8 -*-
 __doc__="""
 Filter words from a paragraph using specified characters, with include/exclude and case-sensitive options.
+Can also query a word list file, indexed once on disk for fast repeated queries.
 """
 
+import os
+import threading
 import vanilla
-import re
+from vanilla.dialogs import getFile
 from AppKit import NSFont
+from PyObjCTools import AppHelper
+from naipe_core.wordfilter import filter_stream
+from naipe_core.wordcorpus import load_corpus, read_chunks
 
 class WordFilterApp:
     def __init__(self):
         # Create resizable window
         self.w = vanilla.FloatingWindow(
-            (600, 460),       # default window size
+            (600, 490),       # default window size
             "Word Filter",
-            minSize=(400, 350),
+            minSize=(400, 380),
             maxSize=(2000, 2000)
         )
 
@@ -61,23 +67,42 @@ class WordFilterApp:
             value=False
         )
 
+        # Corpus file: indexed on disk, queried instead of the paragraph when checked
+        self.w.corpusButton = vanilla.Button(
+            (10, 315, 150, 20),
+            "📚 Load Word List…",
+            callback=self.load_corpus
+        )
+        self.w.corpusCheckbox = vanilla.CheckBox(
+            (170, 315, -10, 20),
+            "Search word list (none loaded)",
+            value=False
+        )
+        self.w.corpusCheckbox.enable(False)
+
         # Filter button
         self.w.filterButton = vanilla.Button(
-            (10, 315, -10, 20),
+            (10, 345, -10, 20),
             "✨ Filter Words",
             callback=self.filter_words
         )
 
         # Label for output
         self.w.outputLabel = vanilla.TextBox(
-            (10, 345, -10, 20),
+            (10, 375, -10, 20),
             "📋 Filtered output:"
         )
 
         # Output text box
-        self.w.outputText = vanilla.TextEditor((10, 365, -10, -10), "", readOnly=True)
+        self.w.outputText = vanilla.TextEditor((10, 395, -10, -10), "", readOnly=True)
         self._make_plain_text(self.w.outputText)
 
+        # Incremented per click so stale background runs stop posting output
+        self._run_id = 0
+        self.corpus = None
+        # Word list that could not be indexed: scanned linearly instead
+        self.corpus_path = None
+
         # Open window
         self.w.open()
         self.w.makeKey()
@@ -96,30 +121,81 @@ class WordFilterApp:
         mode = self.w.modeRadio.get()              # 0 = Use only, 1 = Do not use
         case_sensitive = self.w.caseCheckbox.get()
 
-        # Prepare character set
-        if not case_sensitive:
-            chars_set = set(chars.lower())
+        # A new click supersedes any run still in progress
+        self._run_id += 1
+        self.w.outputText.set("")
+        self.w.filterButton.setTitle("⏳ Filtering…")
+
+        if self.corpus is not None and self.w.corpusCheckbox.get():
+            target, args = self._query_corpus, (self._run_id, self.corpus, chars, mode, case_sensitive)
+        elif self.corpus_path is not None and self.w.corpusCheckbox.get():
+            target, args = self._filter_in_background, (self._run_id, read_chunks(self.corpus_path), chars, mode, case_sensitive)
         else:
-            chars_set = set(chars)
-
-        # Split words ignoring punctuation
-        words = re.findall(r'\b\w+\b', text)
-
-        filtered_words = []
-        for word in words:
-            check_word = word if case_sensitive else word.lower()
-            has_char = any(c in chars_set for c in check_word)
-            all_chars_allowed = all(c in chars_set for c in check_word)
-
-            if mode == 0:  # Use only these characters
-                if all_chars_allowed:
-                    filtered_words.append(word)
-            else:          # Do not use these characters
-                if not has_char:
-                    filtered_words.append(word)
-
-        # Output result
-        self.w.outputText.set(" ".join(filtered_words))
+            target, args = self._filter_in_background, (self._run_id, text, chars, mode, case_sensitive)
+        worker = threading.Thread(target=target, args=args, daemon=True)
+        worker.start()
+
+    def load_corpus(self, sender):
+        paths = getFile(messageText="Choose a word list or text file", fileTypes=["txt", "dic", "csv"])
+        if not paths:
+            return
+        self.w.corpusCheckbox.setTitle("Indexing word list…")
+        self.w.corpusCheckbox.enable(False)
+        threading.Thread(target=self._load_corpus_in_background, args=(paths[0],), daemon=True).start()
+
+    def _load_corpus_in_background(self, path):
+        # Only rebuilds the on-disk index when the file changed since last time
+        try:
+            corpus = load_corpus(path)
+        except Exception as e:
+            AppHelper.callAfter(self._corpus_failed, path, e)
+            return
+        AppHelper.callAfter(self._corpus_loaded, path, corpus)
+
+    def _corpus_loaded(self, path, corpus):
+        self.corpus = corpus
+        self.corpus_path = None
+        self.w.corpusCheckbox.setTitle(f"Search word list: {os.path.basename(path)} ({len(corpus):,} words)")
+        self.w.corpusCheckbox.enable(True)
+        self.w.corpusCheckbox.set(True)
+
+    def _corpus_failed(self, path, error):
+        # Without an index the word list is still searched, by reading it through on every click
+        print(f"⚠️ Could not index {path}: {error}")
+        self.corpus = None
+        self.corpus_path = path if os.path.isfile(path) else None
+        if self.corpus_path is None:
+            self.w.corpusCheckbox.setTitle(f"Could not read {os.path.basename(path)}")
+            self.w.corpusCheckbox.set(False)
+            return
+        self.w.corpusCheckbox.setTitle(f"Search word list: {os.path.basename(path)} (not indexed, slower)")
+        self.w.corpusCheckbox.enable(True)
+        self.w.corpusCheckbox.set(True)
+
+    def _query_corpus(self, run_id, corpus, chars, mode, case_sensitive):
+        words = corpus.query(chars, mode, case_sensitive)
+        AppHelper.callAfter(self._append_output, run_id, " ".join(words))
+        AppHelper.callAfter(self._finish, run_id)
+
+    def _filter_in_background(self, run_id, text, chars, mode, case_sensitive):
+        """Tokenize and filter off the main thread, posting results as they come."""
+        first = True
+        for words in filter_stream(text, chars, mode, case_sensitive):
+            if run_id != self._run_id:
+                return
+            chunk = " ".join(words) if first else " " + " ".join(words)
+            first = False
+            AppHelper.callAfter(self._append_output, run_id, chunk)
+        AppHelper.callAfter(self._finish, run_id)
+
+    def _append_output(self, run_id, chunk):
+        # Append to the text storage instead of resetting the whole text
+        if run_id == self._run_id:
+            self.w.outputText.getNSTextView().textStorage().mutableString().appendString_(chunk)
+
+    def _finish(self, run_id):
+        if run_id == self._run_id:
+            self.w.filterButton.setTitle("✨ Filter Words")
 
 
 # Run the app
@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+"""
+Compares the old per-character font scan with the shared UnicodeIndex.
+
+    python3 benchmarks/bench_unicode_index.py
+
+The scan grows with the glyph count for every character; the index lookup
+stays flat once the index is built.
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from naipe_core.headless import GSFont, GSGlyph
+from naipe_core.unicode_index import UnicodeIndex
+
+ALPHABET = list("abcdefghijklmnopqrstuvwxyzαβγδεζηθικλμνξοπρσςτυφχψωабвгдежзиклмнопрстуфхцчшщъыьэюя")
+
+
+def build_font(glyph_count):
+    # Encoded glyphs start in the CJK block so the alphabet sits at the end
+    font = GSFont()
+    for i in range(glyph_count):
+        font.glyphs.append(GSGlyph(f"uni{0x4E00 + i:04X}", "%04X" % (0x4E00 + i)))
+    for c in ALPHABET:
+        font.glyphs.append(GSGlyph(f"uni{ord(c):04X}", "%04X" % ord(c)))
+    return font
+
+
+def scan_has_char(font, char):
+    cp = "%04X" % ord(char)
+    for g in font.glyphs:
+        if g.unicode == cp:
+            return True
+    return False
+
+
+def timed(func, repeat=3):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    print(f"{'glyphs':>8} {'scan/char':>12} {'build':>10} {'lookup/char':>12}")
+    for count in (500, 4000, 20000):
+        font = build_font(count)
+        scan = timed(lambda: [scan_has_char(font, c) for c in ALPHABET])
+        build = timed(lambda: UnicodeIndex(font))
+        index = UnicodeIndex(font)
+        lookup = timed(lambda: [index.has_char(c) for c in ALPHABET * 100])
+        print(f"{count:>8} {scan / len(ALPHABET) * 1e6:>10.2f}µs {build * 1e3:>8.2f}ms {lookup / (len(ALPHABET) * 100) * 1e6:>10.3f}µs")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,289 @@
+# -*- coding: utf-8 -*-
+"""
+Times each script's core routine against synthetic headless fonts.
+
+    python3 benchmarks/run_benchmarks.py
+    python3 benchmarks/run_benchmarks.py --sizes 500 5000 --masters 3 --only Strokes
+
+For every case the table shows the best time per size and the growth
+exponent between consecutive sizes (1.0 = linear, 2.0 = quadratic). With
+--max-exponent the run fails when a case grows faster than allowed.
+
+Synthetic fonts are unsaved, so the result cache skips them. The "cold" and
+"warm" cases give the font a temporary file path and their own cache
+database: cold times a run on an empty cache, warm a rerun of the same font.
+
+Scripts with a vanilla window can't run headless; their cases time the
+naipe_core routines the window calls, on the same data.
+"""
+
+import argparse
+import gc
+import math
+import os
+import random
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from naipe_core import headless
+from naipe_core.color_layers import ColorLayerIndex, remap_palettes
+from naipe_core.component_graph import component_graph
+from naipe_core.components import EmptyBaseIndex, DecomposedBaseCache, component_matcher, name_matcher, find_components
+from naipe_core.italic_comparison import CURRENT, master_layers, deep_change_stamp, layout_slots
+from naipe_core.kerning import KerningStringEngine, SCRIPTS, get_data_key
+from naipe_core.result_cache import CACHE_FILE_KEY
+from naipe_core.strokes import stroked_layers
+from naipe_core.unicode_index import unicode_index, glyph_token
+from naipe_core.wordcorpus import load_corpus
+from naipe_core.wordfilter import filter_stream, MODE_ONLY, MODE_EXCLUDE
+
+# ── Cases ────────────────────────────────────────────────────────────────────
+
+def script_case(relative_path):
+    path = os.path.join(ROOT, relative_path)
+    return lambda font: headless.run_script(path, font)
+
+# Font paths and cache databases of the cached cases, removed at exit
+CACHE_FOLDER = tempfile.TemporaryDirectory(prefix="naipe-benchmarks-")
+
+def cached_script_case(relative_path, warm):
+    """(prepare, run) for a script run against a saved font with its own cache."""
+    path = os.path.join(ROOT, relative_path)
+    name = os.path.splitext(os.path.basename(relative_path))[0]
+    defaults = {CACHE_FILE_KEY: os.path.join(CACHE_FOLDER.name, f"{name}-{'warm' if warm else 'cold'}.sqlite")}
+
+    def run(font):
+        font.filepath = os.path.join(CACHE_FOLDER.name, f"{len(font.glyphs)}.glyphs")
+        try:
+            headless.run_script(path, font, defaults=defaults)
+        finally:
+            font.filepath = None
+
+    def prepare(font):
+        if os.path.exists(defaults[CACHE_FILE_KEY]):
+            os.remove(defaults[CACHE_FILE_KEY])
+        if warm:
+            run(font)
+
+    return prepare, run
+
+def kerning_standard_tabs(font):
+    engine = KerningStringEngine(font)
+    for script in SCRIPTS:
+        for p_ui_key in ("UC", "lc"):
+            for s_ui_key in ("UC", "lc", "punctuation"):
+                p_key, s_key = get_data_key(p_ui_key, script), get_data_key(s_ui_key, script)
+                for _ in engine.standard_lines(p_key, s_key, script):
+                    pass
+
+ALPHABET = list("abcdefghijklmnopqrstuvwxyzαβγδεζηθικλμνξοπρσςτυφχψωабвгдежзиклмнопрстуфхцчшщъыьэюя")
+
+def alphabet_tab(font):
+    """OpenSelectedGlyphsAlongsideTheAlphabet.run(): index, filter, one line per selected glyph."""
+    index = unicode_index(font, refresh=True)
+    letters = index.filter_chars(ALPHABET)
+    tokens = {layer.parent.name: glyph_token(layer.parent) for layer in font.selectedLayers}
+    return "\n".join(token + token.join(letters) + token for token in tokens.values())
+
+def empty_components(font):
+    """DeleteEmptyComponentsInSelectedGlyphs with FONT_WIDE, reporting instead of removing."""
+    empty_bases = EmptyBaseIndex(font)
+    graph = component_graph(font, refresh=True)
+    find_components(graph.glyphs(graph.users_of_any(empty_bases.names())), empty_bases.matcher())
+
+def components_by_pattern(font):
+    """RemoveComponentsBySuffix, font-wide, reporting instead of removing."""
+    matches_name = component_matcher(suffixes=[".fina", ".sc"], pattern=r"comb$")
+    graph = component_graph(font, refresh=True)
+    find_components(graph.glyphs(graph.users_of_any(graph.used_bases(matches_name))), name_matcher(matches_name))
+
+def duplicate_decomposed(font):
+    """DuplicateMasterLayersWithName batch mode with decomposition, on detached copies."""
+    graph = component_graph(font, refresh=True)
+    decomposer = DecomposedBaseCache(font)
+    for glyph in font.glyphs:
+        decompose = bool(graph.bases_of(glyph.name))
+        for master in font.masters:
+            duplicate = glyph.layers[master.id].copy()
+            duplicate.associatedMasterId = master.id
+            if decompose and duplicate.components:
+                decomposer.decompose(duplicate)
+
+def color_font_case(func):
+    """(prepare, run) for a case that needs color layers: a font with 2 palette layers per master."""
+    fonts = {}
+
+    def prepare(font):
+        key = (len(font.glyphs), len(font.masters))
+        if key not in fonts:
+            fonts.clear()
+            fonts[key] = headless.synthetic_font(key[0], masters=key[1], color_layers=2)
+        return fonts[key]
+
+    return prepare, func
+
+def color_layer_index(font):
+    ColorLayerIndex(font.glyphs, include_masters=True)
+
+def color_palette_swap(font):
+    # Swapping 0 and 1 leaves the font as it was for the next repeat
+    glyphs = list(font.glyphs)
+    remap_palettes(glyphs, ColorLayerIndex(glyphs), {0: 1, 1: 0})
+    remap_palettes(glyphs, ColorLayerIndex(glyphs), {0: 1, 1: 0})
+
+ITALIC_SLOTS = [
+    {"glyph": "H", "layer": 0, "color": "control", "group": "second"},
+    {"glyph": None, "layer": 1, "color": "second", "group": "second"},
+    {"glyph": "H", "layer": 0, "color": "control"},
+    CURRENT,
+    {"glyph": None, "layer": None, "color": "copy"},
+    {"glyph": "H", "layer": 0, "color": "control"},
+]
+
+def italic_comparison(font):
+    """ItalicComparisonTab's cache key and layout, for every glyph in the first master."""
+    master = font.masters[0]
+    control = font.glyphs["H"]
+    control_layers = {"H": master_layers(control, master)}
+    for glyph in font.glyphs:
+        layer = glyph.layers[master.id]
+        (layer.layerId, deep_change_stamp(glyph, master), deep_change_stamp(control, master))
+        layout_slots(ITALIC_SLOTS, layer, master_layers(glyph, master), control_layers)
+
+def word_text(size, seed=0):
+    """Ten words per glyph from a vocabulary of five per glyph, common words first."""
+    rng = random.Random(seed)
+    letters = "abcdefghijklmnopqrstuvwxyzáéíóúñç"
+    vocabulary = ["".join(rng.choice(letters) for _ in range(rng.randint(2, 12))) for _ in range(size * 5)]
+    return " ".join(vocabulary[int(len(vocabulary) * rng.random() ** 3)] for _ in range(size * 10))
+
+def word_filter_case():
+    """(prepare, run) for filter_stream; the text is generated, untimed, once per size."""
+    texts = {}
+
+    def prepare(font):
+        size = len(font.glyphs)
+        if size not in texts:
+            texts.clear()
+            texts[size] = word_text(size)
+        return texts[size]
+
+    def run(text):
+        for _ in filter_stream(text, "aeiou", MODE_EXCLUDE):
+            pass
+
+    return prepare, run
+
+def word_corpus_case():
+    """(prepare, run) for WordCorpus queries; the index is built, untimed, once per size."""
+    corpora = {}
+
+    def prepare(font):
+        size = len(font.glyphs)
+        if size not in corpora:
+            source = os.path.join(CACHE_FOLDER.name, f"words-{size}.txt")
+            with open(source, "w", encoding="utf-8") as f:
+                f.write(word_text(size))
+            corpora[size] = load_corpus(source, os.path.join(CACHE_FOLDER.name, f"words-{size}.wordindex"))
+        return corpora[size]
+
+    def run(corpus):
+        corpus.query("abcdefghijklmn", MODE_ONLY)
+        corpus.query("aeiou", MODE_EXCLUDE)
+
+    return prepare, run
+
+CASES = {
+    "NewTabsWithDiacritics": script_case("NewTabsWithDiacritics.py"),
+    "Find Glyphs Without Synched Side Bearings": script_case("Find Glyphs Without Synched Side Bearings.py"),
+    "Find Glyphs Without Synched Side Bearings (cold)": cached_script_case("Find Glyphs Without Synched Side Bearings.py", warm=False),
+    "Find Glyphs Without Synched Side Bearings (warm)": cached_script_case("Find Glyphs Without Synched Side Bearings.py", warm=True),
+    "Strokes/FindGlyphsWithLiveStrokes": script_case("Strokes/FindGlyphsWithLiveStrokes.py"),
+    "Strokes/FindGlyphsWithLiveStrokes (cold)": cached_script_case("Strokes/FindGlyphsWithLiveStrokes.py", warm=False),
+    "Strokes/FindGlyphsWithLiveStrokes (warm)": cached_script_case("Strokes/FindGlyphsWithLiveStrokes.py", warm=True),
+    "Strokes/ExpandAllStrokes.stroked_layers": stroked_layers,
+    "Components/DeleteEmptyComponents (font-wide)": empty_components,
+    "Components/RemoveComponentsBySuffix (font-wide)": components_by_pattern,
+    "Color Fonts: ColorLayerIndex": color_font_case(color_layer_index),
+    "Color Fonts/FindAndReplaceColorIndex.remap_palettes": color_font_case(color_palette_swap),
+    "DuplicateMasterLayersWithName batch (decompose)": duplicate_decomposed,
+    "KerningStringMaker.generate_standard_tab": kerning_standard_tabs,
+    "OpenSelectedGlyphsAlongsideTheAlphabet.run": alphabet_tab,
+    "ItalicComparisonTab cache key and layout": italic_comparison,
+    "WordFilter.filter_stream": word_filter_case(),
+    "WordFilter corpus query": word_corpus_case(),
+}
+
+# ── Runner ───────────────────────────────────────────────────────────────────
+
+def best_time(case, font, repeat):
+    """
+    Best of `repeat` runs. A (prepare, run) case is prepared, untimed, before
+    every run; when prepare returns something, run gets it instead of the font.
+    Like timeit, the garbage collector is off while a run is timed.
+    """
+    prepare, func = case if isinstance(case, tuple) else (None, case)
+    best = None
+    for _ in range(repeat):
+        subject = font
+        if prepare is not None:
+            prepared = prepare(font)
+            if prepared is not None:
+                subject = prepared
+        gc.collect()
+        gc.disable()
+        try:
+            start = time.perf_counter()
+            func(subject)
+            elapsed = time.perf_counter() - start
+        finally:
+            gc.enable()
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+def growth(sizes, times):
+    """Return the growth exponent between each pair of consecutive sizes."""
+    exponents = []
+    for (n1, t1), (n2, t2) in zip(zip(sizes, times), zip(sizes[1:], times[1:])):
+        if t1 > 0 and t2 > 0:
+            exponents.append(math.log(t2 / t1) / math.log(n2 / n1))
+    return exponents
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[500, 5000, 50000])
+    parser.add_argument("--masters", type=int, default=3)
+    parser.add_argument("--repeat", type=int, default=1)
+    parser.add_argument("--only", default="", help="run only cases whose name contains this text")
+    parser.add_argument("--max-exponent", type=float, default=None)
+    args = parser.parse_args(argv)
+
+    cases = {name: func for name, func in CASES.items() if args.only in name}
+    results = {name: [] for name in cases}
+    for size in args.sizes:
+        font = headless.synthetic_font(size, masters=args.masters)
+        for name, func in cases.items():
+            results[name].append(best_time(func, font, args.repeat))
+
+    header = "".join(f"{size:>12}" for size in args.sizes)
+    print(f"{'case':<56}{header}   growth")
+    failed = []
+    for name, times in results.items():
+        exponents = growth(args.sizes, times)
+        cells = "".join(f"{t * 1e3:>10.1f}ms" for t in times)
+        print(f"{name:<56}{cells}   {' '.join(f'{e:.2f}' for e in exponents)}")
+        if args.max_exponent is not None and any(e > args.max_exponent for e in exponents):
+            failed.append(name)
+
+    if failed:
+        print(f"\nGrowth above {args.max_exponent}: {', '.join(failed)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,7 @@
+# -*- coding: utf-8 -*-
+"""
+Shared, headless helpers for the Naipe Foundry Glyphs scripts.
+
+Nothing in this package imports GlyphsApp or vanilla at module level, so the
+modules can be imported (and benchmarked) outside of Glyphs.
+"""
@@ -0,0 +1,214 @@
+# -*- coding: utf-8 -*-
+"""
+Color-layer index for the Color Fonts scripts.
+
+Each glyph's layers are visited once and its color layers are filed by
+master and palette index (layer.attributes["colorPalette"], falling back to
+a "Color N" layer name), so scripts look layers up instead of rescanning
+glyph.layers by name for every operation.
+"""
+
+from collections import namedtuple
+
+# position is the layer's index in glyph.layers when the index was built
+ColorLayer = namedtuple("ColorLayer", "position layer master_id palette")
+
+COLOR_PREFIX = "Color"
+
+def palette_of(layer):
+    """
+    Palette index of a color layer: the colorPalette attribute, or N from a
+    "Color N" layer name. None if neither is set.
+    """
+    try:
+        value = layer.attributes["colorPalette"]
+    except (KeyError, TypeError):
+        value = None
+    if value is not None:
+        try:
+            return int(value)
+        except (TypeError, ValueError):
+            return value
+    name = layer.name or ""
+    if name.startswith(COLOR_PREFIX):
+        number = name[len(COLOR_PREFIX):].strip()
+        if number.isdigit():
+            return int(number)
+    return None
+
+def is_color_layer(layer, palette=None):
+    """
+    A non-master layer with a palette index: a colorPalette attribute or an
+    exact "Color N" name. Layers merely named "Color…" (e.g. "Colorful
+    Bold") are not color layers.
+    """
+    if layer.layerId == layer.associatedMasterId:
+        return False
+    if palette is None:
+        palette = palette_of(layer)
+    return palette is not None
+
+def is_full_color_layer(layer):
+    """
+    A non-master full-color layer (SVG/sbix style): a "color" attribute or
+    the plain "Color" name Glyphs gives these layers. It has no palette index.
+    """
+    if layer.layerId == layer.associatedMasterId:
+        return False
+    try:
+        if layer.attributes["color"]:
+            return True
+    except (KeyError, TypeError):
+        pass
+    return (layer.name or "").strip() == COLOR_PREFIX
+
+
+class ColorLayerIndex:
+    """
+    Color layers of a set of glyphs, by glyph, master, palette and name.
+    With include_masters=True, master layers are filed too (palette None),
+    for scripts that also move content from or to the master layer. With
+    include_full_color=True, full-color "Color" layers are filed too
+    (palette None), for scripts that treat them like palette layers.
+    """
+
+    def __init__(self, glyphs, include_masters=False, include_full_color=False):
+        self.include_masters = include_masters
+        self.include_full_color = include_full_color
+        self.entries = {}   # glyph name → [ColorLayer], in layer order
+        for glyph in glyphs:
+            self.update_glyph(glyph)
+
+    def update_glyph(self, glyph):
+        """(Re-)index one glyph, e.g. after adding or deleting layers."""
+        entries = []
+        for position, layer in enumerate(glyph.layers):
+            palette = palette_of(layer)
+            if (is_color_layer(layer, palette)
+                    or (self.include_masters and layer.isMasterLayer)
+                    or (self.include_full_color and is_full_color_layer(layer))):
+                entries.append(ColorLayer(position, layer, layer.associatedMasterId, palette))
+        if entries:
+            self.entries[glyph.name] = entries
+        else:
+            self.entries.pop(glyph.name, None)
+
+    def has_color_layers(self, glyph):
+        return glyph.name in self.entries
+
+    def color_layers(self, glyph, palette=None, master_id=None):
+        """The glyph's color layers, optionally only one palette and/or master."""
+        return [
+            entry.layer for entry in self.entries.get(glyph.name, ())
+            if (palette is None or entry.palette == palette)
+            and (master_id is None or entry.master_id == master_id)
+        ]
+
+    def positions(self, glyph):
+        """Indexes of the glyph's color layers in glyph.layers."""
+        return [entry.position for entry in self.entries.get(glyph.name, ())]
+
+    def by_name(self, glyph, name, master_id=None):
+        """The glyph's color layers with this display name."""
+        return [
+            entry.layer for entry in self.entries.get(glyph.name, ())
+            if entry.layer.name == name and (master_id is None or entry.master_id == master_id)
+        ]
+
+    def layer_names(self):
+        """Distinct color layer names, in order of first appearance."""
+        names = {}
+        for entries in self.entries.values():
+            for entry in entries:
+                names.setdefault(entry.layer.name, None)
+        return list(names)
+
+    def palettes(self):
+        """Palette indexes in use, sorted (numbers first)."""
+        used = {entry.palette for entries in self.entries.values() for entry in entries}
+        used.discard(None)
+        numbers = sorted(p for p in used if isinstance(p, int))
+        return numbers + sorted((p for p in used if not isinstance(p, int)), key=str)
+
+
+# ── Palette remapping ────────────────────────────────────────────────────────
+
+PALETTES_PARAMETER = "Color Palettes"
+
+def palette_color_count(font):
+    """
+    Number of colors every CPAL palette of the font has (the smallest, if
+    they differ), from the "Color Palettes" parameter. None if there is none.
+    """
+    counts = []
+    sources = [font] + list(font.masters)
+    for source in sources:
+        try:
+            palettes = source.customParameters[PALETTES_PARAMETER]
+        except (AttributeError, KeyError):
+            palettes = None
+        for palette in palettes or ():
+            counts.append(len(palette))
+    return min(counts) if counts else None
+
+def parse_mapping(text):
+    """
+    Parse "2>1, 3>2" (or "2:1 3:2", "2→1") into {2: 1, 3: 2}. Raise ValueError
+    on malformed pairs or an index mapped twice.
+    """
+    mapping = {}
+    for pair in text.replace(",", " ").split():
+        for separator in (">", ":", "→"):
+            if separator in pair:
+                old, new = pair.split(separator, 1)
+                break
+        else:
+            raise ValueError(f"'{pair}' is not an old>new pair.")
+        try:
+            old, new = int(old), int(new)
+        except ValueError:
+            raise ValueError(f"'{pair}' does not use whole numbers.")
+        if old in mapping:
+            raise ValueError(f"Index {old} is mapped twice.")
+        mapping[old] = new
+    return mapping
+
+def validate_mapping(mapping, color_count):
+    """Return a list of problems with the mapping; empty if it can be applied."""
+    problems = []
+    if not mapping:
+        problems.append("The mapping is empty.")
+    for old, new in sorted(mapping.items()):
+        if old < 0 or new < 0:
+            problems.append(f"{old}>{new}: palette indexes can't be negative.")
+        elif color_count is not None and new >= color_count:
+            problems.append(f"{old}>{new}: the palettes only have {color_count} colors (0–{color_count - 1}).")
+    return problems
+
+def remap_palettes(glyphs, color_index, mapping, rename=True):
+    """
+    Apply an old→new palette mapping to the color layers of `glyphs`, in one
+    pass per glyph over all masters. Every layer is mapped from its original
+    index, so swaps (1>2, 2>1) and collapses (2>1, 3>1) work. With rename,
+    "Color N" names follow their new index. Return [(glyph, layer, old, new)].
+    """
+    changes = []
+    for glyph in glyphs:
+        todo = [
+            (entry.layer, entry.palette, mapping[entry.palette])
+            for entry in color_index.entries.get(glyph.name, ())
+            if entry.palette in mapping and mapping[entry.palette] != entry.palette
+        ]
+        if not todo:
+            continue
+        glyph.beginUndo()
+        try:
+            for layer, old, new in todo:
+                layer.attributes["colorPalette"] = new
+                if rename and layer.name == f"{COLOR_PREFIX} {old}":
+                    layer.name = f"{COLOR_PREFIX} {new}"
+                changes.append((glyph, layer, old, new))
+        finally:
+            glyph.endUndo()
+        color_index.update_glyph(glyph)
+    return changes
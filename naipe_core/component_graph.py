@@ -0,0 +1,157 @@
+# -*- coding: utf-8 -*-
+"""
+Font-wide component dependency graph.
+
+One pass over every layer of every glyph records composite → bases and the
+reverse base → composites edges. Queries walk only the edges they return,
+so "every glyph using acutecomb, directly or through another composite"
+costs O(result), not a font scan. Edited glyphs can be re-indexed one at a
+time, or picked up by refresh() from their lastChange stamps.
+"""
+
+from naipe_core.font_cache import FontCache
+from naipe_core.unicode_index import font_signature
+
+def glyph_component_names(glyph):
+    """Names of the components used on any layer of the glyph."""
+    names = set()
+    for layer in glyph.layers:
+        if layer is None:
+            continue
+        for component in layer.components:
+            names.add(component.componentName)
+    return names
+
+
+class ComponentGraph:
+    """Which glyphs use which components, across all layers."""
+
+    def __init__(self, font):
+        self.font = font
+        self.bases = {}     # composite name → set of component names
+        self.users = {}     # component name → set of composite names
+        self.order = {}     # glyph name → position in the font
+        self.stamps = {}    # glyph name → lastChange when indexed
+        for glyph in font.glyphs:
+            self.order[glyph.name] = len(self.order)
+            self._index(glyph)
+        self.signature = font_signature(font)
+
+    def _index(self, glyph):
+        names = glyph_component_names(glyph)
+        self.stamps[glyph.name] = getattr(glyph, "lastChange", None)
+        if names:
+            self.bases[glyph.name] = names
+            for name in names:
+                self.users.setdefault(name, set()).add(glyph.name)
+
+    def _unlink(self, name):
+        for base in self.bases.pop(name, ()):
+            users = self.users.get(base)
+            if users is not None:
+                users.discard(name)
+                if not users:
+                    del self.users[base]
+
+    # ── Updates ──────────────────────────────────────────────────────────────
+
+    def update_glyph(self, glyph):
+        """Re-index one glyph after its components changed (or it was added)."""
+        self._unlink(glyph.name)
+        if glyph.name not in self.order:
+            self.order[glyph.name] = len(self.order)
+        self._index(glyph)
+
+    def remove_glyph(self, name):
+        """Forget a deleted glyph. Components pointing at it keep their edges."""
+        self._unlink(name)
+        self.order.pop(name, None)
+        self.stamps.pop(name, None)
+
+    def refresh(self):
+        """Re-index the glyphs whose lastChange differs, and drop deleted ones."""
+        current = set()
+        for glyph in self.font.glyphs:
+            current.add(glyph.name)
+            if glyph.name not in self.stamps or getattr(glyph, "lastChange", None) != self.stamps[glyph.name]:
+                self.update_glyph(glyph)
+        for name in [name for name in self.order if name not in current]:
+            self.remove_glyph(name)
+        self.signature = font_signature(self.font)
+
+    # ── Queries ──────────────────────────────────────────────────────────────
+
+    def _sorted(self, names):
+        order = self.order
+        return sorted(names, key=lambda name: order.get(name, len(order)))
+
+    @staticmethod
+    def _walk(edges, start):
+        found = set()
+        pending = list(edges.get(start, ()))
+        while pending:
+            name = pending.pop()
+            if name not in found:
+                found.add(name)
+                pending.extend(edges.get(name, ()))
+        found.discard(start)
+        return found
+
+    def users_of(self, base, transitive=False):
+        """Names of the glyphs using `base`, in font order."""
+        names = self._walk(self.users, base) if transitive else self.users.get(base, ())
+        return self._sorted(names)
+
+    def bases_of(self, composite, transitive=False):
+        """Names of the components `composite` is built from, in font order."""
+        names = self._walk(self.bases, composite) if transitive else self.bases.get(composite, ())
+        return self._sorted(names)
+
+    def users_of_any(self, bases, transitive=False):
+        """Names of the glyphs using any of `bases`, in font order."""
+        names = set()
+        for base in bases:
+            if transitive:
+                names |= self._walk(self.users, base)
+            else:
+                names |= self.users.get(base, set())
+        return self._sorted(names)
+
+    def used_bases(self, predicate=None):
+        """Component names used somewhere in the font, optionally filtered."""
+        if predicate is None:
+            return list(self.users)
+        return [name for name in self.users if predicate(name)]
+
+    def glyphs(self, names):
+        """Resolve names to glyph objects, skipping the ones not in the font."""
+        glyphs = []
+        for name in names:
+            glyph = self.font.glyphs[name]
+            if glyph is not None:
+                glyphs.append(glyph)
+        return glyphs
+
+
+_GRAPHS = FontCache()
+
+def component_graph(font, refresh=False):
+    """
+    Return the cached ComponentGraph for `font`. With refresh=True, or when
+    the glyph count moved, edited glyphs are re-indexed.
+    The cache outlives a script run, so scripts pass refresh=True once at
+    the start of each run: the glyph count alone misses most edits.
+    """
+    graph = _GRAPHS.get(font)
+    if graph is None:
+        graph = _GRAPHS.set(font, ComponentGraph(font))
+    elif refresh or graph.signature != font_signature(font):
+        graph.refresh()
+    return graph
+
+def invalidate(font=None):
+    """Drop the cached graph for `font`, or all graphs."""
+    if font is None:
+        _GRAPHS.clear()
+    else:
+        _GRAPHS.pop(font)
@@ -0,0 +1,209 @@
+# -*- coding: utf-8 -*-
+"""
+Bulk component cleanup and decomposition.
+
+Component tests are answered from indexes built once up front (empty base
+layers, memoized name predicates) instead of resolving `componentLayer` per
+component, and matching components are removed in a single pass over every
+layer, with one undo group per glyph. Decomposition of many layers reuses
+each base's flattened outlines per master.
+"""
+
+import re
+from collections import Counter, namedtuple
+
+# One entry of a removal report
+Removal = namedtuple("Removal", "glyph layer names")
+
+# Glyphs.defaults switch: the component cleanup menu scripts work on every glyph
+# in the font instead of just the selection
+FONT_WIDE_KEY = "com.naipe.componentsFontWide"
+
+
+class EmptyBaseIndex:
+    """
+    Knows which base layers are empty, so a component can be checked without
+    resolving its componentLayer. A component on a special (brace/bracket)
+    layer resolves to the base's special layer of the same name and master,
+    falling back to the master layer, like Glyphs does.
+    """
+
+    def __init__(self, font, glyphs=None):
+        self.empty = set()      # (glyph name, master id, special layer name or None)
+        self.special = set()    # (glyph name, master id, special layer name) that exist
+        for glyph in (font.glyphs if glyphs is None else glyphs):
+            for layer in glyph.layers:
+                if layer.isMasterLayer:
+                    key = (glyph.name, layer.layerId, None)
+                elif layer.isSpecialLayer:
+                    key = (glyph.name, layer.associatedMasterId, layer.name)
+                    self.special.add(key)
+                else:
+                    continue
+                if not layer.shapes:
+                    self.empty.add(key)
+
+    def names(self):
+        """Names of the glyphs with at least one empty master or special layer."""
+        return {name for name, _, _ in self.empty}
+
+    def is_empty(self, component_name, layer):
+        """Return True if the component on `layer` points at an empty base layer."""
+        master_id = layer.associatedMasterId
+        if not layer.isMasterLayer:
+            key = (component_name, master_id, layer.name)
+            if key in self.special:
+                return key in self.empty
+        return (component_name, master_id, None) in self.empty
+
+    def matcher(self):
+        """Return a (layer, component) test for remove_components()."""
+        return lambda layer, component: self.is_empty(component.componentName, layer)
+
+
+def name_predicate(test):
+    """
+    Memoize a test on component names: each distinct name is checked once,
+    however many components use it.
+    """
+    cache = {}
+    def predicate(name):
+        result = cache.get(name)
+        if result is None:
+            result = cache[name] = bool(test(name))
+        return result
+    return predicate
+
+def name_matcher(test):
+    """Return a (layer, component) test that only looks at the component name."""
+    predicate = name_predicate(test)
+    return lambda layer, component: predicate(component.componentName)
+
+def component_matcher(suffixes=None, pattern=None):
+    """
+    Compile suffixes (".init", ".medi", …) and/or a regex (string or compiled)
+    into one name test. Suffixes match at the end of the name, the regex
+    anywhere in it.
+    """
+    parts = []
+    if suffixes:
+        parts.append("(?:%s)$" % "|".join(re.escape(suffix) for suffix in suffixes))
+    if pattern is not None:
+        parts.append(pattern.pattern if hasattr(pattern, "pattern") else pattern)
+    if not parts:
+        raise ValueError("Give at least one suffix or a pattern.")
+    flags = pattern.flags if hasattr(pattern, "flags") else 0
+    search = re.compile("|".join("(?:%s)" % part for part in parts), flags).search
+    return name_predicate(lambda name: search(name) is not None)
+
+def target_glyphs(font, font_wide=False):
+    """All glyphs of the font, or the selected glyphs without duplicates."""
+    if font_wide:
+        return list(font.glyphs)
+    glyphs = []
+    seen = set()
+    for layer in font.selectedLayers:
+        glyph = layer.parent
+        if glyph.name not in seen:
+            seen.add(glyph.name)
+            glyphs.append(glyph)
+    return glyphs
+
+def find_components(glyphs, matches):
+    """
+    Like remove_components(), but only report: a list of Removal(glyph,
+    layer, names) for the components that would be removed.
+    """
+    found = []
+    for glyph in glyphs:
+        for layer in glyph.layers:
+            names = [c.componentName for c in layer.components if matches(layer, c)]
+            if names:
+                found.append(Removal(glyph, layer, names))
+    return found
+
+def remove_components(glyphs, matches):
+    """
+    Remove every component for which `matches(layer, component)` is True from
+    all layers of `glyphs`. Return a list of Removal(glyph, layer, names).
+    """
+    removed = []
+    for glyph in glyphs:
+        undo_open = False
+        try:
+            for layer in glyph.layers:
+                doomed = [c for c in layer.components if matches(layer, c)]
+                if not doomed:
+                    continue
+                if not undo_open:
+                    glyph.beginUndo()
+                    undo_open = True
+                for component in doomed:
+                    layer.shapes.remove(component)
+                removed.append(Removal(glyph, layer, [c.componentName for c in doomed]))
+        finally:
+            if undo_open:
+                glyph.endUndo()
+    return removed
+
+def summarize(removed):
+    """Return (glyph count, layer count, Counter of removed component names)."""
+    names = Counter()
+    for removal in removed:
+        names.update(removal.names)
+    return len({removal.glyph.name for removal in removed}), len(removed), names
+
+
+class DecomposedBaseCache:
+    """
+    Decomposed outlines of base glyphs, per master, shared by every layer
+    that is decomposed while the cache lives. Each base master layer is
+    flattened once; components just copy and transform its paths.
+    """
+
+    def __init__(self, font):
+        self.font = font
+        self.paths = {}     # (base name, master id) → decomposed paths, or None
+        self.hits = 0
+        self.misses = 0
+
+    def base_paths(self, name, master_id):
+        key = (name, master_id)
+        if key in self.paths:
+            self.hits += 1
+            return self.paths[key]
+        self.misses += 1
+        paths = None
+        base = self.font.glyphs[name]
+        if base is not None:
+            base_layer = base.layers[master_id]
+            if base_layer is not None:
+                paths = list(base_layer.copyDecomposedLayer().paths)
+        self.paths[key] = paths
+        return paths
+
+    def decompose(self, layer):
+        """
+        Decompose the components of a non-special layer in place. Smart
+        components, and bases missing in this master, fall back to Glyphs' own
+        decomposition.
+        """
+        if any(c.smartComponentValues for c in layer.components):
+            layer.decomposeComponents()
+            return
+        master_id = layer.associatedMasterId
+        shapes = []
+        for shape in layer.shapes:
+            if not hasattr(shape, "componentName"):
+                shapes.append(shape)
+                continue
+            paths = self.base_paths(shape.componentName, master_id)
+            if paths is None:
+                layer.decomposeComponents()
+                return
+            transform = tuple(shape.transform)
+            for path in paths:
+                path = path.copy()
+                path.applyTransform(transform)
+                shapes.append(path)
+        layer.shapes = shapes
@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+"""
+Mark → base-glyph index for the diacritic specimen tabs.
+
+The shared component graph says which glyphs use each mark; the summary
+tab and the per-mark tabs are both read from it.
+"""
+
+from naipe_core.component_graph import component_graph
+from naipe_core.unicode_index import glyph_token
+
+def is_nonspacing_mark(glyph):
+    return glyph.category == "Mark" and glyph.subCategory == "Nonspacing"
+
+def tab_token(glyph):
+    """Glyph token that can be concatenated without separators."""
+    token = glyph_token(glyph)
+    return token + " " if token.startswith("/") else token
+
+
+class DiacriticIndex:
+    """Which glyphs use each nonspacing mark, across all layers."""
+
+    def __init__(self, font, graph=None):
+        graph = graph or component_graph(font, refresh=True)
+        self.marks = []         # nonspacing mark names, in font order
+        self.users = {}         # mark name → glyphs using it, in font order
+        self.first_letter = {}  # mark name → alphabetically first letter using it
+
+        for glyph in font.glyphs:
+            if is_nonspacing_mark(glyph):
+                self.marks.append(glyph.name)
+
+        # Only the marks' users are visited, not every layer of the font
+        for mark in self.marks:
+            users = graph.glyphs(graph.users_of(mark))
+            if not users:
+                continue
+            self.users[mark] = users
+            letters = [glyph for glyph in users if glyph.category == "Letter"]
+            if letters:
+                # Track the minimum instead of sorting all specimens
+                self.first_letter[mark] = min(letters, key=lambda glyph: glyph.name)
+
+    def example_glyphs(self):
+        """One letter per mark, sorted by glyph name."""
+        examples = [self.first_letter[mark] for mark in self.marks if mark in self.first_letter]
+        return sorted(examples, key=lambda glyph: glyph.name)
+
+    def summary_text(self):
+        """Tab text with one example letter for each diacritic."""
+        return "".join(glyph.string or tab_token(glyph) for glyph in self.example_glyphs())
+
+    def mark_tab_texts(self):
+        """
+        Tab text per mark, with suffixed variants (acutecomb.case, …) merged
+        into their base mark's tab on separate lines.
+        """
+        texts = {}
+        for mark in self.marks:
+            simplified_key = mark.split(".")[0]
+            line = "".join(tab_token(glyph) for glyph in self.users.get(mark, []))
+            if simplified_key in texts:
+                texts[simplified_key] += "\n" + line
+            else:
+                texts[simplified_key] = line
+        # Marks no glyph uses would only open empty tabs
+        return {key: text for key, text in texts.items() if text.strip()}
@@ -0,0 +1,53 @@
+# -*- coding: utf-8 -*-
+"""
+Bounded per-font cache for the shared indexes.
+
+Cached indexes, engines and graphs hold on to their font, so a plain dict
+keyed by font would keep every document opened in the session alive. A
+FontCache only keeps the most recently used fonts; older entries are
+dropped, and closed fonts with them.
+"""
+
+from collections import OrderedDict
+
+# Fonts kept per cache; more open documents just rebuild on their next run
+MAX_CACHED_FONTS = 4
+
+
+class FontCache:
+    """
+    Values by font, for at most `size` fonts, least recently used dropped
+    first. Keyed by id(font) with the font kept alongside, so a recycled id
+    never returns another font's value.
+    """
+
+    def __init__(self, size=MAX_CACHED_FONTS):
+        self.size = size
+        self.entries = OrderedDict()    # id(font) → (font, value)
+
+    def __len__(self):
+        return len(self.entries)
+
+    def get(self, font):
+        """The value cached for `font`, or None."""
+        key = id(font)
+        entry = self.entries.get(key)
+        if entry is None or entry[0] is not font:
+            return None
+        self.entries.move_to_end(key)
+        return entry[1]
+
+    def set(self, font, value):
+        """Cache `value` for `font`, dropping the oldest fonts past `size`. Return value."""
+        key = id(font)
+        self.entries[key] = (font, value)
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.size:
+            self.entries.popitem(last=False)
+        return value
+
+    def pop(self, font):
+        self.entries.pop(id(font), None)
+
+    def clear(self):
+        self.entries.clear()
@@ -0,0 +1,833 @@
+# -*- coding: utf-8 -*-
+"""
+Streaming reader for Glyphs sources, so the checks can run without Glyphs
+(e.g. on Linux build servers).
+
+Reads .glyphs files (format 2 and 3) and .glyphspackage folders one glyph
+at a time: the file is tokenized in chunks, the font header (masters, family
+name) is parsed once, and every pass over `font.glyphs` streams the glyphs
+array again, so only one glyph is in memory at a time. Everything else in
+the file (features, kerning, …) is skipped without being built.
+
+Glyphs come back as a small subset of the GlyphsApp object model — the part
+the checks use:
+
+    font.masters, font.glyphs (iterable), glyph.name/unicode/layers,
+    layers[masterId], layer.layerId/associatedMasterId/name/width,
+    layer.paths/components/shapes/attributes, isMasterLayer, isSpecialLayer,
+    layer.LSB/RSB/bounds, path.nodes/closed/attributes,
+    component.componentName/transform
+
+LSB/RSB need the outlines of component bases, so the first side-bearing
+lookup runs a pre-pass that stores every master and special layer's own
+bounds (curve extrema included) and its component references, then resolves
+composites from that table. Rotated or slanted components are measured on
+their base's transformed outlines, which are read afterwards only for fonts
+that have such components — from the recorded offsets, just those glyphs.
+
+scan() is that pre-pass as a glyph stream, so other whole-font indexes can
+be built in the same pass; it also records where each glyph starts in the
+file. whole_font_state() hands the result to other processes, which then
+read just their own glyphs with iter_glyph_range().
+
+    font = SourceFont("Family.glyphs")
+    for glyph in font.glyphs:
+        ...
+"""
+
+import math
+import os
+import re
+
+CHUNK_SIZE = 1 << 20
+
+# Header keys the reader keeps; everything else before `glyphs` is skipped
+HEADER_KEYS = {".formatVersion", "familyName", "unitsPerEm", "fontMaster"}
+
+NODE_TYPES = {
+    "l": "line", "c": "curve", "o": "offcurve", "q": "qcurve",
+    "line": "line", "curve": "curve", "offcurve": "offcurve", "qcurve": "qcurve",
+}
+
+
+class GlyphsSourceError(ValueError):
+    """The file is not a readable Glyphs source."""
+
+# ── Tokenizer ────────────────────────────────────────────────────────────────
+
+_TOKEN = re.compile(r"""
+    \s*(?:
+        (?P<punct>[{}()=;,])
+      | "(?P<quoted>(?:[^"\\]|\\.)*)"
+      | <(?P<data>[0-9A-Fa-f\s]*)>
+      | (?P<bare>[^\s{}()=;,"<>]+)
+    )""", re.S | re.X)
+
+_ESCAPE = re.compile(r"\\(?:U([0-9A-Fa-f]{4})|([0-7]{1,3})|(.))", re.S)
+_ESCAPES = {"n": "\n", "t": "\t", "r": "\r", "a": "\a", "b": "\b", "f": "\f", "v": "\v"}
+
+def _unescape_match(m):
+    if m.group(1):
+        return chr(int(m.group(1), 16))
+    if m.group(2):
+        return chr(int(m.group(2), 8))
+    return _ESCAPES.get(m.group(3), m.group(3))
+
+def _unescape(text):
+    return _ESCAPE.sub(_unescape_match, text) if "\\" in text else text
+
+
+class _Tokens:
+    """OpenStep plist tokens from a text stream, read in chunks."""
+
+    def __init__(self, stream, chunk_size=CHUNK_SIZE):
+        self.stream = stream
+        self.chunk_size = chunk_size
+        self.buffer = ""
+        self.pos = 0
+        self.offset = 0     # characters dropped from the front of the buffer
+        self.eof = False
+
+    def _fill(self):
+        chunk = self.stream.read(self.chunk_size)
+        if not chunk:
+            self.eof = True
+        self.offset += self.pos
+        self.buffer = self.buffer[self.pos:] + chunk
+        self.pos = 0
+
+    def position(self):
+        """Characters read so far, i.e. where the next token's whitespace starts."""
+        return self.offset + self.pos
+
+    def seek(self, position):
+        """Move forward to `position` without tokenizing the text in between."""
+        end = self.offset + len(self.buffer)
+        if position <= end:
+            self.pos = position - self.offset
+            return
+        # Text-mode read(n) counts characters, like the positions
+        self.stream.read(position - end)
+        self.offset, self.buffer, self.pos = position, "", 0
+
+    def next(self):
+        """Return (kind, value): kind is a punctuation character or "s" for strings. None at the end."""
+        while True:
+            m = _TOKEN.match(self.buffer, self.pos)
+            # A token touching the end of the buffer may continue in the next chunk
+            if m and (m.end() < len(self.buffer) or self.eof):
+                self.pos = m.end()
+                kind = m.lastgroup
+                if kind == "punct":
+                    return m.group("punct"), None
+                if kind == "quoted":
+                    return "s", _unescape(m.group("quoted"))
+                if kind == "data":
+                    return "s", m.group("data")
+                return "s", m.group("bare")
+            if self.eof:
+                if self.buffer[self.pos:].strip():
+                    raise GlyphsSourceError(f"Unexpected text near: {self.buffer[self.pos:self.pos + 40]!r}")
+                return None
+            self._fill()
+
+    def need(self):
+        token = self.next()
+        if token is None:
+            raise GlyphsSourceError("Unexpected end of file.")
+        return token
+
+    def expect(self, kind):
+        token = self.need()
+        if token[0] != kind:
+            raise GlyphsSourceError(f"Expected '{kind}', found {token[1] if token[0] == 's' else token[0]!r}.")
+
+# ── Parser ───────────────────────────────────────────────────────────────────
+
+def _value(tokens, token=None):
+    kind, value = token or tokens.need()
+    if kind == "s":
+        return value
+    if kind == "{":
+        return _dict(tokens)
+    if kind == "(":
+        return _list(tokens)
+    raise GlyphsSourceError(f"Unexpected '{kind}'.")
+
+def _dict(tokens):
+    result = {}
+    while True:
+        kind, key = tokens.need()
+        if kind == "}":
+            return result
+        if kind == ";":
+            continue
+        if kind != "s":
+            raise GlyphsSourceError(f"Expected a key, found '{kind}'.")
+        tokens.expect("=")
+        result[key] = _value(tokens)
+        tokens.expect(";")
+
+def _list(tokens):
+    items = []
+    while True:
+        token = tokens.need()
+        if token[0] == ")":
+            return items
+        items.append(_value(tokens, token))
+        kind, _ = tokens.need()
+        if kind == ")":
+            return items
+        if kind != ",":
+            raise GlyphsSourceError(f"Expected ',' or ')', found '{kind}'.")
+
+def _skip(tokens, token=None):
+    """Consume one value without building it."""
+    kind, _ = token or tokens.need()
+    if kind == "s":
+        return
+    depth = 1
+    while depth:
+        kind, _ = tokens.need()
+        if kind in "{(":
+            depth += 1
+        elif kind in "})":
+            depth -= 1
+
+def _read_header(tokens, stop_key="glyphs"):
+    """Parse the top-level keys before `stop_key`. Return (header, found)."""
+    tokens.expect("{")
+    header = {}
+    while True:
+        kind, key = tokens.need()
+        if kind == "}":
+            return header, False
+        if kind == ";":
+            continue
+        tokens.expect("=")
+        if key == stop_key:
+            return header, True
+        if key in HEADER_KEYS:
+            header[key] = _value(tokens)
+        else:
+            _skip(tokens)
+        tokens.expect(";")
+
+def _iter_array(tokens, part=0, parts=1, offsets=None):
+    """
+    Yield the dicts of an array whose '(' has not been read yet. With
+    parts > 1, only every parts-th dict (starting at `part`) is built; the
+    others are skipped. `offsets` collects where each dict's '{' starts.
+    """
+    tokens.expect("(")
+    index = 0
+    while True:
+        kind, value = tokens.need()
+        if kind == ")":
+            return
+        if kind == ",":
+            continue
+        if kind != "{":
+            raise GlyphsSourceError("Expected a glyph dictionary.")
+        if offsets is not None:
+            offsets.append(tokens.position() - 1)
+        if index % parts == part:
+            yield _dict(tokens)
+        else:
+            _skip(tokens, (kind, value))
+        index += 1
+
+def parse_plist(path):
+    """Parse a whole (small) OpenStep plist file, e.g. fontinfo.plist or a .glyph file."""
+    with open(path, encoding="utf-8", errors="replace") as f:
+        return _value(_Tokens(f))
+
+# ── Geometry ─────────────────────────────────────────────────────────────────
+
+def _union(a, b):
+    if a is None:
+        return b
+    if b is None:
+        return a
+    return (min(a[0], b[0]), min(a[1], b[1]), max(a[2], b[2]), max(a[3], b[3]))
+
+def transform_box(box, transform):
+    """Box of the four transformed corners of `box`."""
+    if box is None:
+        return None
+    a, b, c, d, tx, ty = transform
+    xs, ys = [], []
+    for x, y in ((box[0], box[1]), (box[0], box[3]), (box[2], box[1]), (box[2], box[3])):
+        xs.append(a * x + c * y + tx)
+        ys.append(b * x + d * y + ty)
+    return (min(xs), min(ys), max(xs), max(ys))
+
+def is_axis_aligned(transform):
+    """True if `transform` only scales and moves, so boxes map corner to corner."""
+    return transform[1] == 0 and transform[2] == 0
+
+def compose(outer, inner):
+    """The transform that applies `inner`, then `outer`."""
+    a1, b1, c1, d1, x1, y1 = outer
+    a2, b2, c2, d2, x2, y2 = inner
+    return (a1 * a2 + c1 * b2, b1 * a2 + d1 * b2,
+            a1 * c2 + c1 * d2, b1 * c2 + d1 * d2,
+            a1 * x2 + c1 * y2 + x1, b1 * x2 + d1 * y2 + y1)
+
+def _cubic_extrema(p0, p1, p2, p3):
+    """Parameter values in (0, 1) where the cubic's derivative is zero."""
+    a = -p0 + 3 * p1 - 3 * p2 + p3
+    b = 2 * (p0 - 2 * p1 + p2)
+    c = p1 - p0
+    if abs(a) < 1e-12:
+        roots = [-c / b] if abs(b) > 1e-12 else []
+    else:
+        disc = b * b - 4 * a * c
+        if disc < 0:
+            return []
+        root = math.sqrt(disc)
+        roots = [(-b + root) / (2 * a), (-b - root) / (2 * a)]
+    return [t for t in roots if 0 < t < 1]
+
+def _cubic_at(p0, p1, p2, p3, t):
+    mt = 1 - t
+    return mt * mt * mt * p0 + 3 * mt * mt * t * p1 + 3 * mt * t * t * p2 + t * t * t * p3
+
+def path_box(path):
+    """
+    Tight box of a path: on-curve points plus cubic extrema. Quadratic
+    segments use their control points, which can only make the box larger.
+    """
+    nodes = path.nodes
+    if not nodes:
+        return None
+    closed = path.closed
+    xs, ys = [], []
+    for i, node in enumerate(nodes):
+        if node.type != "offcurve":
+            xs.append(node.x)
+            ys.append(node.y)
+            if node.type == "curve" and (closed or i >= 3):
+                p0, p1, p2 = nodes[i - 3], nodes[i - 2], nodes[i - 1]
+                if p1.type == "offcurve" and p2.type == "offcurve":
+                    for t in _cubic_extrema(p0.x, p1.x, p2.x, node.x):
+                        xs.append(_cubic_at(p0.x, p1.x, p2.x, node.x, t))
+                    for t in _cubic_extrema(p0.y, p1.y, p2.y, node.y):
+                        ys.append(_cubic_at(p0.y, p1.y, p2.y, node.y, t))
+            elif node.type == "qcurve":
+                for k in range(1, len(nodes)):
+                    if i - k < 0 and not closed:
+                        break
+                    control = nodes[i - k]
+                    if control.type != "offcurve":
+                        break
+                    xs.append(control.x)
+                    ys.append(control.y)
+    if not xs:
+        # Only off-curve points (a TrueType circle): use them all
+        xs = [node.x for node in nodes]
+        ys = [node.y for node in nodes]
+    return (min(xs), min(ys), max(xs), max(ys))
+
+class _Outline:
+    """Nodes of a path without its layer, small enough to send to other processes."""
+    __slots__ = ("nodes", "closed")
+
+    def __init__(self, nodes, closed):
+        self.nodes = nodes
+        self.closed = closed
+
+def transformed_path_box(path, transform):
+    """
+    Tight box of `path` after `transform`. Affine maps keep Béziers Béziers,
+    so the extrema are taken on the transformed nodes, not on a rotated box.
+    """
+    a, b, c, d, tx, ty = transform
+    nodes = [SourceNode(a * n.x + c * n.y + tx, b * n.x + d * n.y + ty, n.type) for n in path.nodes]
+    return path_box(_Outline(nodes, path.closed))
+
+# ── Object model subset ──────────────────────────────────────────────────────
+
+def _number(value, default=0.0):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return default
+
+def _hex_unicodes(value, format_version):
+    if value is None:
+        return []
+    if isinstance(value, list):
+        values = value
+    else:
+        values = str(value).split(",")
+    if format_version >= 3:
+        return ["%04X" % int(v) for v in values if str(v).strip()]
+    return [str(v).strip().upper() for v in values if str(v).strip()]
+
+
+class SourceMaster:
+    def __init__(self, data, index):
+        self.id = data.get("id", f"master-{index}")
+        name = data.get("name")
+        if not name:
+            # Format 2 masters describe themselves by weight/width/custom names
+            parts = [data.get(key) for key in ("weight", "width", "custom") if data.get(key) not in (None, "Regular", "Medium (normal)")]
+            name = " ".join(parts) or "Regular"
+        self.name = name
+        self.customParameters = {}
+        for parameter in data.get("customParameters", ()):
+            if isinstance(parameter, dict) and "name" in parameter:
+                self.customParameters[parameter["name"]] = parameter.get("value")
+
+
+class SourceNode:
+    __slots__ = ("x", "y", "type", "smooth")
+
+    def __init__(self, x, y, type, smooth=False):
+        self.x = x
+        self.y = y
+        self.type = type
+        self.smooth = smooth
+
+    @property
+    def position(self):
+        return (self.x, self.y)
+
+def _node(data, format_version):
+    if format_version >= 3 and isinstance(data, list):
+        code = data[2] if len(data) > 2 else "l"
+        smooth = code.endswith("s") and code != "s"
+        return SourceNode(_number(data[0]), _number(data[1]), NODE_TYPES.get(code.rstrip("s"), "line"), smooth)
+    parts = str(data).split()
+    node_type = NODE_TYPES.get(parts[2].lower(), "line") if len(parts) > 2 else "line"
+    return SourceNode(_number(parts[0]), _number(parts[1]), node_type, "SMOOTH" in parts[3:4])
+
+
+class SourcePath:
+    def __init__(self, data, format_version):
+        self.closed = str(data.get("closed", "1")) == "1"
+        self.nodes = [_node(node, format_version) for node in data.get("nodes", ())]
+        self.attributes = data.get("attr") or data.get("attributes") or {}
+        self.parent = None
+
+    def box(self):
+        return path_box(self)
+
+
+def _component_transform(data, format_version):
+    if "transform" in data:
+        numbers = re.findall(r"-?[\d.]+(?:e-?\d+)?", str(data["transform"]))
+        if len(numbers) == 6:
+            return tuple(float(n) for n in numbers)
+    x, y = (_number(v) for v in (data.get("pos") or (0, 0)))
+    sx, sy = (_number(v, 1.0) for v in (data.get("scale") or (1, 1)))
+    angle = math.radians(_number(data.get("angle"), 0.0))
+    cos, sin = math.cos(angle), math.sin(angle)
+    a, b, c, d = sx * cos, sx * sin, -sy * sin, sy * cos
+    # Scaled, rotated, then slanted (degrees; a single value slants x only)
+    slant = data.get("slant") or (0, 0)
+    if not isinstance(slant, (list, tuple)):
+        slant = (slant, 0)
+    kx, ky = (math.tan(math.radians(_number(v))) for v in slant[:2])
+    return (a + kx * b, ky * a + b, c + kx * d, ky * c + d, x, y)
+
+
+class SourceComponent:
+    def __init__(self, data, format_version):
+        self.componentName = data.get("ref") or data.get("name")
+        self.transform = _component_transform(data, format_version)
+        self.smartComponentValues = data.get("piece") or {}
+        self.parent = None
+
+    @property
+    def position(self):
+        return (self.transform[4], self.transform[5])
+
+
+class SourceLayer:
+    def __init__(self, glyph, data, font):
+        version = font.formatVersion
+        self.parent = glyph
+        self.font = font
+        self.layerId = data.get("layerId")
+        self.associatedMasterId = data.get("associatedMasterId") or self.layerId
+        self.name = data.get("name") or font.master_names.get(self.layerId, "")
+        self.width = _number(data.get("width"))
+        self.attributes = data.get("attr") or data.get("attributes") or {}
+        self.paths = []
+        self.components = []
+        if version >= 3:
+            for shape in data.get("shapes", ()):
+                if "ref" in shape:
+                    self.components.append(SourceComponent(shape, version))
+                else:
+                    self.paths.append(SourcePath(shape, version))
+        else:
+            self.paths = [SourcePath(p, version) for p in data.get("paths", ())]
+            self.components = [SourceComponent(c, version) for c in data.get("components", ())]
+        for shape in self.paths + self.components:
+            shape.parent = self
+
+    @property
+    def shapes(self):
+        return self.paths + self.components
+
+    @property
+    def isMasterLayer(self):
+        return self.layerId == self.associatedMasterId
+
+    @property
+    def isSpecialLayer(self):
+        if self.isMasterLayer:
+            return False
+        return "{" in self.name or "[" in self.name or "coordinates" in self.attributes or "axisRules" in self.attributes
+
+    def own_box(self):
+        box = None
+        for path in self.paths:
+            box = _union(box, path.box())
+        return box
+
+    def box(self):
+        return self.font.layer_box(self)
+
+    @property
+    def bounds(self):
+        box = self.box() or (0, 0, 0, 0)
+        return (box[0], box[1], box[2] - box[0], box[3] - box[1])
+
+    @property
+    def LSB(self):
+        box = self.box()
+        return box[0] if box else 0
+
+    @property
+    def RSB(self):
+        box = self.box()
+        return self.width - box[2] if box else 0
+
+
+class SourceLayers(list):
+    """glyph.layers: integer index, iteration, and lookup by layer id."""
+
+    def __getitem__(self, key):
+        if isinstance(key, (int, slice)):
+            return list.__getitem__(self, key)
+        for layer in self:
+            if layer.layerId == key:
+                return layer
+        return None
+
+
+class SourceGlyph:
+    def __init__(self, data, font):
+        self.parent = font
+        self.name = data.get("glyphname")
+        self.unicodes = _hex_unicodes(data.get("unicode"), font.formatVersion)
+        self.unicode = self.unicodes[0] if self.unicodes else None
+        self.category = data.get("category")
+        self.subCategory = data.get("subCategory")
+        self.lastChange = data.get("lastChange")
+        self.leftKerningGroup = data.get("kernLeft", data.get("leftKerningGroup"))
+        self.rightKerningGroup = data.get("kernRight", data.get("rightKerningGroup"))
+        self.layers = SourceLayers(SourceLayer(self, layer, font) for layer in data.get("layers", ()))
+
+    @property
+    def string(self):
+        return chr(int(self.unicode, 16)) if self.unicode else None
+
+# ── Fonts ────────────────────────────────────────────────────────────────────
+
+class GlyphStream:
+    """font.glyphs: every iteration streams the glyphs from disk again."""
+
+    def __init__(self, font):
+        self.font = font
+        self._count = None
+
+    def __iter__(self):
+        return self.font.iter_glyphs()
+
+    def __len__(self):
+        if self._count is None:
+            self._count = sum(1 for _ in self.font.iter_glyph_data())
+        return self._count
+
+
+class SourceFont:
+    """A .glyphs file or .glyphspackage folder, read lazily."""
+
+    def __init__(self, path, state=None):
+        self.path = path
+        self.is_package = os.path.isdir(path)
+        header = self._header()
+        self.formatVersion = int(_number(header.get(".formatVersion"), 2))
+        self.familyName = header.get("familyName")
+        self.unitsPerEm = int(_number(header.get("unitsPerEm"), 1000))
+        self.masters = [SourceMaster(data, i) for i, data in enumerate(header.get("fontMaster", ()))]
+        self.master_names = {m.id: m.name for m in self.masters}
+        self.glyphs = GlyphStream(self)
+        self._bounds = None
+        self._resolved = {}
+        self._outlines = {}
+        self._offsets = None    # where each glyph starts in a .glyphs file, from scan()
+        self._indexes = None    # glyph name → position in the font, from scan()
+        self._count = None
+        if state is not None:
+            self._bounds = state["bounds"]
+            self._outlines = state["outlines"]
+            self._offsets = state["offsets"]
+            self._count = state["count"]
+
+    @property
+    def selectedFontMaster(self):
+        return self.masters[0] if self.masters else None
+
+    def _header(self):
+        if self.is_package:
+            with open(os.path.join(self.path, "fontinfo.plist"), encoding="utf-8", errors="replace") as f:
+                header, _ = _read_header(_Tokens(f))
+            return header
+        with open(self.path, encoding="utf-8", errors="replace") as f:
+            header, _ = _read_header(_Tokens(f))
+        return header
+
+    # ── Streaming ────────────────────────────────────────────────────────────
+
+    def _package_files(self):
+        folder = os.path.join(self.path, "glyphs")
+        files = sorted(f for f in os.listdir(folder) if f.endswith(".glyph"))
+        order_path = os.path.join(self.path, "order.plist")
+        if not os.path.exists(order_path):
+            return [os.path.join(folder, f) for f in files]
+        # File names are encoded glyph names, so read each file's name to sort by order.plist
+        order = {name: i for i, name in enumerate(parse_plist(order_path))}
+        named = []
+        for f in files:
+            path = os.path.join(folder, f)
+            named.append((order.get(self._glyph_file_name(path), len(order)), f, path))
+        return [path for _, _, path in sorted(named)]
+
+    @staticmethod
+    def _glyph_file_name(path):
+        with open(path, encoding="utf-8", errors="replace") as f:
+            tokens = _Tokens(f, chunk_size=4096)
+            tokens.expect("{")
+            while True:
+                kind, key = tokens.need()
+                if kind == "}":
+                    return None
+                if kind == ";":
+                    continue
+                tokens.expect("=")
+                if key == "glyphname":
+                    return _value(tokens)
+                _skip(tokens)
+                tokens.expect(";")
+
+    def iter_glyph_data(self, part=0, parts=1, offsets=None):
+        """
+        Yield each glyph's raw dictionary, one at a time. With parts > 1,
+        only glyphs part, part + parts, part + 2 × parts, … are yielded; the
+        others are still tokenized, just not built. `offsets` collects where
+        each glyph starts in a .glyphs file.
+        """
+        if self.is_package:
+            for path in self._package_files()[part::parts]:
+                yield parse_plist(path)
+            return
+        with open(self.path, encoding="utf-8", errors="replace") as f:
+            tokens = _Tokens(f)
+            _, found = _read_header(tokens)
+            if found:
+                yield from _iter_array(tokens, part, parts, offsets)
+
+    def iter_glyphs(self, part=0, parts=1):
+        for data in self.iter_glyph_data(part, parts):
+            yield SourceGlyph(data, self)
+
+    def glyph_count(self):
+        if self._count is None:
+            self._count = len(self.glyphs)
+        return self._count
+
+    def iter_glyph_range(self, start, stop):
+        """
+        Yield glyphs start … stop - 1. After scan() (or with its state), a
+        .glyphs file is read from the first glyph's offset and only these
+        glyphs are tokenized.
+        """
+        if self.is_package:
+            for path in self._package_files()[start:stop]:
+                yield SourceGlyph(parse_plist(path), self)
+            return
+        if self._offsets is None:
+            for index, data in enumerate(self.iter_glyph_data()):
+                if index >= stop:
+                    return
+                if index >= start:
+                    yield SourceGlyph(data, self)
+            return
+        yield from self._glyphs_at(range(start, min(stop, len(self._offsets))))
+
+    def _glyphs_at(self, indexes):
+        """Glyphs at ascending `indexes` of a scanned .glyphs file, skipping the rest untokenized."""
+        with open(self.path, encoding="utf-8", errors="replace") as f:
+            tokens = _Tokens(f)
+            for index in indexes:
+                tokens.seek(self._offsets[index])
+                tokens.expect("{")
+                yield SourceGlyph(_dict(tokens), self)
+
+    def scan(self):
+        """
+        Stream every glyph once, filling the bounds table and the glyph
+        offsets as it goes. Yields the glyphs, so other whole-font indexes
+        (e.g. EmptyBaseIndex) can be built from the same pass.
+        """
+        table = {}
+        offsets = [] if not self.is_package else None
+        indexes = {}
+        count = 0
+        for data in self.iter_glyph_data(offsets=offsets):
+            glyph = SourceGlyph(data, self)
+            indexes[glyph.name] = count
+            for layer in glyph.layers:
+                key = self._layer_key(glyph.name, layer)
+                if key is not None:
+                    table[key] = (layer.own_box(), [(c.componentName, c.transform) for c in layer.components])
+            count += 1
+            yield glyph
+        self._bounds = table
+        self._offsets = offsets
+        self._indexes = indexes
+        self._count = count
+
+    def whole_font_state(self):
+        """
+        Bounds table, outlines of rotated/slanted component bases and glyph
+        offsets, for SourceFont(path, state) in another process. Run scan()
+        first, or the bounds pre-pass runs here.
+        """
+        self._bounds_table()
+        if not self._outlines:
+            self._load_outlines(None)
+        return {"bounds": self._bounds, "outlines": self._outlines, "offsets": self._offsets, "count": self.glyph_count()}
+
+    # ── Bounds ───────────────────────────────────────────────────────────────
+
+    def _bounds_table(self):
+        """
+        Pre-pass: own box and component references of every master and
+        special layer, keyed (glyph, master id, special layer name or None).
+        """
+        if self._bounds is None:
+            for _ in self.scan():
+                pass
+        return self._bounds
+
+    @staticmethod
+    def _layer_key(name, layer):
+        if layer.isMasterLayer:
+            return (name, layer.layerId, None)
+        if layer.isSpecialLayer:
+            return (name, layer.associatedMasterId, layer.name)
+        return None
+
+    def _base_key(self, base_name, layer_key):
+        """The base layer a component on `layer_key` resolves to, like Glyphs does."""
+        table = self._bounds_table()
+        _, master_id, special = layer_key
+        if special is not None and (base_name, master_id, special) in table:
+            return (base_name, master_id, special)
+        key = (base_name, master_id, None)
+        return key if key in table else None
+
+    def _resolve(self, key, active):
+        if key in self._resolved:
+            return self._resolved[key]
+        own, components = self._bounds_table()[key]
+        box = own
+        if components:
+            active.add(key)
+            for name, transform in components:
+                base_key = self._base_key(name, key)
+                if base_key is not None and base_key not in active:
+                    box = _union(box, self._component_box(base_key, transform, active))
+            active.discard(key)
+        self._resolved[key] = box
+        return box
+
+    def _component_box(self, base_key, transform, active):
+        """
+        Box of a component. Scaled and moved bases map corner to corner;
+        rotated and slanted ones are measured on their transformed outlines,
+        since the box of a rotated box is too loose.
+        """
+        if is_axis_aligned(transform):
+            return transform_box(self._resolve(base_key, active), transform)
+        box = None
+        for path in self._outlines_of(base_key):
+            box = _union(box, transformed_path_box(path, transform))
+        active.add(base_key)
+        for name, inner in self._bounds_table()[base_key][1]:
+            key = self._base_key(name, base_key)
+            if key is not None and key not in active:
+                box = _union(box, self._component_box(key, compose(transform, inner), active))
+        active.discard(base_key)
+        return box
+
+    def _outlines_of(self, key):
+        if key not in self._outlines:
+            self._load_outlines(key)
+        return self._outlines[key]
+
+    def _load_outlines(self, key):
+        """
+        Read the paths of `key` and the layers it is built on. The first load
+        also takes the bases of every rotated or slanted component in the
+        font, so one extra read usually does; after scan() it seeks to just
+        those glyphs, otherwise it streams the font again.
+        """
+        table = self._bounds_table()
+        pending = [key] if key is not None else []
+        if not self._outlines:
+            for layer_key, (_, components) in table.items():
+                for name, transform in components:
+                    if not is_axis_aligned(transform):
+                        pending.append(self._base_key(name, layer_key))
+        wanted = set()
+        while pending:
+            current = pending.pop()
+            if current is None or current in wanted or current in self._outlines:
+                continue
+            wanted.add(current)
+            pending.extend(self._base_key(name, current) for name, _ in table[current][1])
+        names = {name for name, _, _ in wanted}
+        if self._offsets is not None and self._indexes is not None:
+            glyphs = self._glyphs_at(sorted(self._indexes[name] for name in names))
+        else:
+            glyphs = self.iter_glyphs() if names else ()
+        for glyph in glyphs:
+            if glyph.name in names:
+                for layer in glyph.layers:
+                    layer_key = self._layer_key(glyph.name, layer)
+                    if layer_key in wanted:
+                        self._outlines[layer_key] = [_Outline(path.nodes, path.closed) for path in layer.paths]
+        for current in wanted:
+            self._outlines.setdefault(current, [])
+
+    def layer_box(self, layer):
+        """Box of a layer including its components' outlines."""
+        key = self._layer_key(layer.parent.name, layer)
+        if key is not None and key in self._bounds_table():
+            return self._resolve(key, set())
+        # Other layers (backups, color layers): own paths, components via their master
+        box = layer.own_box()
+        master_key = (layer.parent.name, layer.associatedMasterId, None)
+        for component in layer.components:
+            base_key = self._base_key(component.componentName, master_key)
+            if base_key is not None:
+                box = _union(box, self._component_box(base_key, component.transform, set()))
+        return box
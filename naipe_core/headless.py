@@ -0,0 +1,535 @@
+# -*- coding: utf-8 -*-
+"""
+Headless stand-in for the small part of the GlyphsApp object model these
+scripts use, so they can be run and timed outside of Glyphs.
+
+    from naipe_core import headless
+    font = headless.synthetic_font(5000, masters=3)
+    headless.run_script("NewTabsWithDiacritics.py", font)
+
+Only behaviour the scripts rely on is modelled; geometry is reduced to
+straight-line control boxes.
+"""
+
+import contextlib
+import io
+import random
+import runpy
+import sys
+import types
+
+# ── Geometry ─────────────────────────────────────────────────────────────────
+
+class NSRect:
+    """Minimal rect with origin/size, like the bridged NSRect."""
+
+    def __init__(self, x, y, w, h):
+        self.origin = types.SimpleNamespace(x=x, y=y)
+        self.size = types.SimpleNamespace(width=w, height=h)
+
+def _union(boxes):
+    boxes = [b for b in boxes if b]
+    if not boxes:
+        return None
+    return (min(b[0] for b in boxes), min(b[1] for b in boxes),
+            max(b[2] for b in boxes), max(b[3] for b in boxes))
+
+def _transform_box(box, transform):
+    if not box:
+        return None
+    a, b, c, d, tx, ty = transform
+    xs, ys = [], []
+    for x, y in ((box[0], box[1]), (box[0], box[3]), (box[2], box[1]), (box[2], box[3])):
+        xs.append(a * x + c * y + tx)
+        ys.append(b * x + d * y + ty)
+    return (min(xs), min(ys), max(xs), max(ys))
+
+# ── Shapes ───────────────────────────────────────────────────────────────────
+
+class GSNode:
+    def __init__(self, x, y, type="line"):
+        self.position = types.SimpleNamespace(x=x, y=y)
+        self.type = type
+
+    @property
+    def x(self):
+        return self.position.x
+
+    @property
+    def y(self):
+        return self.position.y
+
+
+class GSPath:
+    def __init__(self, points=(), attributes=None, closed=True):
+        self.nodes = [GSNode(x, y) for x, y in points]
+        self.attributes = dict(attributes or {})
+        self.closed = closed
+        self.parent = None
+
+    def copy(self):
+        return GSPath([(n.x, n.y) for n in self.nodes], self.attributes, self.closed)
+
+    def box(self):
+        if not self.nodes:
+            return None
+        xs = [n.x for n in self.nodes]
+        ys = [n.y for n in self.nodes]
+        return (min(xs), min(ys), max(xs), max(ys))
+
+    def applyTransform(self, transform):
+        a, b, c, d, tx, ty = transform
+        for n in self.nodes:
+            x, y = n.x, n.y
+            n.position = types.SimpleNamespace(x=a * x + c * y + tx, y=b * x + d * y + ty)
+
+
+class GSComponent:
+    def __init__(self, componentName, position=(0, 0), transform=None):
+        self.componentName = componentName
+        if transform is None:
+            transform = (1, 0, 0, 1, position[0], position[1])
+        self.transform = tuple(transform)
+        self.smartComponentValues = {}
+        self.parent = None
+
+    @property
+    def position(self):
+        return types.SimpleNamespace(x=self.transform[4], y=self.transform[5])
+
+    @property
+    def componentLayer(self):
+        layer = self.parent
+        font = layer.parent.parent if layer is not None and layer.parent is not None else None
+        if font is None:
+            return None
+        base = font.glyphs[self.componentName]
+        if base is None:
+            return None
+        return base.layers[layer.associatedMasterId]
+
+    def copy(self):
+        return GSComponent(self.componentName, transform=self.transform)
+
+    def box(self):
+        base_layer = self.componentLayer
+        return _transform_box(base_layer.box() if base_layer else None, self.transform)
+
+# ── Layers ───────────────────────────────────────────────────────────────────
+
+class _ShapeList(list):
+    """Shape list that keeps `parent` links in sync, like layer.shapes."""
+
+    def __init__(self, layer, shapes=()):
+        super().__init__()
+        self._layer = layer
+        for shape in shapes:
+            self.append(shape)
+
+    def append(self, shape):
+        shape.parent = self._layer
+        super().append(shape)
+
+    def extend(self, shapes):
+        for shape in shapes:
+            self.append(shape)
+
+
+class GSLayer:
+    def __init__(self, layerId=None, associatedMasterId=None, name="", width=600, shapes=(), attributes=None):
+        self.layerId = layerId
+        self.associatedMasterId = associatedMasterId or layerId
+        self.name = name
+        self.width = width
+        self.attributes = dict(attributes or {})
+        self.parent = None
+        self._shapes = _ShapeList(self, shapes)
+
+    @property
+    def shapes(self):
+        return self._shapes
+
+    @shapes.setter
+    def shapes(self, shapes):
+        self._shapes = _ShapeList(self, shapes)
+
+    @property
+    def paths(self):
+        return [s for s in self._shapes if isinstance(s, GSPath)]
+
+    @property
+    def components(self):
+        return [s for s in self._shapes if isinstance(s, GSComponent)]
+
+    @property
+    def isMasterLayer(self):
+        return self.layerId == self.associatedMasterId
+
+    @property
+    def isSpecialLayer(self):
+        return not self.isMasterLayer and ("{" in self.name or "[" in self.name)
+
+    @property
+    def master(self):
+        font = self.parent.parent if self.parent is not None else None
+        if font is None:
+            return None
+        return next((m for m in font.masters if m.id == self.associatedMasterId), None)
+
+    def box(self):
+        return _union(shape.box() for shape in self._shapes)
+
+    @property
+    def bounds(self):
+        box = self.box() or (0, 0, 0, 0)
+        return NSRect(box[0], box[1], box[2] - box[0], box[3] - box[1])
+
+    @property
+    def LSB(self):
+        box = self.box()
+        return box[0] if box else 0
+
+    @property
+    def RSB(self):
+        box = self.box()
+        return self.width - box[2] if box else 0
+
+    def copy(self):
+        return GSLayer(None, self.associatedMasterId, self.name, self.width,
+                       [s.copy() for s in self._shapes], self.attributes)
+
+    def copyDecomposedLayer(self):
+        layer = self.copy()
+        layer.parent = self.parent
+        layer.decomposeComponents()
+        layer.parent = None
+        return layer
+
+    def decomposeComponents(self):
+        shapes = []
+        for shape in self._shapes:
+            if isinstance(shape, GSComponent):
+                base_layer = shape.componentLayer
+                if base_layer is None:
+                    continue
+                for path in base_layer.copyDecomposedLayer().paths:
+                    path.applyTransform(shape.transform)
+                    shapes.append(path)
+            else:
+                shapes.append(shape)
+        self.shapes = shapes
+
+    def flattenOutlinesRemoveOverlap_origHints_secondaryPath_extraHandles_error_(self, *args):
+        for path in self.paths:
+            path.attributes.pop("strokeWidth", None)
+        return True
+
+    def removeOverlap(self):
+        pass
+
+    def clear(self):
+        self.shapes = []
+
+
+class _LayerList:
+    """glyph.layers: integer index, layerId lookup, iteration and append."""
+
+    def __init__(self, glyph):
+        self._glyph = glyph
+        self._layers = []
+        self._by_id = {}
+
+    def __iter__(self):
+        return iter(list(self._layers))
+
+    def __len__(self):
+        return len(self._layers)
+
+    def __bool__(self):
+        return bool(self._layers)
+
+    def __getitem__(self, key):
+        if isinstance(key, int):
+            return self._layers[key]
+        return self._by_id.get(key)
+
+    def __delitem__(self, key):
+        layer = self[key]
+        self._layers.remove(layer)
+        self._by_id.pop(layer.layerId, None)
+
+    def append(self, layer):
+        if layer.layerId is None:
+            self._glyph._layer_counter += 1
+            layer.layerId = f"{self._glyph.name}-layer-{self._glyph._layer_counter}"
+        layer.parent = self._glyph
+        self._layers.append(layer)
+        self._by_id[layer.layerId] = layer
+
+# ── Glyphs, masters, font ────────────────────────────────────────────────────
+
+class GSGlyph:
+    def __init__(self, name, unicode=None, category=None, subCategory=None):
+        self.name = name
+        self.unicode = unicode
+        self.category = category
+        self.subCategory = subCategory
+        self.leftKerningGroup = None
+        self.rightKerningGroup = None
+        self.lastChange = 0
+        self.parent = None
+        self._layer_counter = 0
+        self.layers = _LayerList(self)
+
+    @property
+    def unicodes(self):
+        return [self.unicode] if self.unicode else []
+
+    @property
+    def string(self):
+        return chr(int(self.unicode, 16)) if self.unicode else None
+
+    @property
+    def id(self):
+        return f"id-{self.name}"
+
+    def beginUndo(self):
+        pass
+
+    def endUndo(self):
+        pass
+
+
+class _GlyphList:
+    """font.glyphs: integer index, name or character lookup, iteration."""
+
+    def __init__(self, font):
+        self._font = font
+        self._glyphs = []
+        self._by_name = {}
+        self._by_char = {}
+
+    def __iter__(self):
+        return iter(self._glyphs)
+
+    def __len__(self):
+        return len(self._glyphs)
+
+    def __getitem__(self, key):
+        if isinstance(key, int):
+            return self._glyphs[key]
+        glyph = self._by_name.get(key)
+        if glyph is None and len(key) == 1:
+            glyph = self._by_char.get("%04X" % ord(key))
+        return glyph
+
+    def append(self, glyph):
+        glyph.parent = self._font
+        self._glyphs.append(glyph)
+        self._by_name[glyph.name] = glyph
+        if glyph.unicode:
+            self._by_char.setdefault(glyph.unicode, glyph)
+
+
+class GSFontMaster:
+    def __init__(self, id, name):
+        self.id = id
+        self.name = name
+        self.customParameters = {}
+
+
+class GSTab:
+    def __init__(self, text=""):
+        self.text = text
+        self.textCursor = 0
+
+
+class GSFont:
+    def __init__(self, familyName="Headless"):
+        self.familyName = familyName
+        self.filepath = None
+        self.masters = []
+        self.glyphs = _GlyphList(self)
+        self.kerning = {}
+        self.tabs = []
+        self.selectedLayers = []
+        self.parent = None
+
+    @property
+    def selectedFontMaster(self):
+        return self.masters[0] if self.masters else None
+
+    @property
+    def selection(self):
+        return [layer.parent for layer in self.selectedLayers]
+
+    def glyphForCharacter_(self, codepoint):
+        return self.glyphs._by_char.get("%04X" % codepoint)
+
+    def glyphForId_(self, glyph_id):
+        return self.glyphs[glyph_id[3:]] if glyph_id.startswith("id-") else None
+
+    def newTab(self, text=""):
+        tab = GSTab(text)
+        self.tabs.append(tab)
+        return tab
+
+    def disableUpdateInterface(self):
+        pass
+
+    def enableUpdateInterface(self):
+        pass
+
+# ── Application object and script runner ─────────────────────────────────────
+
+class HeadlessGlyphs:
+    """Stand-in for the injected `Glyphs` application object."""
+
+    def __init__(self, font=None, defaults=None):
+        self.fonts = [font] if font is not None else []
+        self.defaults = dict(defaults or {})
+
+    @property
+    def font(self):
+        return self.fonts[0] if self.fonts else None
+
+    def showMacroWindow(self):
+        pass
+
+    def clearLog(self):
+        pass
+
+    def redraw(self):
+        pass
+
+    def showNotification(self, title, message):
+        pass
+
+    def addCallback(self, callback, event):
+        pass
+
+    def removeCallback(self, callback, event=None):
+        pass
+
+
+def Message(message, title="", OKButton=None):
+    print(f"[Message] {title}: {message}")
+
+
+def script_globals(app):
+    """Globals Glyphs injects into every script."""
+    return {
+        "Glyphs": app,
+        "GSComponent": GSComponent,
+        "GSLayer": GSLayer,
+        "GSPath": GSPath,
+        "GSNode": GSNode,
+        "GSGlyph": GSGlyph,
+        "Message": Message,
+        "DRAWBACKGROUND": "DrawBackground",
+    }
+
+
+@contextlib.contextmanager
+def installed(font, defaults=None):
+    """Expose a fake `GlyphsApp` module for the duration of the block."""
+    app = HeadlessGlyphs(font, defaults)
+    module = types.ModuleType("GlyphsApp")
+    module.__dict__.update(script_globals(app))
+    module.GetFolder = lambda *args, **kwargs: None
+    module.GetFile = lambda *args, **kwargs: None
+    previous = sys.modules.get("GlyphsApp")
+    sys.modules["GlyphsApp"] = module
+    try:
+        yield app
+    finally:
+        if previous is None:
+            sys.modules.pop("GlyphsApp", None)
+        else:
+            sys.modules["GlyphsApp"] = previous
+
+
+def run_script(path, font, quiet=True, defaults=None):
+    """
+    Execute a menu script against `font` with the injected globals in place,
+    and `defaults` as Glyphs.defaults. Returns the script's globals; printed
+    output is swallowed when `quiet`.
+    """
+    with installed(font, defaults) as app:
+        sink = io.StringIO() if quiet else sys.stdout
+        with contextlib.redirect_stdout(sink):
+            try:
+                return runpy.run_path(path, init_globals=script_globals(app), run_name="__main__")
+            except SystemExit:
+                return {}
+
+# ── Synthetic fonts ──────────────────────────────────────────────────────────
+
+MARKS = ["acutecomb", "gravecomb", "circumflexcomb", "tildecomb", "dieresiscomb",
+         "ringcomb", "caroncomb", "brevecomb", "macroncomb", "dotaccentcomb", "cedillacomb", "ogonekcomb"]
+
+def _box_path(x0, y0, x1, y1, attributes=None):
+    return GSPath([(x0, y0), (x1, y0), (x1, y1), (x0, y1)], attributes)
+
+def synthetic_font(glyph_count, masters=1, seed=0, color_layers=0):
+    """
+    Build a font with `glyph_count` glyphs × `masters` masters: Latin base
+    letters, nonspacing marks, letter + mark composites and encoded filler
+    glyphs. A few glyphs carry live strokes, empty components or side
+    bearings that drift between masters, so every check has work to do.
+    With color_layers, every glyph also gets that many "Color N" palette
+    layers per master.
+    """
+    rng = random.Random(seed)
+    font = GSFont()
+    font.masters = [GSFontMaster(f"m{i:02d}", f"Master {i}") for i in range(masters)]
+
+    def add(name, unicode=None, category="Letter", subCategory=None, shapes_for=None):
+        glyph = GSGlyph(name, unicode, category, subCategory)
+        font.glyphs.append(glyph)
+        for index, master in enumerate(font.masters):
+            shapes, width = shapes_for(index) if shapes_for else ([], 600)
+            glyph.layers.append(GSLayer(master.id, master.id, master.name, width, shapes))
+        for master in font.masters:
+            for palette in range(color_layers):
+                glyph.layers.append(GSLayer(None, master.id, f"Color {palette}", 600,
+                                            [_box_path(50, 0, 550, 700)], {"colorPalette": palette}))
+        return glyph
+
+    def letter_shapes(index, drift=False, stroke=False):
+        lsb = 50 + (index * 7 if drift else 0)
+        attributes = {"strokeWidth": 40} if stroke else None
+        return [_box_path(lsb, 0, 550, 700, attributes)], 600
+
+    bases = []
+    for cp in list(range(0x41, 0x5B)) + list(range(0x61, 0x7B)):
+        if len(font.glyphs) >= glyph_count:
+            break
+        bases.append(add(chr(cp), "%04X" % cp, shapes_for=letter_shapes).name)
+
+    for mark in MARKS:
+        if len(font.glyphs) >= glyph_count:
+            break
+        add(mark, category="Mark", subCategory="Nonspacing",
+            shapes_for=lambda i: ([_box_path(-100, 700, 100, 800)], 0))
+    if len(font.glyphs) < glyph_count:
+        add("emptycomb", category="Mark", subCategory="Nonspacing")
+
+    serial = 0
+    while len(font.glyphs) < glyph_count:
+        serial += 1
+        kind = rng.random()
+        if kind < 0.3 and bases:
+            base = rng.choice(bases)
+            mark = rng.choice(MARKS + ["emptycomb"])
+            add(f"{base}_{mark}.{serial}", "%05X" % (0xF0000 + serial),
+                shapes_for=lambda i, b=base, m=mark: ([GSComponent(b), GSComponent(m, (300, 0))], 600))
+        else:
+            drift = rng.random() < 0.05
+            stroke = rng.random() < 0.02
+            # Plane 15 private use keeps large fonts clear of the surrogate range
+            add(f"u{0xF0000 + serial:05X}", "%05X" % (0xF0000 + serial),
+                shapes_for=lambda i, d=drift, s=stroke: letter_shapes(i, d, s))
+
+    font.selectedLayers = [g.layers[0] for g in list(font.glyphs)[:20]]
+    return font
@@ -0,0 +1,159 @@
+# -*- coding: utf-8 -*-
+"""
+Timing, counting and buffered logging for the scripts.
+
+    with ScriptRun("Delete Empty Components", Glyphs.defaults) as run:
+        with run.phase("index"):
+            ...
+        run.count("components removed", len(removed))
+        run.log(f"🫙 {name} in {glyph.name}")
+
+Log lines are kept in memory and printed once, at the end, together with
+the phase timings and counts: only the first MAX_LOG_LINES lines unless the
+verbose switch is on. The log is for progress and diagnostics; a script's
+actual results (the report the user ran it for) are printed in full. Two
+Glyphs.defaults switches (set them in the Macro window, e.g.
+Glyphs.defaults["com.naipe.profile"] = True) control it:
+
+    com.naipe.profile   also run the script under cProfile and write the
+                        stats (.prof and a readable .txt) to PROFILE_FOLDER
+    com.naipe.verbose   print every buffered log line
+"""
+
+import cProfile
+import io
+import os
+import pstats
+import tempfile
+import time
+from collections import Counter
+from contextlib import contextmanager
+from functools import wraps
+
+PROFILE_KEY = "com.naipe.profile"
+VERBOSE_KEY = "com.naipe.verbose"
+PROFILE_FOLDER_KEY = "com.naipe.profileFolder"
+
+# Default folder for cProfile output
+PROFILE_FOLDER = os.path.join(tempfile.gettempdir(), "naipe-profiles")
+
+MAX_LOG_LINES = 30
+
+def setting(defaults, key, default=None):
+    """Read a key from Glyphs.defaults (or any mapping), None-safe."""
+    if defaults is None:
+        return default
+    try:
+        value = defaults[key]
+    except (KeyError, TypeError):
+        return default
+    return default if value is None else value
+
+
+class ScriptRun:
+    """Phase timings, counts and buffered log lines for one script run."""
+
+    def __init__(self, name, defaults=None, profile=None, verbose=None, output=print):
+        self.name = name
+        self.profile = bool(setting(defaults, PROFILE_KEY, False) if profile is None else profile)
+        self.verbose = bool(setting(defaults, VERBOSE_KEY, False) if verbose is None else verbose)
+        self.profile_folder = setting(defaults, PROFILE_FOLDER_KEY, PROFILE_FOLDER)
+        self.output = output
+        self.phases = {}        # phase name → seconds, in first-use order
+        self.counts = Counter()
+        self.lines = []
+        self.profile_path = None
+        self._profiler = None
+        self._started = None
+        self.elapsed = None
+
+    # ── Recording ────────────────────────────────────────────────────────────
+
+    @contextmanager
+    def phase(self, name):
+        """Time a block; repeated phases with the same name add up."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] = self.phases.get(name, 0.0) + time.perf_counter() - start
+
+    def count(self, key, n=1):
+        self.counts[key] += n
+
+    def log(self, line):
+        """Buffer a line for the summary instead of printing it right away."""
+        self.lines.append(line)
+
+    # ── Start and finish ─────────────────────────────────────────────────────
+
+    def start(self):
+        """Start the clock (and the profiler). Use finish() when done."""
+        self._started = time.perf_counter()
+        if self.profile:
+            self._profiler = cProfile.Profile()
+            self._profiler.enable()
+        return self
+
+    def finish(self):
+        """Stop, write the profile if enabled, and print the summary."""
+        if self._profiler is not None:
+            self._profiler.disable()
+            self.profile_path = self._write_profile()
+            self._profiler = None
+        if self._started is not None:
+            self.elapsed = time.perf_counter() - self._started
+        self.output("\n".join(self.summary_lines()))
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is not None:
+            self.log(f"⚠️ Stopped by {exc_type.__name__}: {exc}")
+        self.finish()
+        return False
+
+    def _write_profile(self):
+        os.makedirs(self.profile_folder, exist_ok=True)
+        stamp = time.strftime("%Y%m%d-%H%M%S")
+        base = os.path.join(self.profile_folder, "".join(c if c.isalnum() else "-" for c in self.name) + "-" + stamp)
+        self._profiler.dump_stats(base + ".prof")
+        text = io.StringIO()
+        pstats.Stats(self._profiler, stream=text).sort_stats("cumulative").print_stats(40)
+        with open(base + ".txt", "w", encoding="utf-8") as f:
+            f.write(text.getvalue())
+        return base + ".prof"
+
+    # ── Reporting ────────────────────────────────────────────────────────────
+
+    def summary_lines(self):
+        lines = list(self.lines)
+        if not self.verbose and len(lines) > MAX_LOG_LINES:
+            hidden = len(lines) - MAX_LOG_LINES
+            lines = lines[:MAX_LOG_LINES] + [f"… and {hidden} more line(s) (set Glyphs.defaults[\"{VERBOSE_KEY}\"] = True to see all)"]
+        header = f"⏱ {self.name}"
+        if self.elapsed is not None:
+            header += f": {self.elapsed:.3f}s"
+        lines.append(header)
+        if self.phases:
+            lines.append("   " + " · ".join(f"{name} {seconds:.3f}s" for name, seconds in self.phases.items()))
+        if self.counts:
+            lines.append("   " + " · ".join(f"{key}: {n}" for key, n in self.counts.items()))
+        if self.profile_path:
+            lines.append(f"   Profile written to {self.profile_path}")
+        return lines
+
+
+def instrumented(name=None, defaults=None):
+    """
+    Decorator: run the function inside a ScriptRun, passed as the `run`
+    keyword argument.
+    """
+    def decorate(function):
+        @wraps(function)
+        def wrapper(*args, **kwargs):
+            with ScriptRun(name or function.__name__, defaults) as run:
+                return function(*args, run=run, **kwargs)
+        return wrapper
+    return decorate
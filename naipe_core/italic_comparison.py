@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+"""
+Slot layout and change stamps for the italic comparison overlay.
+
+The comparison string is a list of slots around the glyph being edited;
+layout_slots() resolves them to layers and x offsets, and deep_change_stamp()
+tells the overlay when its cached drawing is stale.
+"""
+
+# Marks the glyph being edited in a slot list
+CURRENT = {"current": True}
+
+
+def change_stamp(glyph):
+    """Value that moves whenever the glyph is edited."""
+    return getattr(glyph, "lastChange", None) if glyph else None
+
+
+def master_layers(glyph, master):
+    """Layers of glyph that belong to master, master layer first."""
+    if not glyph:
+        return []
+    return [l for l in glyph.layers if l.layerId == master.id or l.associatedMasterId == master.id]
+
+
+def deep_change_stamp(glyph, master):
+    """
+    Change stamps of the glyph and of every component base it uses in this
+    master, nested bases included: editing a base doesn't touch the
+    composite's own lastChange.
+    """
+    if not glyph:
+        return None
+    font = glyph.parent
+    stamps = []
+    seen = {glyph.name}
+    pending = [glyph]
+    while pending:
+        current = pending.pop()
+        stamps.append((current.name, change_stamp(current)))
+        for layer in master_layers(current, master):
+            for component in layer.components:
+                name = component.componentName
+                if name not in seen:
+                    seen.add(name)
+                    base = font.glyphs[name]
+                    if base is not None:
+                        pending.append(base)
+    return tuple(sorted(stamps))
+
+
+def resolve_slot(slot, current_layer, current_layers, control_layers):
+    """Return the layer a slot draws, or None when it is not available."""
+    if slot["layer"] is None:
+        return current_layer
+    if slot["glyph"] is None:
+        layers = current_layers
+        index = slot["layer"]
+        layer = layers[index] if index < len(layers) else None
+        # Alternate layers only count when they have outlines of their own
+        return layer if layer and (index == 0 or layer.paths) else None
+    layers = control_layers.get(slot["glyph"], [])
+    index = slot["layer"]
+    return layers[index] if index < len(layers) else None
+
+
+def layout_slots(slots, current_layer, current_layers, control_layers):
+    """
+    Resolve every slot and lay them out with cumulative advances around the
+    current glyph. Return [(layer, x offset, color key), …].
+    """
+    resolved = [None if slot is CURRENT else resolve_slot(slot, current_layer, current_layers, control_layers) for slot in slots]
+    missing_groups = {slot.get("group") for slot, layer in zip(slots, resolved) if slot is not CURRENT and layer is None} - {None}
+
+    placed = []
+    center = slots.index(CURRENT)
+    # Left of the current glyph: walk outwards, subtracting each advance
+    x = 0
+    for slot, layer in zip(reversed(slots[:center]), reversed(resolved[:center])):
+        if layer is None or slot.get("group") in missing_groups:
+            continue
+        x -= layer.width
+        placed.append((layer, x, slot["color"]))
+    # Right of the current glyph: start after its advance
+    x = current_layer.width
+    for slot, layer in zip(slots[center + 1:], resolved[center + 1:]):
+        if layer is None or slot.get("group") in missing_groups:
+            continue
+        placed.append((layer, x, slot["color"]))
+        x += layer.width
+    return placed
@@ -0,0 +1,464 @@
+# -*- coding: utf-8 -*-
+"""
+Headless kerning-string engine shared by the Kerning String Maker scripts.
+
+Each script's character set is resolved against the font once per click and
+cached per script and order for the rest of it; tab text is produced as a
+generator of lines.
+
+With by_group, a string is only emitted when it shows a kerning class pair
+(the left glyph's right kerning group against the right glyph's left group)
+that the tab hasn't shown yet, so glyphs sharing groups with a base glyph
+don't repeat its pairs. With a KerningIndex passed as `kerned`, only strings
+showing at least one pair without kerning in that master are emitted.
+"""
+
+from naipe_core.font_cache import FontCache
+from naipe_core.unicode_index import unicode_index, font_signature
+
+# -----------------------------
+# 1. CONFIGURATION
+# -----------------------------
+
+SCRIPTS = ["LTN", "CYR", "GRK"]
+
+SCRIPT_LABELS = {"LTN": "Latin", "CYR": "Cyrillic", "GRK": "Greek"}
+
+NUMBER_BASE_NAMES = ["zero", "one", "seven", "four", "two", "five", "three", "six", "nine", "eight"]
+
+NUMBER_VARIANTS_CONFIG = [
+    {"suffix": None, "label": "Default Numbers"},
+    {"suffix": "lf", "label": "Lining Figures"},
+    {"suffix": "osf", "label": "Old Style Figures"},
+    {"suffix": "dnom", "label": "Denominators"},
+    {"suffix": "numr", "label": "Numerators"},
+    {"suffix": "sinf", "label": "Inferiors"},
+    {"suffix": "sups", "label": "Superiors"},
+    {"suffix": "tf", "label": "Tabular Figures"},
+    {"suffix": "tosf", "label": "Tabular Old Style Figures"},
+]
+
+UI_GROUPS = [
+    {"label": "Upper case", "key": "UC"},
+    {"label": "Lower case", "key": "lc"},
+    {"label": "Numbers", "key": "numbers"},
+    {"label": "Punctuation and Symbols", "key": "punctuation"}
+]
+
+DATA = {
+    "UC_LTN": {"chars": "HILEFTKMNUƯJŊOƠQCGŒØDƏBPRÞAÆVWYXZSẞĦÐŁĽ", "l_ctrl": "OH", "r_ctrl": "HO"},
+    "lc_LTN": {"chars": "nmuưriıjȷŋhlłľkoơøœeəcðbþpqdďđħgaætŧťfvywxzsß", "l_ctrl": "on", "r_ctrl": "no"},
+    "UC_CYR": {"chars": "НИПЏШЫІМЕЦЩДЈЮОФСЄЭЗВРЯГҐТЪЋЂБЬЊЛЉКЖХУЧАЅ", "l_ctrl": "ОН", "r_ctrl": "НО"},
+    "lc_CYR": {"chars": "нипџшыміцщдјюобфрћђесєэзвягґтьъњлљкжхчуаѕ", "l_ctrl": "он", "r_ctrl": "но"},
+    "UC_GRK": {"chars": "ΗΠΙΓΕΤΚΜΝΞΒΡΨΟΘΩΦΑΔΛΥΧΖΣΉΊΈΌΆΏΎ", "l_ctrl": "ΟΗ", "r_ctrl": "ΗΟ"},
+    "lc_GRK": {"chars": "ηπιτκμοσρδαβφψωεςζξθυνγχλ", "l_ctrl": "οη", "r_ctrl": "ηο"},
+    "punctuation": {
+        "chars": [".", ",", ":", ";", "-", "_", "/", "\\", "¡!", "¿?", "()", "[]", "{}", "‘’", "‚‘", "’", "\"\"", "\'\'", "‹›", "›‹", "*", "#", "&", "@", "©", "®", "¶", "§", "№", "$", "€", "£", "¥", "₦", "₹", "₩", "฿", "₫", "¢", "₴", "₽", "%", "‰", "†", "‡", "™", "ª", "º", "↑", "↓", "↖", "↙", "←", "→", "↘", "↗", "☚", "☛", "❦", "<>"],
+        "chars_GRK": ["·"],  # ano teleia, prepended when Greek is selected
+        "l_ctrl": "OH", "r_ctrl": "HO"
+    }
+}
+
+# -----------------------------
+# 2. FORMATTING HELPERS
+# -----------------------------
+
+def get_data_key(ui_key, script):
+    """Map a UI group key ("UC", "lc", …) and script ("LTN", …) to a DATA key."""
+    if ui_key in ["numbers", "punctuation"]: return ui_key
+    return f"{ui_key}_{script}"
+
+def group_label(data_key):
+    return next(g["label"] for g in UI_GROUPS if g["key"] in data_key or data_key == g["key"])
+
+def flattened_and_wrappers(group_chars):
+    flat, wrappers = [], []
+    for item in group_chars:
+        for c in item: flat.append(c)
+        w_left = item[0]
+        w_right = item[1] if len(item) > 1 else item[0]
+        wrappers.append((w_left, w_right))
+    return flat, wrappers
+
+def format_glyph_name(name):
+    name = name.strip().lstrip("/")
+    return f"/{name} "
+
+def handle_slash_punc(punc):
+    if punc == "/": return "/slash "
+    return punc
+
+def number_glyph_name(base, suffix):
+    return f"{base}{'.'+suffix if suffix else ''}"
+
+def script_dependent(p_key, s_key, script):
+    """Return True if the p_key vs s_key tab differs between scripts."""
+    shared = ["numbers", "punctuation"]
+    if p_key not in shared or s_key not in shared:
+        return True
+    # Greek prepends the ano teleia to punctuation
+    return script == "GRK" and "punctuation" in [p_key, s_key]
+
+# -----------------------------
+# 3. ENGINE
+# -----------------------------
+
+class KerningStringEngine:
+    """Resolves DATA against one font and yields kerning-string lines."""
+
+    def __init__(self, font, refresh=False):
+        self.font = font
+        self.index = unicode_index(font, refresh)
+        self.signature = font_signature(font)
+        self._filtered = {}
+        self._number_variants = None
+
+    # Character resolution ────────────────────────────────────────────────────
+
+    def filtered_chars(self, data_key, script="LTN", alphabetical=False):
+        """Return the DATA items of `data_key` whose characters all exist in the font."""
+        if data_key == "numbers": return []
+        greek_punc = data_key == "punctuation" and script == "GRK"
+        cache_key = (data_key, greek_punc, alphabetical and data_key != "punctuation")
+        valid = self._filtered.get(cache_key)
+        if valid is None:
+            raw = list(DATA[data_key]["chars"])
+            if greek_punc:
+                raw = DATA["punctuation"].get("chars_GRK", []) + raw
+            # Drop repeated items, keeping the first occurrence
+            raw = list(dict.fromkeys(raw))
+            has = self.index.has_char_or_name
+            valid = [item for item in raw if all(has(c) for c in item)]
+            if cache_key[2]:
+                valid.sort()
+            self._filtered[cache_key] = valid
+        return valid
+
+    def number_variants(self):
+        """Return the figure variants present in the font, with their glyph names."""
+        if self._number_variants is None:
+            names = self.index.by_name
+            variants = []
+            for cfg in NUMBER_VARIANTS_CONFIG:
+                suffix = cfg["suffix"]
+                glyphs = [number_glyph_name(n, suffix) for n in NUMBER_BASE_NAMES if number_glyph_name(n, suffix) in names]
+                if glyphs: variants.append({"label": cfg["label"], "glyphs": glyphs, "suffix": suffix})
+            self._number_variants = variants
+        return self._number_variants
+
+    def valid_glyph_names(self, raw_input):
+        """Split space-separated user input and keep the names present in the font."""
+        names = [n.strip().lstrip("/") for n in raw_input.split() if n.strip()]
+        return [n for n in names if self.index.has_char_or_name(n)]
+
+    # Kerning groups ──────────────────────────────────────────────────────────
+
+    def kerning_keys(self, item):
+        """
+        (glyph name, "@" + left kerning group, "@" + right kerning group) of a
+        character or glyph name; a group is None when that side has none.
+        """
+        glyph = self.index.glyph_for_char(item) if len(item) == 1 else None
+        glyph = glyph or self.index.by_name.get(item)
+        if glyph is None:
+            return item, None, None
+        left, right = glyph.leftKerningGroup, glyph.rightKerningGroup
+        return glyph.name, ("@" + left if left else None), ("@" + right if right else None)
+
+    def pair_filter(self, by_group=False, kerned=None):
+        """
+        Return keep(pairs), True when any (left, right) item pair in `pairs`
+        is still worth showing: not kerned in the `kerned` KerningIndex and,
+        with by_group, a kerning class pair this filter hasn't seen yet.
+        None when neither applies. Use one filter per tab.
+        """
+        if not by_group and kerned is None:
+            return None
+        keys = {}
+        seen = set()
+
+        def lookup(item):
+            value = keys.get(item)
+            if value is None:
+                value = keys[item] = self.kerning_keys(item)
+            return value
+
+        def keep(pairs):
+            new = False
+            for left, right in pairs:
+                left_name, _, left_class = lookup(left)
+                right_name, right_class, _ = lookup(right)
+                if kerned is not None and kerned.has_pair(left_name, left_class, right_name, right_class):
+                    continue
+                if by_group:
+                    key = (left_class or left_name, right_class or right_name)
+                    if key in seen:
+                        continue
+                    seen.add(key)
+                new = True
+            return new
+        return keep
+
+    # Kerning String Maker ────────────────────────────────────────────────────
+
+    def tab_lines(self, p_key, s_key, script="LTN", alphabetical=False, by_group=False, kerned=None):
+        """Yield the lines of one primary vs secondary tab."""
+        if "numbers" in [p_key, s_key]:
+            return self.number_lines(p_key, s_key, script, alphabetical, by_group, kerned)
+        return self.standard_lines(p_key, s_key, script, alphabetical, by_group, kerned)
+
+    def standard_lines(self, p_key, s_key, script="LTN", alphabetical=False, by_group=False, kerned=None):
+        keep = self.pair_filter(by_group, kerned)
+        p_chars = self.filtered_chars(p_key, script, alphabetical)
+        s_chars = self.filtered_chars(s_key, script, alphabetical)
+        is_p_punc = "punctuation" in p_key
+        yield f"--- {group_label(p_key)} vs {group_label(s_key)} ---"
+
+        l_ctrl, r_ctrl = ("", "") if is_p_punc else (DATA[p_key]["l_ctrl"], DATA[p_key]["r_ctrl"])
+        if "UC" in p_key and "lc" in s_key: r_ctrl = DATA[s_key]["r_ctrl"]
+
+        if is_p_punc or "punctuation" in s_key:
+            wrapper_src = p_chars if is_p_punc else s_chars
+            target_src = s_chars if is_p_punc else p_chars
+            _, wrappers = flattened_and_wrappers(wrapper_src)
+            flat_targets, _ = flattened_and_wrappers(target_src)
+            targets = [(t, handle_slash_punc(t)) for t in flat_targets]
+            for w_l, w_r in wrappers:
+                wl_f, wr_f = handle_slash_punc(w_l), handle_slash_punc(w_r)
+                line = " ".join(f"{l_ctrl}{wl_f}{t_f}{wr_f}{r_ctrl}" for t, t_f in targets if keep is None or keep(((w_l, t), (t, w_r))))
+                if line: yield line
+        else:
+            mixed_case = "lc" in s_key and "UC" in p_key
+            for p in p_chars:
+                tail = r_ctrl if mixed_case else p + r_ctrl
+                line = " ".join(f"{l_ctrl}{p}{s}{tail}" for s in s_chars if keep is None or keep(((p, s),) if mixed_case else ((p, s), (s, p))))
+                if line: yield line
+
+    def number_lines(self, p_key, s_key, script="LTN", alphabetical=False, by_group=False, kerned=None):
+        keep = self.pair_filter(by_group, kerned)
+        is_p_num = p_key == "numbers"
+        is_p_punc = p_key == "punctuation"
+
+        # Resolve clean labels for the secondary group
+        if is_p_num or is_p_punc:
+            sec_ui_key = s_key.split('_')[0]
+            sec_label = next((g["label"] for g in UI_GROUPS if g["key"] == sec_ui_key), "Others")
+        else:
+            sec_label = "Numbers"
+
+        for var in self.number_variants():
+            p_title = var["label"] if is_p_num else ("Punctuation" if is_p_punc else "Letters")
+            s_title = var["label"] if not is_p_num and not is_p_punc else sec_label
+            yield f"--- {p_title} vs {s_title} ---"
+
+            z_fmt = format_glyph_name(number_glyph_name("zero", var["suffix"]))
+            l_ctrl, r_ctrl = ("", "") if is_p_punc else (f"{z_fmt}{z_fmt}", f"{z_fmt}{z_fmt}")
+            if not is_p_num and not is_p_punc:
+                l_ctrl, r_ctrl = DATA[p_key]["l_ctrl"], DATA[p_key]["r_ctrl"]
+            numbers = [(n, format_glyph_name(n)) for n in var["glyphs"]]
+
+            if "punctuation" in [p_key, s_key]:
+                punc_data = self.filtered_chars("punctuation", script, alphabetical)
+                flat_punc, wrappers = flattened_and_wrappers(punc_data)
+                if is_p_punc:
+                    for w_l, w_r in wrappers:
+                        wl_f, wr_f = handle_slash_punc(w_l), handle_slash_punc(w_r)
+                        line = " ".join(f"{wl_f}{n_f}{wr_f}" for n, n_f in numbers if keep is None or keep(((w_l, n), (n, w_r))))
+                        if line: yield line
+                else:
+                    puncs = [(p, handle_slash_punc(p)) for p in flat_punc]
+                    for n, n_f in numbers:
+                        line = " ".join(f"{l_ctrl}{n_f}{p_f}{n_f}{r_ctrl}" for p, p_f in puncs if keep is None or keep(((n, p), (p, n))))
+                        if line: yield line
+
+            elif is_p_num and s_key == "numbers":
+                for n1, n1_f in numbers:
+                    line = " ".join(f"{l_ctrl}{n1_f}{n2_f}{n1_f}{r_ctrl}" for n2, n2_f in numbers if keep is None or keep(((n1, n2), (n2, n1))))
+                    if line: yield line
+
+            elif is_p_num: # Numbers Primary vs Letters
+                letter_chars = self.filtered_chars(s_key, script, alphabetical)
+                for n, n_f in numbers:
+                    line = " ".join(f"{l_ctrl}{n_f}{l}{n_f}{r_ctrl}" for l in letter_chars if keep is None or keep(((n, l), (l, n))))
+                    if line: yield line
+            else: # Letters Primary vs Numbers
+                letter_chars = self.filtered_chars(p_key, script, alphabetical)
+                for l in letter_chars:
+                    line = " ".join(f"{l_ctrl}{l}{n_f}{l}{r_ctrl}" for n, n_f in numbers if keep is None or keep(((l, n), (n, l))))
+                    if line: yield line
+
+    def matrix_lines(self, scripts=SCRIPTS, ui_keys=None, alphabetical=False, by_group=False, kerned=None):
+        """
+        Yield the full primary × secondary matrix for `scripts` as one stream of
+        lines. Tabs that don't depend on the script (e.g. numbers vs numbers)
+        are emitted once, under the first script that produces them. With
+        `kerned`, tabs left without strings are skipped. A script's heading
+        is only emitted when at least one of its tabs is.
+        """
+        ui_keys = ui_keys or [g["key"] for g in UI_GROUPS]
+        emitted = set()
+        for script in scripts:
+            heading = f"=== {SCRIPT_LABELS[script]} ==="
+            for p_ui_key in ui_keys:
+                for s_ui_key in ui_keys:
+                    p_key, s_key = get_data_key(p_ui_key, script), get_data_key(s_ui_key, script)
+                    tab_id = (p_key, s_key, script if script_dependent(p_key, s_key, script) else None)
+                    if tab_id in emitted:
+                        continue
+                    emitted.add(tab_id)
+                    lines = self.tab_lines(p_key, s_key, script, alphabetical, by_group, kerned)
+                    if kerned is not None:
+                        lines = list(lines)
+                        if all(is_heading(line) for line in lines):
+                            continue
+                    if heading:
+                        yield heading
+                        heading = None
+                    yield from lines
+
+    # Arbitrary Kerning String Maker ──────────────────────────────────────────
+
+    def variant_tab_lines(self, variant_glyphs, s_key, script="LTN", alphabetical=False, by_group=False, kerned=None):
+        """Yield the lines of one 'Your Glyphs vs …' tab."""
+        if s_key == "numbers":
+            return self.variant_number_lines(variant_glyphs, by_group, kerned)
+        return self.variant_standard_lines(variant_glyphs, s_key, script, alphabetical, by_group=by_group, kerned=kerned)
+
+    def variant_standard_lines(self, variant_glyphs, s_key, script="LTN", alphabetical=False, chunk_size=10, by_group=False, kerned=None):
+        keep = self.pair_filter(by_group, kerned)
+        yield f"--- Your Glyphs vs {group_label(s_key)} ---"
+
+        s_chars = self.filtered_chars(s_key, script, alphabetical)
+        if s_key == "punctuation":
+            _, wrappers = flattened_and_wrappers(s_chars)
+            wrappers = [(w_l, w_r, handle_slash_punc(w_l), handle_slash_punc(w_r)) for w_l, w_r in wrappers]
+            for v in variant_glyphs:
+                v_f = format_glyph_name(v)
+                pairs = [f"{wl_f}{v_f}{wr_f}" for w_l, w_r, wl_f, wr_f in wrappers if keep is None or keep(((w_l, v), (v, w_r)))]
+                for i in range(0, len(pairs), chunk_size):
+                    yield " ".join(pairs[i:i + chunk_size])
+        else:
+            l_ctrl = DATA[s_key]["l_ctrl"]
+            r_ctrl = DATA[s_key]["r_ctrl"]
+            for v in variant_glyphs:
+                v_f = format_glyph_name(v)
+                line = " ".join(f"{l_ctrl}{v_f}{s}{v_f}{r_ctrl}" for s in s_chars if keep is None or keep(((v, s), (s, v))))
+                if line: yield line
+
+    def variant_number_lines(self, variant_glyphs, by_group=False, kerned=None):
+        keep = self.pair_filter(by_group, kerned)
+        for var in self.number_variants():
+            yield f"--- Your Glyphs vs {var['label']} ---"
+            z_fmt = format_glyph_name(number_glyph_name("zero", var["suffix"]))
+            l_ctrl = f"{z_fmt}{z_fmt}"
+            r_ctrl = f"{z_fmt}{z_fmt}"
+            numbers = [(n, format_glyph_name(n)) for n in var["glyphs"]]
+            for v in variant_glyphs:
+                v_f = format_glyph_name(v)
+                line = " ".join(f"{l_ctrl}{v_f}{n_f}{v_f}{r_ctrl}" for n, n_f in numbers if keep is None or keep(((v, n), (n, v))))
+                if line: yield line
+
+# -----------------------------
+# 4. EXISTING KERNING
+# -----------------------------
+
+GROUP_PREFIXES = ("@MMK_L_", "@MMK_R_")
+
+class KerningIndex:
+    """
+    The pairs kerned in one master, read from font.kerning once into a set.
+    Sides are glyph names or "@" + kerning group, like engine.kerning_keys().
+    """
+
+    def __init__(self, font, master_id):
+        self.master_id = master_id
+        self.pairs = set()
+        names = {}
+
+        def resolve(key, prefix):
+            if key.startswith(prefix):
+                return "@" + key[len(prefix):]
+            name = names.get(key)
+            if name is None:
+                # Glyphs 3 keys glyphs by id, Glyphs 2 by name
+                glyph = font.glyphForId_(key) or font.glyphs[key]
+                name = names[key] = glyph.name if glyph is not None else ""
+            return name or None
+
+        master_kerning = font.kerning.get(master_id) or {}
+        for left_key, rights in master_kerning.items():
+            left = resolve(left_key, GROUP_PREFIXES[0])
+            if left is None:
+                continue
+            for right_key in rights:
+                right = resolve(right_key, GROUP_PREFIXES[1])
+                if right is not None:
+                    self.pairs.add((left, right))
+
+    def __len__(self):
+        return len(self.pairs)
+
+    def has_pair(self, left_name, left_group, right_name, right_group):
+        """
+        True when the pair has a value at any level: glyph pair, exception
+        on either side, or group pair. Groups are "@…" keys or None.
+        """
+        pairs = self.pairs
+        if (left_name, right_name) in pairs:
+            return True
+        if left_group and ((left_group, right_name) in pairs or (right_group and (left_group, right_group) in pairs)):
+            return True
+        return bool(right_group) and (left_name, right_group) in pairs
+
+def is_heading(line):
+    """True for the '--- … ---' and '=== … ===' title lines."""
+    return line.startswith(("---", "==="))
+
+# -----------------------------
+# 5. BATCH OUTPUT
+# -----------------------------
+
+def paginate(lines, max_lines=0):
+    """Group a stream of lines into lists of at most `max_lines` (0 = no cap)."""
+    page = []
+    for line in lines:
+        page.append(line)
+        if max_lines and len(page) >= max_lines:
+            yield page
+            page = []
+    if page:
+        yield page
+
+def write_text_files(lines, folder, basename="KerningStrings", max_lines=0):
+    """
+    Stream `lines` to numbered text files in `folder`, one kerning string per
+    line and at most `max_lines` per file. Return the written paths.
+    """
+    import os
+
+    paths = []
+    for number, page in enumerate(paginate(lines, max_lines), start=1):
+        path = os.path.join(folder, f"{basename}_{number:03d}.txt")
+        with open(path, "w", encoding="utf-8") as f:
+            for line in page:
+                f.write(line)
+                f.write("\n")
+        paths.append(path)
+    return paths
+
+# -----------------------------
+# 6. PER-FONT CACHE
+# -----------------------------
+
+_ENGINES = FontCache()
+
+def engine_for_font(font, refresh=False):
+    """
+    Return the cached engine for `font`, rebuilt when the font's signature
+    moved. The signature misses renamed or re-encoded glyphs, so the scripts
+    pass refresh=True once per click and only reuse the engine within it.
+    """
+    engine = _ENGINES.get(font)
+    if refresh or engine is None or engine.signature != font_signature(font):
+        engine = _ENGINES.set(font, KerningStringEngine(font, refresh))
+    return engine
@@ -0,0 +1,258 @@
+# -*- coding: utf-8 -*-
+"""
+Command-line quality checks for a folder of Glyphs sources, without Glyphs.
+
+Runs the checks of FindGlyphsWithLiveStrokes.py, Find Glyphs Without Synched
+Side Bearings.py and DeleteEmptyComponentsInSelectedGlyphs.py (report only,
+nothing is changed) on every .glyphs file and .glyphspackage folder, with a
+process pool. Each font is one task; fonts larger than --split-above MB get
+one pre-pass task for the whole-font data (empty bases, component bounds,
+where each glyph starts in the file), then are split into glyph ranges that
+each worker reads on its own, so one big family doesn't hold up the rest.
+The per-task results are merged into one JSON or CSV report.
+
+    python3 -m naipe_core.qc_runner Sources/ --jobs 8 --output report.json
+    python3 -m naipe_core.qc_runner A.glyphs B.glyphspackage --output report.csv
+"""
+
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+from array import array
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from naipe_core.components import EmptyBaseIndex, find_components
+from naipe_core.glyphs_reader import SourceFont
+from naipe_core.sidebearings import collect_sidebearings, find_mismatches, reference_index
+from naipe_core.strokes import scan_live_strokes
+
+CHECKS = ("live_strokes", "side_bearings", "empty_components")
+SOURCE_SUFFIXES = (".glyphs", ".glyphspackage")
+
+# ── Map: one task per font or font slice ─────────────────────────────────────
+
+def find_sources(paths):
+    """Glyphs sources in the given files and folders, sorted by path."""
+    sources = []
+    for path in paths:
+        if path.endswith(SOURCE_SUFFIXES):
+            sources.append(path)
+        elif os.path.isdir(path):
+            for name in os.listdir(path):
+                if name.endswith(SOURCE_SUFFIXES) and not name.startswith("."):
+                    sources.append(os.path.join(path, name))
+    return sorted(set(sources))
+
+def source_size(path):
+    if not os.path.isdir(path):
+        return os.path.getsize(path)
+    return sum(os.path.getsize(os.path.join(root, f)) for root, _, files in os.walk(path) for f in files)
+
+def plan_tasks(sources, split_above_mb, slices):
+    """Return (path, parts) per font, largest fonts first."""
+    tasks = []
+    for path in sorted(sources, key=source_size, reverse=True):
+        parts = slices if slices > 1 and source_size(path) > split_above_mb * 1e6 else 1
+        tasks.append((path, parts))
+    return tasks
+
+def _prepare(font, checks):
+    """The whole-font pre-pass: bounds table, glyph offsets and empty bases from one stream."""
+    glyphs = font.scan()
+    if "empty_components" in checks:
+        empty_bases = EmptyBaseIndex(font, glyphs)
+    else:
+        empty_bases = None
+        for _ in glyphs:
+            pass
+    return font.whole_font_state(), empty_bases
+
+def prepare_font(path, checks=CHECKS):
+    """Run the pre-pass once for a font that is checked in slices; pass the result to check_slice."""
+    started = time.perf_counter()
+    state, empty_bases = _prepare(SourceFont(path), checks)
+    return state, empty_bases, time.perf_counter() - started
+
+def check_slice(path, part=0, parts=1, checks=CHECKS, tolerance=0, reference=None, prepared=None):
+    """
+    Run the checks on the part-th of `parts` glyph ranges of one source.
+    Whole-font data comes from `prepared` (see prepare_font), or from a
+    pre-pass here; only the slice's own glyphs are read after that. Every
+    record carries the glyph's position in the font, for merging.
+    """
+    started = time.perf_counter()
+    if prepared is None:
+        font = SourceFont(path)
+        _, empty_index = _prepare(font, checks)
+        setup = 0.0
+    else:
+        state, empty_index, setup = prepared
+        font = SourceFont(path, state)
+        setup = setup if part == 0 else 0.0
+    masters = font.masters
+    master_names = {m.id: m.name for m in masters}
+    reference_column = reference_index(masters, _master_id(masters, reference))
+    empty_bases = empty_index.matcher() if empty_index is not None else None
+
+    result = {"live_strokes": [], "side_bearings": [], "empty_components": [], "glyphs": 0}
+    names = []
+    lsb, rsb = array("d"), array("d")
+    count = font.glyph_count()
+    start = part * count // parts
+    for order, glyph in enumerate(font.iter_glyph_range(start, (part + 1) * count // parts), start):
+        result["glyphs"] += 1
+        if "live_strokes" in checks:
+            for master_ids in scan_live_strokes(font, glyphs=(glyph,)).values():
+                result["live_strokes"].append({"order": order, "glyph": glyph.name, "masters": [master_names[m] for m in master_ids]})
+        if "empty_components" in checks:
+            for removal in find_components((glyph,), empty_bases):
+                result["empty_components"].append({"order": order, "glyph": glyph.name, "layer": removal.layer.name, "components": removal.names})
+        if "side_bearings" in checks:
+            glyph_names, glyph_lsb, glyph_rsb = collect_sidebearings(font, masters, (glyph,), names_only=True)
+            names.append((order, glyph_names[0]))
+            lsb.extend(glyph_lsb)
+            rsb.extend(glyph_rsb)
+
+    if "side_bearings" in checks:
+        for row, diffs in find_mismatches(lsb, rsb, len(masters), reference_column, tolerance):
+            order, name = names[row]
+            for column, d_l, d_r in diffs:
+                result["side_bearings"].append({"order": order, "glyph": name, "master": masters[column].name, "lsb_delta": d_l, "rsb_delta": d_r})
+
+    result.update(
+        font=path,
+        family=font.familyName,
+        masters=[m.name for m in masters],
+        reference=masters[reference_column].name if masters else None,
+        seconds=time.perf_counter() - started + setup,
+    )
+    return result
+
+def _master_id(masters, reference):
+    """Accept a master id or name for --reference-master."""
+    for master in masters:
+        if reference in (master.id, master.name):
+            return master.id
+    return None
+
+# ── Reduce: merge slices into one record per font ────────────────────────────
+
+def merge_results(results, errors):
+    fonts = {}
+    for result in results:
+        font = fonts.setdefault(result["font"], {
+            "font": result["font"],
+            "family": result["family"],
+            "masters": result["masters"],
+            "reference_master": result["reference"],
+            "glyphs": 0,
+            "seconds": 0.0,
+            **{check: [] for check in CHECKS},
+        })
+        font["glyphs"] += result["glyphs"]
+        font["seconds"] += result["seconds"]
+        for check in CHECKS:
+            font[check].extend(result[check])
+    for font in fonts.values():
+        for check in CHECKS:
+            font[check].sort(key=lambda record: record["order"])
+            for record in font[check]:
+                del record["order"]
+    return {"fonts": [fonts[path] for path in sorted(fonts)], "errors": errors}
+
+def csv_rows(report):
+    yield ["font", "check", "glyph", "where", "detail"]
+    for font in report["fonts"]:
+        for record in font["live_strokes"]:
+            yield [font["font"], "live_strokes", record["glyph"], " ".join(record["masters"]), ""]
+        for record in font["side_bearings"]:
+            yield [font["font"], "side_bearings", record["glyph"], record["master"], f"LSB {record['lsb_delta']:+g} RSB {record['rsb_delta']:+g}"]
+        for record in font["empty_components"]:
+            yield [font["font"], "empty_components", record["glyph"], record["layer"], " ".join(record["components"])]
+    for error in report["errors"]:
+        yield [error["font"], "error", "", "", error["error"]]
+
+def write_report(report, output, fmt):
+    stream = open(output, "w", newline="", encoding="utf-8") if output else sys.stdout
+    try:
+        if fmt == "csv":
+            csv.writer(stream).writerows(csv_rows(report))
+        else:
+            json.dump(report, stream, indent=2, ensure_ascii=False)
+            stream.write("\n")
+    finally:
+        if output:
+            stream.close()
+
+# ── Command line ─────────────────────────────────────────────────────────────
+
+def run(sources, jobs=None, checks=CHECKS, tolerance=0, reference=None, split_above_mb=20, slices=None):
+    """Check all sources with a process pool and return the merged report."""
+    jobs = jobs or os.cpu_count() or 1
+    tasks = plan_tasks(sources, split_above_mb, slices or jobs)
+    results, errors = [], []
+    if jobs == 1:
+        for path, parts in tasks:
+            try:
+                prepared = prepare_font(path, checks) if parts > 1 else None
+                for part in range(parts):
+                    results.append(check_slice(path, part, parts, checks, tolerance, reference, prepared))
+            except Exception as e:
+                errors.append({"font": path, "error": f"{type(e).__name__}: {e}"})
+        return merge_results(results, errors)
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        # Split fonts start with their pre-pass; their slices follow once it is done
+        futures = {}
+        for path, parts in tasks:
+            if parts > 1:
+                futures[pool.submit(prepare_font, path, checks)] = (path, parts)
+            else:
+                futures[pool.submit(check_slice, path, 0, 1, checks, tolerance, reference)] = (path, None)
+        while futures:
+            done, _ = wait(futures, return_when=FIRST_COMPLETED)
+            for future in done:
+                path, parts = futures.pop(future)
+                try:
+                    value = future.result()
+                except Exception as e:
+                    errors.append({"font": path, "error": f"{type(e).__name__}: {e}"})
+                    continue
+                if parts is None:
+                    results.append(value)
+                    continue
+                for part in range(parts):
+                    futures[pool.submit(check_slice, path, part, parts, checks, tolerance, reference, value)] = (path, None)
+    return merge_results(results, errors)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python3 -m naipe_core.qc_runner", description=__doc__.strip().splitlines()[0])
+    parser.add_argument("paths", nargs="+", help=".glyphs files, .glyphspackage folders, or folders containing them")
+    parser.add_argument("--jobs", "-j", type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument("--checks", nargs="+", choices=CHECKS, default=list(CHECKS))
+    parser.add_argument("--tolerance", type=float, default=0, help="side-bearing difference still counted as synched")
+    parser.add_argument("--reference-master", default=None, help="master id or name to compare side bearings against (default: first)")
+    parser.add_argument("--split-above", type=float, default=20, metavar="MB", help="split fonts larger than this across workers")
+    parser.add_argument("--output", "-o", default=None, help="report file (default: stdout)")
+    parser.add_argument("--format", choices=("json", "csv"), default=None, help="default: from the output extension, else json")
+    args = parser.parse_args(argv)
+
+    sources = find_sources(args.paths)
+    if not sources:
+        parser.error("no .glyphs or .glyphspackage sources found")
+    fmt = args.format or ("csv" if args.output and args.output.endswith(".csv") else "json")
+
+    started = time.perf_counter()
+    report = run(sources, args.jobs, tuple(args.checks), args.tolerance, args.reference_master, args.split_above)
+    write_report(report, args.output, fmt)
+
+    counts = {check: sum(len(font[check]) for font in report["fonts"]) for check in args.checks}
+    summary = ", ".join(f"{check.replace('_', ' ')}: {n}" for check, n in counts.items())
+    print(f"Checked {len(report['fonts'])} font(s) in {time.perf_counter() - started:.1f}s — {summary}; {len(report['errors'])} error(s).", file=sys.stderr)
+    return 1 if report["errors"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
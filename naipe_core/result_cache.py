@@ -0,0 +1,188 @@
+# -*- coding: utf-8 -*-
+"""
+SQLite cache of per-layer check results, so that a rerun only looks again
+at the glyphs that changed since the last run.
+
+Rows are keyed by font file, check, glyph name and layer id, and carry the
+glyph's fingerprint: its lastChange stamp plus the stamps of every glyph it
+uses as a component, directly or nested (editing a base moves a composite's
+bounds). A glyph whose fingerprint still matches is served from the cache;
+any other glyph is checked again and its rows are replaced.
+
+    with ResultCache(Glyphs.defaults) as cache:
+        for glyph, values in cache.layer_values(font, "sidebearings", measure):
+            ...
+
+Fonts that were never saved have no file to key on and are always checked
+in full. Two Glyphs.defaults keys control the cache:
+
+    com.naipe.cache       set to False to turn the cache off
+    com.naipe.cacheFile   database path, CACHE_FILE by default
+"""
+
+import json
+import os
+import sqlite3
+import tempfile
+
+from naipe_core.component_graph import component_graph
+from naipe_core.instrumentation import setting
+
+CACHE_KEY = "com.naipe.cache"
+CACHE_FILE_KEY = "com.naipe.cacheFile"
+
+# Default database location
+CACHE_FILE = os.path.join(tempfile.gettempdir(), "naipe-cache", "results.sqlite")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    font TEXT NOT NULL,
+    check_name TEXT NOT NULL,
+    glyph TEXT NOT NULL,
+    layer TEXT NOT NULL,
+    fingerprint TEXT NOT NULL,
+    value TEXT,
+    PRIMARY KEY (font, check_name, glyph, layer)
+) WITHOUT ROWID
+"""
+
+# Layer id of the row stored for a glyph whose check returned no layers
+NO_LAYERS = ""
+
+def font_key(font):
+    """The font's file path, or None for a font that was never saved."""
+    path = getattr(font, "filepath", None)
+    return os.path.abspath(str(path)) if path else None
+
+def _stamp(value):
+    # NSDate prints with one-second resolution; use the full interval when available
+    interval = getattr(value, "timeIntervalSince1970", None)
+    return repr(interval()) if callable(interval) else str(value)
+
+def glyph_fingerprint(graph, glyph, salt=""):
+    """
+    lastChange of the glyph and of all its (nested) component bases, as one
+    string. None when the glyph has no lastChange: such glyphs are not cached.
+    """
+    stamp = getattr(glyph, "lastChange", None)
+    if stamp is None:
+        return None
+    parts = [salt, _stamp(stamp)]
+    for base in graph.bases_of(glyph.name, transitive=True):
+        parts.append(f"{base}={_stamp(graph.stamps.get(base))}")
+    return "|".join(parts)
+
+
+class ResultCache:
+    """Per-layer check results stored across runs, see the module docstring."""
+
+    def __init__(self, defaults=None, path=None, enabled=None):
+        self.enabled = bool(setting(defaults, CACHE_KEY, True) if enabled is None else enabled)
+        self.path = path or setting(defaults, CACHE_FILE_KEY, CACHE_FILE)
+        self.hits = 0
+        self.misses = 0
+        self.error = None
+        self.connection = None
+        if self.enabled:
+            try:
+                os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+                self.connection = sqlite3.connect(self.path, timeout=30)
+                self.connection.execute(SCHEMA)
+            except (OSError, sqlite3.Error) as e:
+                # A broken or locked cache must never stop a check: run uncached
+                self.error = e
+                self.close()
+
+    def close(self):
+        if self.connection is not None:
+            self.connection.close()
+            self.connection = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+    # ── Reading and writing ──────────────────────────────────────────────────
+
+    def _load(self, font, check):
+        stored = {}
+        rows = self.connection.execute(
+            "SELECT glyph, layer, fingerprint, value FROM results WHERE font = ? AND check_name = ?",
+            (font, check),
+        )
+        for glyph, layer, fingerprint, value in rows:
+            entry = stored.get(glyph)
+            if entry is None:
+                entry = stored[glyph] = (fingerprint, {})
+            if layer != NO_LAYERS:
+                entry[1][layer] = json.loads(value)
+        return stored
+
+    def _store(self, font, check, rows, forget=()):
+        names = [(font, check, name) for name in forget]
+        names.extend((font, check, name) for name, _, _ in rows)
+        records = []
+        for name, fingerprint, values in rows:
+            if not values:
+                records.append((font, check, name, NO_LAYERS, fingerprint, None))
+            for layer_id, value in values.items():
+                records.append((font, check, name, layer_id, fingerprint, json.dumps(value)))
+        with self.connection:
+            self.connection.executemany("DELETE FROM results WHERE font = ? AND check_name = ? AND glyph = ?", names)
+            self.connection.executemany("INSERT INTO results VALUES (?, ?, ?, ?, ?, ?)", records)
+
+    def clear(self, font=None):
+        """Forget everything stored for `font`, or the whole cache."""
+        if self.connection is None:
+            return
+        with self.connection:
+            if font is None:
+                self.connection.execute("DELETE FROM results")
+            else:
+                self.connection.execute("DELETE FROM results WHERE font = ?", (font_key(font),))
+
+    # ── Checks ───────────────────────────────────────────────────────────────
+
+    def layer_values(self, font, check, compute, glyphs=None, salt=""):
+        """
+        Return [(glyph, {layer id: value}), …] in glyph order, where
+        compute(glyph) gives the values of one glyph (JSON-serializable;
+        tuples come back as lists). Unchanged glyphs are read from the cache,
+        the others are computed and stored. `salt` is added to every
+        fingerprint: pass whatever else the values depend on, such as the
+        master ids. Checking all glyphs also drops rows of deleted glyphs.
+        """
+        key = font_key(font) if self.connection is not None else None
+        if key is None:
+            results = [(glyph, compute(glyph)) for glyph in (font.glyphs if glyphs is None else glyphs)]
+            self.misses += len(results)
+            return results
+
+        stored = self._load(key, check)
+        graph = component_graph(font, refresh=True)
+        results, rows = [], []
+        for glyph in (font.glyphs if glyphs is None else glyphs):
+            fingerprint = glyph_fingerprint(graph, glyph, salt)
+            entry = stored.get(glyph.name)
+            if fingerprint is not None and entry is not None and entry[0] == fingerprint:
+                results.append((glyph, entry[1]))
+                self.hits += 1
+                continue
+            values = compute(glyph)
+            results.append((glyph, values))
+            self.misses += 1
+            if fingerprint is not None:
+                rows.append((glyph.name, fingerprint, values))
+
+        forget = ()
+        if glyphs is None:
+            forget = set(stored) - {glyph.name for glyph, _ in results}
+        if rows or forget:
+            try:
+                self._store(key, check, rows, forget)
+            except sqlite3.Error as e:
+                self.error = e
+        return results
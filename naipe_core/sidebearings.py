@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+"""
+Side-bearing sync check across masters.
+
+LSB/RSB values are collected once into glyph × master arrays (row-major,
+one row per glyph) and compared against a reference master column in one
+step — vectorized with NumPy when it is installed, plain loops otherwise.
+"""
+
+from array import array
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+NAN = float("nan")
+
+def reference_index(masters, master_id=None):
+    """Column of the reference master; the first master if `master_id` is None or unknown."""
+    for i, master in enumerate(masters):
+        if master.id == master_id:
+            return i
+    return 0
+
+def layer_sidebearings(glyph, master_ids):
+    """{master id: (LSB, RSB)} of the glyph's master layers, None for a missing layer."""
+    layers = glyph.layers
+    values = {}
+    for master_id in master_ids:
+        layer = layers[master_id]
+        values[master_id] = None if layer is None else (layer.LSB, layer.RSB)
+    return values
+
+def collect_sidebearings(font, masters=None, glyphs=None, names_only=False, cache=None):
+    """
+    Return (glyphs, lsb, rsb) where lsb/rsb are flat row-major arrays with one
+    value per glyph and master. Missing layers are stored as NaN. `glyphs` can
+    be any iterable (a subset, or a stream from glyphs_reader); it defaults
+    to all of the font's glyphs. With names_only, glyph names are returned
+    instead of glyph objects, so a stream is not kept in memory. With a
+    ResultCache, unchanged glyphs are not measured again.
+    """
+    master_ids = [m.id for m in (masters or font.masters)]
+    if cache is None:
+        measured = ((glyph, layer_sidebearings(glyph, master_ids)) for glyph in (font.glyphs if glyphs is None else glyphs))
+    else:
+        measure = lambda glyph: layer_sidebearings(glyph, master_ids)
+        measured = cache.layer_values(font, "sidebearings", measure, glyphs, salt=",".join(master_ids))
+    collected = []
+    lsb = array("d")
+    rsb = array("d")
+    for glyph, values in measured:
+        collected.append(glyph.name if names_only else glyph)
+        for master_id in master_ids:
+            value = values.get(master_id)
+            if value is None:
+                lsb.append(NAN)
+                rsb.append(NAN)
+            else:
+                lsb.append(value[0])
+                rsb.append(value[1])
+    return collected, lsb, rsb
+
+def find_mismatches(lsb, rsb, master_count, reference_index=0, tolerance=0):
+    """
+    Compare every master column with the reference column. Return a list of
+    (row, [(master index, LSB difference, RSB difference), …]) for the rows
+    where any master differs by more than `tolerance` units.
+    """
+    if numpy is not None:
+        return _find_mismatches_numpy(lsb, rsb, master_count, reference_index, tolerance)
+
+    mismatches = []
+    for row in range(len(lsb) // master_count if master_count else 0):
+        start = row * master_count
+        ref_l, ref_r = lsb[start + reference_index], rsb[start + reference_index]
+        diffs = []
+        for column in range(master_count):
+            d_l = lsb[start + column] - ref_l
+            d_r = rsb[start + column] - ref_r
+            # NaN (missing layer) never compares greater, so it is skipped
+            if abs(d_l) > tolerance or abs(d_r) > tolerance:
+                diffs.append((column, d_l, d_r))
+        if diffs:
+            mismatches.append((row, diffs))
+    return mismatches
+
+def _find_mismatches_numpy(lsb, rsb, master_count, reference_index, tolerance):
+    if not master_count:
+        return []
+    l_values = numpy.asarray(lsb, dtype=float).reshape(-1, master_count)
+    r_values = numpy.asarray(rsb, dtype=float).reshape(-1, master_count)
+    d_l = l_values - l_values[:, reference_index:reference_index + 1]
+    d_r = r_values - r_values[:, reference_index:reference_index + 1]
+    with numpy.errstate(invalid="ignore"):
+        differs = (numpy.abs(d_l) > tolerance) | (numpy.abs(d_r) > tolerance)
+    mismatches = []
+    for row in numpy.flatnonzero(differs.any(axis=1)):
+        columns = numpy.flatnonzero(differs[row])
+        mismatches.append((int(row), [(int(c), float(d_l[row, c]), float(d_r[row, c])) for c in columns]))
+    return mismatches
+
+def report_lines(names, master_names, mismatches):
+    """Format mismatches as 'glyph: Master  LSB +n  RSB -n; …' lines."""
+    lines = []
+    for row, diffs in mismatches:
+        parts = [f"{master_names[c]}  LSB {d_l:+g}  RSB {d_r:+g}" for c, d_l, d_r in diffs]
+        lines.append(f"{names[row]}: " + "; ".join(parts))
+    return lines
@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+"""
+Live stroke detection: one pass over each glyph's layers, covering all
+masters (and optionally brace/bracket layers) at once.
+"""
+
+def has_live_stroke(layer):
+    """Return True if any path on the layer has a strokeWidth set."""
+    for path in layer.paths:
+        # Fetch the bridged attributes dictionary once per path
+        attributes = path.attributes
+        if attributes and "strokeWidth" in attributes:
+            return True
+    return False
+
+def glyph_strokes(glyph, master_order, include_special=False):
+    """
+    {layer id: master id} of the glyph's layers with live strokes; one layer
+    per master is enough. Special layers count towards their master.
+    """
+    found = {}
+    masters = set()
+    for layer in glyph.layers:
+        master_id = layer.associatedMasterId
+        if master_id in masters:
+            continue
+        if layer.layerId in master_order or (include_special and layer.isSpecialLayer and master_id in master_order):
+            if has_live_stroke(layer):
+                found[layer.layerId] = master_id
+                masters.add(master_id)
+    return found
+
+def scan_live_strokes(font, include_special=False, glyphs=None, cache=None):
+    """
+    Return {glyph: [master ids with live strokes]} for the glyphs that have
+    any, in font order. Special layers count towards their associated master.
+    `glyphs` can be any iterable of the font's glyphs; all of them by default.
+    With a ResultCache, unchanged glyphs are not scanned again.
+    """
+    master_order = {master.id: i for i, master in enumerate(font.masters)}
+    scan = lambda glyph: glyph_strokes(glyph, master_order, include_special)
+    if cache is None:
+        scanned = ((glyph, scan(glyph)) for glyph in (font.glyphs if glyphs is None else glyphs))
+    else:
+        check = "live_strokes+special" if include_special else "live_strokes"
+        scanned = cache.layer_values(font, check, scan, glyphs, salt=",".join(master_order))
+    stroked = {}
+    for glyph, found in scanned:
+        if found:
+            stroked[glyph] = sorted(set(found.values()), key=master_order.get)
+    return stroked
+
+def stroked_layers(font, include_special=True):
+    """Return the master (and special) layers that contain stroked paths."""
+    layers = []
+    for glyph in font.glyphs:
+        for layer in glyph.layers:
+            if (layer.isMasterLayer or (include_special and layer.isSpecialLayer)) and has_live_stroke(layer):
+                layers.append(layer)
+    return layers
+
+def glyphs_by_master(font, stroked):
+    """Invert scan_live_strokes(): {master id: [glyphs]} in font order."""
+    by_master = {master.id: [] for master in font.masters}
+    for glyph, master_ids in stroked.items():
+        for master_id in master_ids:
+            by_master[master_id].append(glyph)
+    return by_master
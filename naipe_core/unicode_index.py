@@ -0,0 +1,103 @@
+# -*- coding: utf-8 -*-
+"""
+Font-level codepoint → glyph index.
+
+Looking a character up by walking `font.glyphs` costs one full scan per
+character. The index below is built with a single pass over the font and
+answers membership and glyph lookups with a dictionary hit.
+"""
+
+from naipe_core.font_cache import FontCache
+
+# ── Index ────────────────────────────────────────────────────────────────────
+
+class UnicodeIndex:
+    """Codepoint and glyph-name lookups for one font, built in one pass."""
+
+    def __init__(self, font):
+        self.by_codepoint = {}
+        self.by_name = {}
+        for glyph in font.glyphs:
+            self.by_name[glyph.name] = glyph
+            for cp in glyph_codepoints(glyph):
+                # First glyph wins, like Glyphs' own character lookup
+                self.by_codepoint.setdefault(cp, glyph)
+        self.signature = font_signature(font)
+
+    def __contains__(self, char):
+        return self.has_char(char)
+
+    def has_char(self, char):
+        """Return True if the font contains a glyph for the given Unicode character."""
+        return ord(char) in self.by_codepoint
+
+    def glyph_for_char(self, char):
+        """Return the glyph encoded with `char`, or None."""
+        return self.by_codepoint.get(ord(char))
+
+    def has_char_or_name(self, item):
+        """
+        Return True if `item` resolves to a glyph either as a character or as a
+        glyph name (mirrors `font.glyphForCharacter_(…) or font.glyphs[…]`).
+        """
+        if len(item) == 1 and ord(item) in self.by_codepoint:
+            return True
+        return item in self.by_name
+
+    def filter_chars(self, chars):
+        """Remove characters that are absent from the font, keeping order."""
+        return [c for c in chars if ord(c) in self.by_codepoint]
+
+# ── Glyph helpers ────────────────────────────────────────────────────────────
+
+def glyph_codepoints(glyph):
+    """Return all codepoints of a glyph as integers."""
+    unicodes = getattr(glyph, "unicodes", None)
+    if not unicodes:
+        unicodes = [glyph.unicode] if glyph.unicode else []
+    codepoints = []
+    for u in unicodes:
+        try:
+            codepoints.append(int(u, 16))
+        except (TypeError, ValueError):
+            pass
+    return codepoints
+
+def glyph_token(glyph):
+    """Return the tab-string representation of a glyph (char or /name)."""
+    if glyph.unicode:
+        try:
+            return chr(int(glyph.unicode, 16))
+        except (TypeError, ValueError):
+            pass
+    return f"/{glyph.name}"
+
+# ── Per-font cache ───────────────────────────────────────────────────────────
+
+_INDEXES = FontCache()
+
+def font_signature(font):
+    """
+    Cheap guard for a cached index within one run: the glyph count. GSFont
+    has no change counter and a real change stamp would cost a font scan
+    per lookup, so edits made between runs are only picked up by refresh.
+    """
+    return len(font.glyphs)
+
+def unicode_index(font, refresh=False):
+    """
+    Return the shared UnicodeIndex for `font`, rebuilding it when the glyph
+    count moved. Every script passes refresh=True once at the start of a run
+    (or click), so the index is built once per run and reused only within it.
+    """
+    index = _INDEXES.get(font)
+    if refresh or index is None or index.signature != font_signature(font):
+        index = _INDEXES.set(font, UnicodeIndex(font))
+    return index
+
+def invalidate(font=None):
+    """Drop the cached index for `font`, or every cached index."""
+    if font is None:
+        _INDEXES.clear()
+    else:
+        _INDEXES.pop(font)
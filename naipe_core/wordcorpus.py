@@ -0,0 +1,277 @@
+# -*- coding: utf-8 -*-
+"""
+Persistent, memory-mapped word corpus for WordFilter.
+
+A corpus file (any text: word lists, dictionary dumps) is tokenized once
+into an index file in a per-user cache folder, named after a hash of the
+source path, so read-only and shared word lists can be indexed too. The
+index stores every unique word with its frequency, its sorted character set
+and a 64-bit character mask, so "use only" / "do not use" queries touch one
+integer per word and only decode the words that match. The index is rebuilt
+when the source file's mtime or size changes.
+
+Index layout (little-endian, sections 8-byte aligned):
+
+    b"NWCI" · u32 version · u32 header length · JSON header
+    masks u64[n] · folded masks u64[n] · frequencies u32[n]
+    word offsets u32[n+1] · signature offsets u32[n+1]
+    words (UTF-8) · signatures (UTF-8)
+"""
+
+import hashlib
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+from collections import Counter
+
+from naipe_core.wordfilter import iter_words, MODE_ONLY
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+MAGIC = b"NWCI"
+VERSION = 1
+INDEX_SUFFIX = ".wordindex"
+
+# Per-user folder for index files
+if sys.platform == "darwin":
+    INDEX_FOLDER = os.path.join(os.path.expanduser("~"), "Library", "Caches", "com.naipe.wordindex")
+else:
+    INDEX_FOLDER = os.path.join(os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache"), "naipe-wordindex")
+
+# Bits 0–62 cover the corpus' most common characters; bit 63 flags any other
+ALPHABET_BITS = 63
+OTHER_BIT = 1 << ALPHABET_BITS
+
+# ── Building ─────────────────────────────────────────────────────────────────
+
+def read_chunks(path, size=1 << 20):
+    with open(path, encoding="utf-8", errors="replace") as f:
+        while True:
+            chunk = f.read(size)
+            if not chunk:
+                return
+            yield chunk
+
+def _alphabet(counter, fold):
+    chars = Counter()
+    for word in counter:
+        for char in set(word.lower() if fold else word):
+            chars[char] += 1
+    return [char for char, _ in chars.most_common(ALPHABET_BITS)]
+
+def _mask(chars, bits):
+    mask = 0
+    for char in chars:
+        mask |= bits.get(char, OTHER_BIT)
+    return mask
+
+def _aligned(blob):
+    return blob + b"\0" * (-len(blob) % 8)
+
+def index_path_for(source_path, folder=None):
+    """Index file of `source_path` in the cache folder, keyed by a hash of its absolute path."""
+    key = hashlib.sha1(os.path.abspath(source_path).encode("utf-8")).hexdigest()[:20]
+    return os.path.join(folder or INDEX_FOLDER, key + INDEX_SUFFIX)
+
+def build_index(source_path, index_path=None):
+    """Tokenize `source_path` and write its index file. Return the index path."""
+    index_path = index_path or index_path_for(source_path)
+    os.makedirs(os.path.dirname(os.path.abspath(index_path)), exist_ok=True)
+    stat = os.stat(source_path)
+    counter = Counter(iter_words(read_chunks(source_path)))
+    # Most frequent words first, so query results come out in that order
+    words = sorted(counter, key=lambda w: (-counter[w], w))
+
+    alphabet = _alphabet(counter, fold=False)
+    folded_alphabet = _alphabet(counter, fold=True)
+    bits = {char: 1 << i for i, char in enumerate(alphabet)}
+    folded_bits = {char: 1 << i for i, char in enumerate(folded_alphabet)}
+
+    masks, folded, freqs = array("Q"), array("Q"), array("I")
+    word_offsets, sig_offsets = array("I", [0]), array("I", [0])
+    word_blob, sig_blob = bytearray(), bytearray()
+    for word in words:
+        signature = "".join(sorted(set(word)))
+        masks.append(_mask(signature, bits))
+        folded.append(_mask(set(signature.lower()), folded_bits))
+        freqs.append(counter[word])
+        word_blob += word.encode("utf-8")
+        sig_blob += signature.encode("utf-8")
+        word_offsets.append(len(word_blob))
+        sig_offsets.append(len(sig_blob))
+
+    arrays = [masks, folded, freqs, word_offsets, sig_offsets]
+    if sys.byteorder != "little":
+        for a in arrays:
+            a.byteswap()
+    header = json.dumps({
+        "source": os.path.abspath(source_path),
+        "mtime_ns": stat.st_mtime_ns,
+        "size": stat.st_size,
+        "count": len(words),
+        "alphabet": alphabet,
+        "folded_alphabet": folded_alphabet,
+    }).encode("utf-8")
+
+    # Write next to the final file and rename, so readers never see half an index
+    tmp_path = f"{index_path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, "wb") as f:
+            f.write(_aligned(MAGIC + struct.pack("<II", VERSION, len(header)) + header))
+            for a in arrays:
+                f.write(_aligned(a.tobytes()))
+            f.write(bytes(word_blob))
+            f.write(bytes(sig_blob))
+        os.replace(tmp_path, index_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return index_path
+
+# ── Querying ─────────────────────────────────────────────────────────────────
+
+class WordCorpus:
+    """Read-only view of an index file."""
+
+    def __init__(self, index_path):
+        self.path = index_path
+        with open(index_path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._map[:4] != MAGIC:
+            raise ValueError(f"{index_path} is not a word index")
+        version, header_length = struct.unpack_from("<II", self._map, 4)
+        if version != VERSION:
+            raise ValueError(f"{index_path} has index version {version}, expected {VERSION}")
+        self.header = json.loads(self._map[12:12 + header_length].decode("utf-8"))
+        self.count = n = self.header["count"]
+        self.bits = {char: 1 << i for i, char in enumerate(self.header["alphabet"])}
+        self.folded_bits = {char: 1 << i for i, char in enumerate(self.header["folded_alphabet"])}
+
+        offset = 12 + header_length
+        offset += -offset % 8
+        self.masks, offset = self._section("Q", n, offset)
+        self.folded_masks, offset = self._section("Q", n, offset)
+        self.frequencies, offset = self._section("I", n, offset)
+        self._word_offsets, offset = self._section("I", n + 1, offset)
+        self._sig_offsets, offset = self._section("I", n + 1, offset)
+        self._words_start = offset
+        self._sigs_start = offset + self._word_offsets[n]
+
+    def _section(self, code, length, offset):
+        size = struct.calcsize(code) * length
+        if numpy is not None:
+            values = numpy.frombuffer(self._map, dtype="<u%d" % struct.calcsize(code), count=length, offset=offset)
+        else:
+            values = array(code)
+            values.frombytes(self._map[offset:offset + size])
+            if sys.byteorder != "little":
+                values.byteswap()
+        return values, offset + size + (-size % 8)
+
+    def __len__(self):
+        return self.count
+
+    def close(self):
+        self.masks = self.folded_masks = self.frequencies = None
+        self._word_offsets = self._sig_offsets = None
+        self._map.close()
+
+    def word(self, i):
+        start, end = int(self._word_offsets[i]), int(self._word_offsets[i + 1])
+        return self._map[self._words_start + start:self._words_start + end].decode("utf-8")
+
+    def signature(self, i):
+        start, end = int(self._sig_offsets[i]), int(self._sig_offsets[i + 1])
+        return self._map[self._sigs_start + start:self._sigs_start + end].decode("utf-8")
+
+    def query(self, chars, mode, case_sensitive=False, limit=None):
+        """
+        Return the words (most frequent first) that use only `chars`
+        (MODE_ONLY) or none of them (MODE_EXCLUDE).
+        """
+        if not case_sensitive:
+            chars = chars.lower()
+        chars = set(chars)
+        bits = self.bits if case_sensitive else self.folded_bits
+        masks = self.masks if case_sensitive else self.folded_masks
+
+        query = 0
+        for char in chars:
+            query |= bits.get(char, 0)
+        # Characters outside the 63-bit alphabet can only be checked on the signature
+        extra = {char for char in chars if char not in bits}
+
+        if mode == MODE_ONLY:
+            candidates = self._select(masks, mode, query | (OTHER_BIT if extra else 0))
+            verify = lambda sig: set(sig) <= chars
+        else:
+            candidates = self._select(masks, mode, query)
+            verify = lambda sig: not (set(sig) & extra)
+
+        words = []
+        for i in candidates:
+            i = int(i)
+            if int(masks[i]) & OTHER_BIT:
+                signature = self.signature(i)
+                if not verify(signature if case_sensitive else signature.lower()):
+                    continue
+            words.append(self.word(i))
+            if limit and len(words) >= limit:
+                break
+        return words
+
+    def _select(self, masks, mode, value):
+        """
+        Indices of masks with no bits outside `value` (MODE_ONLY) or no bits
+        in `value` (MODE_EXCLUDE).
+        """
+        if numpy is not None:
+            value = numpy.uint64(value)
+            hits = (masks & ~value) == 0 if mode == MODE_ONLY else (masks & value) == 0
+            return numpy.flatnonzero(hits)
+        if mode == MODE_ONLY:
+            value = ~value & 0xFFFFFFFFFFFFFFFF
+        return [i for i, m in enumerate(masks) if not m & value]
+
+# ── Loading ──────────────────────────────────────────────────────────────────
+
+_CORPORA = {}
+
+def is_current(source_path, index_path):
+    """Return True if the index file was built from the current source file."""
+    try:
+        with open(index_path, "rb") as f:
+            head = f.read(12)
+            if head[:4] != MAGIC:
+                return False
+            version, header_length = struct.unpack_from("<II", head, 4)
+            header = json.loads(f.read(header_length).decode("utf-8"))
+    except (OSError, ValueError, struct.error):
+        return False
+    stat = os.stat(source_path)
+    return (version == VERSION and header.get("source") == os.path.abspath(source_path)
+            and header["mtime_ns"] == stat.st_mtime_ns and header["size"] == stat.st_size)
+
+def load_corpus(source_path, index_path=None):
+    """
+    Return the WordCorpus for `source_path`, building or rebuilding its index
+    only when the source file changed. Open corpora are kept for reuse; a
+    rebuilt one replaces the cached corpus without closing it, since another
+    thread may still be querying it (its mapping outlives the replaced file).
+    """
+    index_path = index_path or index_path_for(source_path)
+    corpus = _CORPORA.get(index_path)
+    if is_current(source_path, index_path):
+        if corpus is None:
+            corpus = _CORPORA[index_path] = WordCorpus(index_path)
+        return corpus
+    build_index(source_path, index_path)
+    corpus = _CORPORA[index_path] = WordCorpus(index_path)
+    return corpus
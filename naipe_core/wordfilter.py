@@ -0,0 +1,108 @@
+# -*- coding: utf-8 -*-
+"""
+Headless word filter used by WordFilter.py.
+
+Text is tokenized in chunks, each unique word is stored once with a bitmask
+of the characters it uses, and include/exclude queries become a single
+integer operation per word.
+"""
+
+import re
+
+WORD_PATTERN = re.compile(r"\b\w+\b")
+TRAILING_WORD = re.compile(r"\w+$")
+
+MODE_ONLY = 0       # Use only these characters
+MODE_EXCLUDE = 1    # Do not use these characters
+
+def iter_chunks(text, size=1 << 20):
+    """Split a long string into slices of `size` characters."""
+    for start in range(0, len(text), size):
+        yield text[start:start + size]
+
+def iter_words(chunks):
+    """
+    Yield the words of a stream of text chunks. A word cut by a chunk boundary
+    is carried over and completed with the next chunk.
+    """
+    carry = ""
+    for chunk in chunks:
+        text = carry + chunk
+        match = TRAILING_WORD.search(text)
+        if match:
+            carry = text[match.start():]
+            text = text[:match.start()]
+        else:
+            carry = ""
+        yield from WORD_PATTERN.findall(text)
+    if carry:
+        yield from WORD_PATTERN.findall(carry)
+
+
+class WordIndex:
+    """Unique words with a per-word character bitmask."""
+
+    def __init__(self, case_sensitive=False):
+        self.case_sensitive = case_sensitive
+        self.words = []     # unique words, in first-seen order
+        self.masks = []     # character bitmask per word
+        self.bits = {}      # character → bit
+        self._seen = set()
+
+    def _bit(self, char):
+        bit = self.bits.get(char)
+        if bit is None:
+            bit = self.bits[char] = 1 << len(self.bits)
+        return bit
+
+    def mask(self, chars):
+        """Return the bitmask of a set of characters."""
+        mask = 0
+        for char in set(chars):
+            mask |= self._bit(char)
+        return mask
+
+    def add(self, words):
+        """Add words, skipping duplicates. Return the index of the first new word."""
+        start = len(self.words)
+        fold = not self.case_sensitive
+        for word in words:
+            key = word.lower() if fold else word
+            if key in self._seen:
+                continue
+            self._seen.add(key)
+            self.words.append(word)
+            self.masks.append(self.mask(key))
+        return start
+
+    def query_mask(self, chars):
+        return self.mask(chars if self.case_sensitive else chars.lower())
+
+    def matches(self, chars, mode, start=0):
+        """Return the words from `start` on that pass the include/exclude query."""
+        query = self.query_mask(chars)
+        words, masks = self.words, self.masks
+        if mode == MODE_ONLY:
+            return [words[i] for i in range(start, len(words)) if masks[i] | query == query]
+        return [words[i] for i in range(start, len(words)) if not masks[i] & query]
+
+
+def filter_stream(text, chars, mode=MODE_EXCLUDE, case_sensitive=False, chunk_size=1 << 20, batch_size=50000):
+    """
+    Filter `text` chunk by chunk, yielding the new matching words of every
+    `batch_size` words so callers can show results progressively. `text` can
+    also be an iterable of chunks, e.g. wordcorpus.read_chunks(path).
+    """
+    index = WordIndex(case_sensitive)
+    batch = []
+    chunks = iter_chunks(text, chunk_size) if isinstance(text, str) else text
+    for word in iter_words(chunks):
+        batch.append(word)
+        if len(batch) >= batch_size:
+            matched = index.matches(chars, mode, index.add(batch))
+            batch = []
+            if matched:
+                yield matched
+    matched = index.matches(chars, mode, index.add(batch))
+    if matched:
+        yield matched
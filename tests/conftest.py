@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+import os
+import sys
+
+import pytest
+
+# naipe_core is imported from the repository root, like the menu scripts do
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+# ── Small generated Glyphs sources ───────────────────────────────────────────
+
+def _rect(x0, y0, x1, y1):
+    return f"{{closed = 1; nodes = (({x0},{y0},l),({x1},{y0},l),({x1},{y1},l),({x0},{y1},l));}}"
+
+def _component(name, extra=""):
+    return f"{{ref = {name};{extra}}}"
+
+def _layer(layer_id, shapes, width, master_id=None, name=None):
+    lines = [f"layerId = {layer_id};"]
+    if master_id:
+        lines.append(f"associatedMasterId = {master_id};")
+    if name:
+        lines.append(f'name = "{name}";')
+    lines.append(f"shapes = ({','.join(shapes)});" if shapes else "")
+    lines.append(f"width = {width};")
+    return "{\n" + "\n".join(lines) + "\n}"
+
+def glyphs_source(glyphs):
+    """Format 3 .glyphs text with masters m01/m02; `glyphs` is [(name, [layer text, …])]."""
+    entries = ",\n".join(f"{{\nglyphname = \"{name}\";\nlayers = (\n{','.join(layers)}\n);\n}}" for name, layers in glyphs)
+    return (
+        "{\n.formatVersion = 3;\nfamilyName = Test;\n"
+        "fontMaster = (\n{id = m01; name = Regular;},\n{id = m02; name = Bold;}\n);\n"
+        f"glyphs = (\n{entries}\n);\n"
+        "kerningLTR = {m01 = {a = {b = -10;};};};\nunitsPerEm = 1000;\n}\n"
+    )
+
+def sample_glyphs(fillers=0):
+    """
+    a: a 200 × 500 rectangle, 20 units wider in m02 (side bearings differ)
+    empty: no shapes on its masters; brace: empty masters, filled {50} layer
+    rotated/slanted/composite: components of a, empty and brace
+    stroked: a live stroke on m02; fillers gNN cycle through the cases above
+    """
+    box = _rect(100, 0, 300, 500)
+    stroked = "{attr = {strokeWidth = 20;}; closed = 0; nodes = ((0,0,l),(100,100,l));}"
+    glyphs = [
+        ("a", [_layer("m01", [box], 400), _layer("m02", [box], 420)]),
+        ("empty", [_layer("m01", [], 200), _layer("m02", [], 200)]),
+        ("brace", [_layer("m01", [], 200), _layer("m02", [], 200), _layer("b50", [_rect(0, 0, 50, 50)], 200, "m01", "{50}")]),
+        ("rotated", [_layer(m, [_component("a", "angle = 90;")], 600) for m in ("m01", "m02")]),
+        ("slanted", [_layer(m, [_component("a", "slant = (45,0);")], 900) for m in ("m01", "m02")]),
+        ("composite", [
+            _layer("m01", [_component("a"), _component("empty"), _component("brace")], 400),
+            _layer("m02", [_component("a", "pos = (10,0);")], 440),
+            _layer("c50", [_component("brace")], 400, "m01", "{50}"),
+        ]),
+        ("stroked", [_layer("m01", [box], 400), _layer("m02", [stroked], 400)]),
+    ]
+    cases = [
+        lambda: [_layer("m01", [box], 400), _layer("m02", [box], 400)],
+        lambda: [_layer(m, [_component("a"), _component("empty")], 400) for m in ("m01", "m02")],
+        lambda: [_layer("m01", [_component("rotated", "pos = (600,0);")], 700), _layer("m02", [_component("rotated", "pos = (600,0);")], 710)],
+        lambda: [_layer("m01", [box], 400), _layer("m02", [stroked], 400)],
+    ]
+    glyphs += [(f"g{i:02d}", cases[i % len(cases)]()) for i in range(fillers)]
+    return glyphs
+
+@pytest.fixture
+def source(tmp_path):
+    """Path of a generated .glyphs file; call with the number of filler glyphs."""
+    def write(fillers=0):
+        path = tmp_path / f"Test-{fillers}.glyphs"
+        path.write_text(glyphs_source(sample_glyphs(fillers)), encoding="utf-8")
+        return str(path)
+    return write
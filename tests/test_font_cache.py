@@ -0,0 +1,37 @@
+# -*- coding: utf-8 -*-
+import gc
+import weakref
+
+from naipe_core.font_cache import FontCache
+from naipe_core.headless import GSFont
+from naipe_core.unicode_index import unicode_index
+
+
+def test_oldest_font_is_dropped():
+    cache = FontCache(size=2)
+    fonts = [GSFont() for _ in range(3)]
+    for number, font in enumerate(fonts):
+        cache.set(font, number)
+    assert len(cache) == 2
+    assert cache.get(fonts[0]) is None
+    assert cache.get(fonts[2]) == 2
+
+def test_lookup_keeps_a_font_cached():
+    cache = FontCache(size=2)
+    first, second, third = GSFont(), GSFont(), GSFont()
+    cache.set(first, 1)
+    cache.set(second, 2)
+    cache.get(first)
+    cache.set(third, 3)
+    assert cache.get(first) == 1
+    assert cache.get(second) is None
+
+def test_closed_fonts_are_released():
+    font = GSFont()
+    unicode_index(font)
+    closed = weakref.ref(font)
+    del font
+    for _ in range(4):
+        unicode_index(GSFont())
+    gc.collect()
+    assert closed() is None
@@ -0,0 +1,90 @@
+# -*- coding: utf-8 -*-
+"""Streaming .glyphs reader against a small generated source."""
+
+import pickle
+
+import pytest
+
+from naipe_core.components import EmptyBaseIndex, find_components
+from naipe_core.glyphs_reader import SourceFont
+
+
+def bounds(font):
+    return {glyph.name: [layer.bounds for layer in glyph.layers] for glyph in font.glyphs}
+
+def names(glyphs):
+    return [glyph.name for glyph in glyphs]
+
+
+# ── Streaming by part and range ──────────────────────────────────────────────
+
+def test_parts_interleave_the_glyphs(source):
+    font = SourceFont(source(fillers=10))
+    everything = names(font.glyphs)
+    assert len(everything) == len(font.glyphs) == 17
+    for parts in (1, 3, 4):
+        assert [names(font.iter_glyphs(part, parts)) for part in range(parts)] == [everything[part::parts] for part in range(parts)]
+
+@pytest.mark.parametrize("scanned", [False, True])
+def test_ranges_read_only_their_glyphs(source, scanned):
+    font = SourceFont(source(fillers=10))
+    everything = names(font.glyphs)
+    if scanned:
+        assert names(font.scan()) == everything
+    for start, stop in ((0, 17), (0, 1), (5, 9), (16, 17), (12, 40), (17, 17)):
+        assert names(font.iter_glyph_range(start, stop)) == everything[start:stop]
+
+def test_whole_font_state_is_shared_between_processes(source):
+    path = source(fillers=10)
+    font = SourceFont(path)
+    for _ in font.scan():
+        pass
+    state = pickle.loads(pickle.dumps(font.whole_font_state()))
+    restored = SourceFont(path, state)
+    assert restored.glyph_count() == 17
+    assert names(restored.iter_glyph_range(7, 12)) == names(font.glyphs)[7:12]
+    assert bounds(restored) == bounds(SourceFont(path))
+
+
+# ── Component bounds ─────────────────────────────────────────────────────────
+
+def test_component_bounds(source):
+    font = bounds(SourceFont(source(fillers=3)))
+    assert font["a"] == [(100, 0, 200, 500)] * 2
+    assert font["empty"] == [(0, 0, 0, 0)] * 2
+    # 90° turns a's 200 × 500 box on its side
+    assert font["rotated"] == [pytest.approx((-500, 100, 500, 200))] * 2
+    # 45° slant shifts the top by the height
+    assert font["slanted"] == [pytest.approx((100, 0, 700, 500))] * 2
+    # The {50} layer uses brace's {50} layer; m02 moves a by 10
+    assert font["composite"] == [(100, 0, 200, 500), (110, 0, 200, 500), (0, 0, 50, 50)]
+    # A moved rotated component
+    assert font["g02"] == [pytest.approx((100, 100, 500, 200))] * 2
+
+def test_side_bearings(source):
+    font = SourceFont(source())
+    glyphs = {glyph.name: glyph for glyph in font.glyphs}
+    assert [(layer.LSB, layer.RSB) for layer in glyphs["a"].layers] == [(100, 100), (100, 120)]
+    assert [(layer.LSB, layer.RSB) for layer in glyphs["composite"].layers] == [(100, 100), (110, 130), (0, 350)]
+
+
+# ── Empty bases ──────────────────────────────────────────────────────────────
+
+def test_empty_bases(source):
+    font = SourceFont(source(fillers=2))
+    index = EmptyBaseIndex(font)
+    assert index.names() == {"empty", "brace"}
+    found = {(removal.glyph.name, removal.layer.name): removal.names for removal in find_components(font.glyphs, index.matcher())}
+    # brace is empty on the masters but not on its {50} layer
+    assert found == {
+        ("composite", "Regular"): ["empty", "brace"],
+        ("g01", "Regular"): ["empty"],
+        ("g01", "Bold"): ["empty"],
+    }
+
+def test_scan_feeds_other_indexes(source):
+    font = SourceFont(source(fillers=2))
+    index = EmptyBaseIndex(font, font.scan())
+    assert index.empty == EmptyBaseIndex(SourceFont(font.path)).empty
+    assert font.glyph_count() == 9
+    assert font.whole_font_state()["bounds"][("rotated", "m01", None)][1][0][0] == "a"
@@ -0,0 +1,212 @@
+# -*- coding: utf-8 -*-
+"""
+KerningStringEngine against a headless font, compared with the tab code the
+Kerning String Maker window ran before the engine was extracted.
+"""
+
+import pytest
+
+from naipe_core.headless import GSFont, GSFontMaster, GSGlyph
+from naipe_core.kerning import (
+    DATA, KerningIndex, KerningStringEngine, NUMBER_BASE_NAMES, NUMBER_VARIANTS_CONFIG, UI_GROUPS, get_data_key,
+)
+
+# name, unicode, left kerning group, right kerning group
+GLYPHS = [
+    ("H", "0048", "H", "H"),
+    ("O", "004F", "O", "O"),
+    ("n", "006E", "n", "n"),
+    ("m", "006D", "n", "n"),
+    ("o", "006F", "o", "o"),
+    ("period", "002E", None, None),
+    ("slash", "002F", None, None),
+    ("zero", None, None, None),
+    ("one", None, None, None),
+    ("zero.osf", None, None, None),
+    ("one.osf", None, None, None),
+]
+
+
+@pytest.fixture
+def font():
+    font = GSFont()
+    font.masters = [GSFontMaster("m01", "Regular")]
+    for name, unicode, left, right in GLYPHS:
+        glyph = GSGlyph(name, unicode)
+        glyph.leftKerningGroup, glyph.rightKerningGroup = left, right
+        font.glyphs.append(glyph)
+    return font
+
+
+# ── The window's tab code before the engine (script radio → `script`) ────────
+
+def legacy_filtered_chars(font, data_key, script):
+    if data_key == "numbers": return []
+    raw = list(DATA[data_key]["chars"])
+    if data_key == "punctuation" and script == "GRK":
+        raw = DATA["punctuation"].get("chars_GRK", []) + raw
+    return [item for item in raw if all(font.glyphForCharacter_(ord(c)) or font.glyphs[c] for c in item)]
+
+def legacy_wrappers(group_chars):
+    flat, wrappers = [], []
+    for item in group_chars:
+        for c in item: flat.append(c)
+        wrappers.append((item[0], item[1] if len(item) > 1 else item[0]))
+    return flat, wrappers
+
+def legacy_name(name):
+    return f"/{name.strip().lstrip('/')} "
+
+def legacy_punc(punc):
+    return "/slash " if punc == "/" else punc
+
+def legacy_standard_tab(font, p_key, s_key, script):
+    p_chars = legacy_filtered_chars(font, p_key, script)
+    s_chars = legacy_filtered_chars(font, s_key, script)
+    is_p_punc = "punctuation" in p_key
+    p_label = next(g["label"] for g in UI_GROUPS if g["key"] in p_key or p_key == g["key"])
+    s_label = next(g["label"] for g in UI_GROUPS if g["key"] in s_key or s_key == g["key"])
+    lines = [f"--- {p_label} vs {s_label} ---"]
+    l_ctrl, r_ctrl = ("", "") if is_p_punc else (DATA[p_key]["l_ctrl"], DATA[p_key]["r_ctrl"])
+    if "UC" in p_key and "lc" in s_key: r_ctrl = DATA[s_key]["r_ctrl"]
+    if is_p_punc or "punctuation" in s_key:
+        _, wrappers = legacy_wrappers(p_chars if is_p_punc else s_chars)
+        flat_targets, _ = legacy_wrappers(s_chars if is_p_punc else p_chars)
+        for w_l, w_r in wrappers:
+            lines.append(" ".join(f"{l_ctrl}{legacy_punc(w_l)}{legacy_punc(t)}{legacy_punc(w_r)}{r_ctrl}" for t in flat_targets))
+    else:
+        for p in p_chars:
+            lines.append(" ".join(f"{l_ctrl}{p}{s}{r_ctrl if 'lc' in s_key and 'UC' in p_key else p + r_ctrl}" for s in s_chars))
+    return lines
+
+def legacy_number_tab(font, p_key, s_key, script):
+    variants = []
+    for cfg in NUMBER_VARIANTS_CONFIG:
+        suffix = cfg["suffix"]
+        glyphs = [f"{n}{'.' + suffix if suffix else ''}" for n in NUMBER_BASE_NAMES if font.glyphs[f"{n}{'.' + suffix if suffix else ''}"]]
+        if glyphs: variants.append({"label": cfg["label"], "glyphs": glyphs, "suffix": suffix})
+    is_p_num = p_key == "numbers"
+    is_p_punc = p_key == "punctuation"
+    if is_p_num or is_p_punc:
+        sec_label = next((g["label"] for g in UI_GROUPS if g["key"] == s_key.split("_")[0]), "Others")
+    else:
+        sec_label = "Numbers"
+    lines = []
+    for var in variants:
+        p_title = var["label"] if is_p_num else ("Punctuation" if is_p_punc else "Letters")
+        s_title = var["label"] if not is_p_num and not is_p_punc else sec_label
+        lines.append(f"--- {p_title} vs {s_title} ---")
+        z_fmt = legacy_name(f"zero{'.' + var['suffix'] if var['suffix'] else ''}")
+        l_ctrl, r_ctrl = ("", "") if is_p_punc else (f"{z_fmt}{z_fmt}", f"{z_fmt}{z_fmt}")
+        if not is_p_num and not is_p_punc:
+            l_ctrl, r_ctrl = DATA[p_key]["l_ctrl"], DATA[p_key]["r_ctrl"]
+        if "punctuation" in [p_key, s_key]:
+            flat_punc, wrappers = legacy_wrappers(legacy_filtered_chars(font, "punctuation", script))
+            if is_p_punc:
+                for w_l, w_r in wrappers:
+                    lines.append(" ".join(f"{legacy_punc(w_l)}{legacy_name(n)}{legacy_punc(w_r)}" for n in var["glyphs"]))
+            else:
+                for n in var["glyphs"]:
+                    lines.append(" ".join(f"{l_ctrl}{legacy_name(n)}{legacy_punc(p)}{legacy_name(n)}{r_ctrl}" for p in flat_punc))
+        elif is_p_num and s_key == "numbers":
+            for n1 in var["glyphs"]:
+                lines.append(" ".join(f"{l_ctrl}{legacy_name(n1)}{legacy_name(n2)}{legacy_name(n1)}{r_ctrl}" for n2 in var["glyphs"]))
+        elif is_p_num:
+            for n in var["glyphs"]:
+                lines.append(" ".join(f"{l_ctrl}{legacy_name(n)}{l}{legacy_name(n)}{r_ctrl}" for l in legacy_filtered_chars(font, s_key, script)))
+        else:
+            for l in legacy_filtered_chars(font, p_key, script):
+                lines.append(" ".join(f"{l_ctrl}{l}{legacy_name(n)}{l}{r_ctrl}" for n in var["glyphs"]))
+    return lines
+
+def legacy_tab(font, p_key, s_key, script):
+    if "numbers" in [p_key, s_key]:
+        return legacy_number_tab(font, p_key, s_key, script)
+    return legacy_standard_tab(font, p_key, s_key, script)
+
+UI_KEYS = [g["key"] for g in UI_GROUPS]
+
+
+# ── Same output as the window ────────────────────────────────────────────────
+
+@pytest.mark.parametrize("p_ui_key", UI_KEYS)
+@pytest.mark.parametrize("s_ui_key", UI_KEYS)
+def test_tabs_match_legacy(font, p_ui_key, s_ui_key):
+    engine = KerningStringEngine(font)
+    p_key, s_key = get_data_key(p_ui_key, "LTN"), get_data_key(s_ui_key, "LTN")
+    if "numbers" in [p_key, s_key]:
+        lines = engine.number_lines(p_key, s_key, "LTN")
+    else:
+        lines = engine.standard_lines(p_key, s_key, "LTN")
+    assert list(lines) == legacy_tab(font, p_key, s_key, "LTN")
+
+def test_standard_lines(font):
+    engine = KerningStringEngine(font)
+    assert list(engine.standard_lines("UC_LTN", "lc_LTN")) == [
+        "--- Upper case vs Lower case ---",
+        "OHHnno OHHmno OHHono",
+        "OHOnno OHOmno OHOono",
+    ]
+    assert list(engine.standard_lines("UC_LTN", "punctuation")) == [
+        "--- Upper case vs Punctuation and Symbols ---",
+        "OH.H.HO OH.O.HO",
+        "OH/slash H/slash HO OH/slash O/slash HO",
+    ]
+
+def test_number_lines(font):
+    engine = KerningStringEngine(font)
+    assert list(engine.number_lines("numbers", "lc_LTN")) == [
+        "--- Default Numbers vs Lower case ---",
+        "/zero /zero /zero n/zero /zero /zero  /zero /zero /zero m/zero /zero /zero  /zero /zero /zero o/zero /zero /zero ",
+        "/zero /zero /one n/one /zero /zero  /zero /zero /one m/one /zero /zero  /zero /zero /one o/one /zero /zero ",
+        "--- Old Style Figures vs Lower case ---",
+        "/zero.osf /zero.osf /zero.osf n/zero.osf /zero.osf /zero.osf  /zero.osf /zero.osf /zero.osf m/zero.osf /zero.osf /zero.osf  /zero.osf /zero.osf /zero.osf o/zero.osf /zero.osf /zero.osf ",
+        "/zero.osf /zero.osf /one.osf n/one.osf /zero.osf /zero.osf  /zero.osf /zero.osf /one.osf m/one.osf /zero.osf /zero.osf  /zero.osf /zero.osf /one.osf o/one.osf /zero.osf /zero.osf ",
+    ]
+
+def test_matrix_lines_match_legacy(font):
+    engine = KerningStringEngine(font)
+    expected = ["=== Latin ==="]
+    for p_ui_key in UI_KEYS:
+        for s_ui_key in UI_KEYS:
+            expected += legacy_tab(font, get_data_key(p_ui_key, "LTN"), get_data_key(s_ui_key, "LTN"), "LTN")
+    assert list(engine.matrix_lines(["LTN"])) == expected
+
+
+# ── Kerning-group pruning and unkerned pairs ─────────────────────────────────
+
+def test_by_group_skips_repeated_class_pairs(font):
+    engine = KerningStringEngine(font)
+    # m shares n's kerning groups, so its strings show nothing new
+    assert list(engine.standard_lines("UC_LTN", "lc_LTN", by_group=True)) == [
+        "--- Upper case vs Lower case ---",
+        "OHHnno OHHono",
+        "OHOnno OHOono",
+    ]
+
+def test_kerned_keeps_only_unkerned_pairs(font):
+    font.kerning = {"m01": {"@MMK_L_H": {"@MMK_R_n": -10}}}
+    engine = KerningStringEngine(font)
+    kerned = KerningIndex(font, "m01")
+    assert list(engine.standard_lines("UC_LTN", "lc_LTN", kerned=kerned)) == [
+        "--- Upper case vs Lower case ---",
+        "OHHono",
+        "OHOnno OHOmno OHOono",
+    ]
+    assert list(engine.standard_lines("UC_LTN", "lc_LTN", by_group=True, kerned=kerned)) == [
+        "--- Upper case vs Lower case ---",
+        "OHHono",
+        "OHOnno OHOono",
+    ]
+
+def test_matrix_lines_kerned_drops_empty_tabs_and_scripts(font):
+    # Every number pair is kerned, so the number tabs have nothing to show
+    numbers = ["zero", "one", "zero.osf", "one.osf"]
+    font.kerning = {"m01": {f"id-{left}": {f"id-{right}": -5 for right in numbers} for left in numbers}}
+    engine = KerningStringEngine(font)
+    lines = list(engine.matrix_lines(["LTN", "CYR"], ui_keys=["UC", "numbers"], kerned=KerningIndex(font, "m01")))
+    assert lines[0] == "=== Latin ==="
+    assert "--- Default Numbers vs Numbers ---" not in lines
+    assert "--- Upper case vs Upper case ---" in lines
+    # The font has no Cyrillic, and the shared number tabs were already covered
+    assert "=== Cyrillic ===" not in lines
@@ -0,0 +1,47 @@
+# -*- coding: utf-8 -*-
+"""Command-line QC runner: findings, and the same report however fonts are split."""
+
+from naipe_core.qc_runner import CHECKS, check_slice, csv_rows, plan_tasks, prepare_font, run
+
+
+def findings(report):
+    """The report without timings."""
+    return [{key: value for key, value in font.items() if key != "seconds"} for font in report["fonts"]], report["errors"]
+
+
+def test_findings(source):
+    report = run([source()], jobs=1)
+    assert report["errors"] == []
+    font, = report["fonts"]
+    assert (font["family"], font["masters"], font["reference_master"], font["glyphs"]) == ("Test", ["Regular", "Bold"], "Regular", 7)
+    assert font["live_strokes"] == [{"glyph": "stroked", "masters": ["Bold"]}]
+    assert font["empty_components"] == [{"glyph": "composite", "layer": "Regular", "components": ["empty", "brace"]}]
+    assert [(r["glyph"], r["master"], r["lsb_delta"], r["rsb_delta"]) for r in font["side_bearings"]] == [
+        ("a", "Bold", 0, 20),
+        ("composite", "Bold", 10, 30),
+        ("stroked", "Bold", -100, 200),
+    ]
+    assert len(list(csv_rows(report))) == 1 + 5
+
+def test_only_large_fonts_are_split(source):
+    small, large = source(fillers=1), source(fillers=40)
+    assert plan_tasks([small, large], split_above_mb=0, slices=4) == [(large, 4), (small, 4)]
+    limit = (len(open(small).read()) + 1) / 1e6
+    assert plan_tasks([small, large], split_above_mb=limit, slices=4) == [(large, 4), (small, 1)]
+
+def test_slices_cover_the_font_once(source):
+    path = source(fillers=23)
+    prepared = prepare_font(path, CHECKS)
+    assert sum(check_slice(path, part, 4, prepared=prepared)["glyphs"] for part in range(4)) == 30
+
+def test_sliced_run_matches_unsliced(source):
+    paths = [source(fillers=23), source(fillers=5)]
+    whole = run(paths, jobs=1)
+    assert findings(run(paths, jobs=1, split_above_mb=0, slices=3)) == findings(whole)
+    assert findings(run(paths, jobs=1, split_above_mb=0, slices=4, checks=("side_bearings",)))[0] == [
+        dict(font, live_strokes=[], empty_components=[]) for font in findings(whole)[0]
+    ]
+
+def test_process_pool_matches_serial_run(source):
+    paths = [source(fillers=23), source(fillers=5)]
+    assert findings(run(paths, jobs=2, split_above_mb=0)) == findings(run(paths, jobs=1))
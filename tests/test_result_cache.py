@@ -0,0 +1,122 @@
+# -*- coding: utf-8 -*-
+"""SQLite result cache: hits, invalidation by lastChange, and fresh databases."""
+
+import os
+import sqlite3
+
+import pytest
+
+from naipe_core.headless import GSComponent, GSFont, GSFontMaster, GSGlyph, GSLayer, GSPath
+from naipe_core.result_cache import CACHE_FILE_KEY, CACHE_KEY, ResultCache
+from naipe_core.sidebearings import collect_sidebearings
+from naipe_core.strokes import scan_live_strokes
+
+MASTERS = ("m01", "m02")
+
+
+def box(x0, x1, attributes=None):
+    return GSPath([(x0, 0), (x1, 0), (x1, 700), (x0, 700)], attributes)
+
+def make_font(path, skip=()):
+    """A, acute, Aacute (A + acute) and a stroked o, saved at `path`."""
+    font = GSFont()
+    font.filepath = path
+    font.masters = [GSFontMaster(master_id, master_id) for master_id in MASTERS]
+    shapes = {
+        "A": lambda: [box(50, 550)],
+        "acute": lambda: [box(-100, 100)],
+        "Aacute": lambda: [GSComponent("A"), GSComponent("acute", (300, 0))],
+        "o": lambda: [box(60, 540, {"strokeWidth": 20})],
+    }
+    for name, make in shapes.items():
+        if name in skip:
+            continue
+        glyph = GSGlyph(name)
+        glyph.lastChange = 1
+        font.glyphs.append(glyph)
+        for master_id in MASTERS:
+            glyph.layers.append(GSLayer(master_id, master_id, master_id, 600, make()))
+    return font
+
+def sidebearings(font, cache=None):
+    names, lsb, rsb = collect_sidebearings(font, names_only=True, cache=cache)
+    return names, list(lsb), list(rsb)
+
+def computed(cache, font, check="count"):
+    """Names of the glyphs layer_values() had to compute."""
+    seen = []
+    def compute(glyph):
+        seen.append(glyph.name)
+        return {master_id: [len(glyph.layers[master_id].shapes)] for master_id in MASTERS}
+    cache.layer_values(font, check, compute)
+    return seen
+
+@pytest.fixture
+def database(tmp_path):
+    return str(tmp_path / "cache" / "results.sqlite")
+
+
+def test_fresh_database(tmp_path, database):
+    font = make_font(str(tmp_path / "Test.glyphs"))
+    with ResultCache({CACHE_FILE_KEY: database}) as cache:
+        assert cache.error is None
+        assert sidebearings(font, cache) == sidebearings(font)
+        assert (cache.hits, cache.misses) == (0, 4)
+    assert os.path.exists(database)
+    with sqlite3.connect(database) as connection:
+        assert connection.execute("SELECT COUNT(*) FROM results").fetchone() == (8,)
+
+def test_rerun_is_served_from_the_cache(tmp_path, database):
+    font = make_font(str(tmp_path / "Test.glyphs"))
+    with ResultCache(path=database) as cache:
+        expected = sidebearings(font, cache), scan_live_strokes(font, cache=cache)
+    with ResultCache(path=database) as cache:
+        assert (sidebearings(font, cache), scan_live_strokes(font, cache=cache)) == expected
+        assert (cache.hits, cache.misses) == (8, 0)
+        assert computed(cache, font) == ["A", "acute", "Aacute", "o"]
+        assert computed(cache, font) == []
+
+def test_changed_glyphs_and_their_composites_are_checked_again(tmp_path, database):
+    font = make_font(str(tmp_path / "Test.glyphs"))
+    with ResultCache(path=database) as cache:
+        sidebearings(font, cache)
+    font.glyphs["A"].layers["m02"].shapes = [box(80, 550)]
+    font.glyphs["A"].lastChange = 2
+    with ResultCache(path=database) as cache:
+        assert sidebearings(font, cache) == sidebearings(font)
+        assert (cache.hits, cache.misses) == (2, 2)
+        assert sidebearings(font, cache)[1] == [50, 80, -100, -100, 50, 80, 60, 60]
+    # Each check has rows of its own
+    with ResultCache(path=database) as cache:
+        assert computed(cache, font) == ["A", "acute", "Aacute", "o"]
+
+def test_deleted_glyphs_are_forgotten(tmp_path, database):
+    path = str(tmp_path / "Test.glyphs")
+    with ResultCache(path=database) as cache:
+        computed(cache, make_font(path))
+        computed(cache, make_font(path, skip=("o",)))
+    with sqlite3.connect(database) as connection:
+        assert {row[0] for row in connection.execute("SELECT glyph FROM results")} == {"A", "acute", "Aacute"}
+
+def test_unsaved_fonts_and_glyphs_without_a_stamp_are_not_cached(tmp_path, database):
+    unsaved = make_font(None)
+    saved = make_font(str(tmp_path / "Test.glyphs"))
+    saved.glyphs["acute"].lastChange = None
+    with ResultCache(path=database) as cache:
+        computed(cache, unsaved)
+        computed(cache, saved)
+        assert computed(cache, unsaved) == ["A", "acute", "Aacute", "o"]
+        # Only the glyph without a stamp is checked again
+        assert computed(cache, saved) == ["acute"]
+
+def test_disabled_or_unusable_cache_runs_uncached(tmp_path):
+    font = make_font(str(tmp_path / "Test.glyphs"))
+    with ResultCache({CACHE_KEY: False, CACHE_FILE_KEY: str(tmp_path / "off.sqlite")}) as cache:
+        assert cache.connection is None
+        assert computed(cache, font) == computed(cache, font) == ["A", "acute", "Aacute", "o"]
+    assert not os.path.exists(tmp_path / "off.sqlite")
+    # A folder where the database should be
+    (tmp_path / "folder.sqlite").mkdir()
+    with ResultCache(path=str(tmp_path / "folder.sqlite")) as cache:
+        assert cache.error is not None
+        assert sidebearings(font, cache) == sidebearings(font)
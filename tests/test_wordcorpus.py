@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+"""Word corpus index: queries against a brute-force filter, and reloading."""
+
+import random
+from collections import Counter
+
+import pytest
+
+from naipe_core import wordcorpus
+from naipe_core.wordcorpus import ALPHABET_BITS, WordCorpus, build_index, load_corpus
+from naipe_core.wordfilter import MODE_EXCLUDE, MODE_ONLY, iter_words
+
+# More characters than the mask has bits, so the rarest share the "other" bit
+CHARS = "etaoinshrdlucmfwypvbgkqjxzETAOINSHRDLUCMFWYPVBGKQJXZ0123456789áéíóúñçàèìòùâêîôûäëïöüÁÉÍÓÚÑ"
+QUERIES = ["etaoin", "ETAOINshrdlu", "eaáé", "xyz019", "ñÑüç", "etaoinshrdlucmfwypvbgkqjxz", "", "q"]
+
+
+def corpus_text(words=3000, seed=1):
+    rng = random.Random(seed)
+    # Skewed so the accented characters end up outside the 63-bit alphabet
+    weights = [1 / (i + 1) for i in range(len(CHARS))]
+    vocabulary = ["".join(rng.choices(CHARS, weights, k=rng.randint(1, 8))) for _ in range(words // 3)]
+    return " ".join(rng.choice(vocabulary[:rng.randint(1, len(vocabulary))]) for _ in range(words))
+
+def expected(text, chars, mode, case_sensitive):
+    counter = Counter(iter_words([text]))
+    fold = (lambda s: s) if case_sensitive else str.lower
+    chars = set(fold(chars))
+    words = sorted(counter, key=lambda w: (-counter[w], w))
+    if mode == MODE_ONLY:
+        return [w for w in words if set(fold(w)) <= chars]
+    return [w for w in words if not set(fold(w)) & chars]
+
+@pytest.fixture(params=["numpy", "array"])
+def corpus(request, tmp_path, monkeypatch):
+    if request.param == "array":
+        monkeypatch.setattr(wordcorpus, "numpy", None)
+    elif wordcorpus.numpy is None:
+        pytest.skip("numpy is not installed")
+    source = tmp_path / "words.txt"
+    source.write_text(corpus_text(), encoding="utf-8")
+    text = source.read_text(encoding="utf-8")
+    corpus = WordCorpus(build_index(str(source), str(tmp_path / "words.wordindex")))
+    yield text, corpus
+    corpus.close()
+
+
+def test_some_characters_share_the_other_bit(corpus):
+    text, index = corpus
+    assert len(set(text) - {" "}) > ALPHABET_BITS
+    assert len(index.header["alphabet"]) == ALPHABET_BITS
+    assert len(index) == len(set(iter_words([text])))
+
+@pytest.mark.parametrize("mode", [MODE_ONLY, MODE_EXCLUDE])
+@pytest.mark.parametrize("case_sensitive", [False, True])
+@pytest.mark.parametrize("chars", QUERIES)
+def test_query_matches_brute_force(corpus, chars, mode, case_sensitive):
+    text, index = corpus
+    assert index.query(chars, mode, case_sensitive) == expected(text, chars, mode, case_sensitive)
+
+def test_query_limit(corpus):
+    text, index = corpus
+    assert index.query("e", MODE_EXCLUDE, limit=5) == expected(text, "e", MODE_EXCLUDE, False)[:5]
+
+
+# ── Loading ──────────────────────────────────────────────────────────────────
+
+def test_load_corpus_reuses_and_rebuilds(tmp_path, monkeypatch):
+    monkeypatch.setattr(wordcorpus, "_CORPORA", {})
+    source, index_path = tmp_path / "words.txt", str(tmp_path / "words.wordindex")
+    source.write_text("alpha beta beta", encoding="utf-8")
+    first = load_corpus(str(source), index_path)
+    assert load_corpus(str(source), index_path) is first
+    assert first.query("abehlpt", MODE_ONLY) == ["beta", "alpha"]
+
+    source.write_text("gamma gamma delta omega", encoding="utf-8")
+    second = load_corpus(str(source), index_path)
+    assert second is not first
+    assert second.query("adegmt", MODE_ONLY) == ["gamma"]
+    # A query still running on the replaced corpus keeps working
+    assert first.query("abehlpt", MODE_ONLY) == ["beta", "alpha"]